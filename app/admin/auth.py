@@ -5,9 +5,7 @@ from starlette_admin.auth import AdminConfig, AdminUser, AuthProvider
 from starlette_admin.exceptions import LoginFailed
 from app.models import User
 from app.config import get_db
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.passwords import verify_and_update_password
 
 
 class EmailAndPasswordProvider(AuthProvider):
@@ -26,10 +24,16 @@ class EmailAndPasswordProvider(AuthProvider):
 
         if user is None:
             raise LoginFailed("Invalid email or password")
-        if not pwd_context.verify(password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password(
+            password, user.hashed_password
+        )
+        if not verified:
             raise LoginFailed("Invalid email or password")
         if not user.is_admin():
             raise LoginFailed("Access denied. User is not admin")
+        if new_hash:
+            user.hashed_password = new_hash
+            db.commit()
 
         request.session["user_id"] = user.id
         return response
@@ -1,9 +1,13 @@
 from starlette.middleware import Middleware
 from starlette.middleware.sessions import SessionMiddleware
+from sqlalchemy import inspect
+from sqlalchemy.orm import InstrumentedAttribute
 from starlette_admin.contrib.sqla import Admin, ModelView
 from app.config import engine, settings
 from app.models import Book, Author, Genre, User
-from app.admin.auth import EmailAndPasswordProvider, pwd_context
+from app.admin.auth import EmailAndPasswordProvider
+from app.services.passwords import hash_password
+from app.services.token_versions import remember_token_version
 
 admin = Admin(
     engine,
@@ -17,15 +21,44 @@ class CustomModelView(ModelView):
     exclude_fields_from_create = ["created_at", "updated_at"]
     exclude_fields_from_edit = ["created_at", "updated_at"]
 
+    def __init__(self, model, **kwargs):
+        # Generated tsvector columns have no admin field and are never edited
+        self.fields = [
+            key
+            for key, attr in model.__dict__.items()
+            if type(attr) is InstrumentedAttribute and key != "search_vector"
+        ]
+        super().__init__(model, **kwargs)
+
 
 class UserAdmin(CustomModelView):
+    exclude_fields_from_create = CustomModelView.exclude_fields_from_create + [
+        "token_version"
+    ]
+    exclude_fields_from_edit = CustomModelView.exclude_fields_from_edit + [
+        "token_version"
+    ]
+
     async def before_create(self, request, data: dict, item: User) -> None:
         if item.hashed_password and not item.hashed_password.startswith("$"):
-            item.hashed_password = pwd_context.hash(item.hashed_password)
+            item.hashed_password = await hash_password(item.hashed_password)
 
     async def before_edit(self, request, data: dict, item: User) -> None:
         if item.hashed_password and not item.hashed_password.startswith("$"):
-            item.hashed_password = pwd_context.hash(item.hashed_password)
+            item.hashed_password = await hash_password(item.hashed_password)
+        # Tokens carry the access level, so role and password changes revoke them
+        state = inspect(item)
+        if any(
+            state.attrs[key].history.has_changes()
+            for key in ("access_level", "hashed_password")
+        ):
+            item.token_version += 1
+
+    async def after_edit(self, request, item: User) -> None:
+        remember_token_version(item.id, item.token_version)
+
+    async def after_delete(self, request, item: User) -> None:
+        remember_token_version(item.id, None)
 
 
 admin.add_view(UserAdmin(User, name="Users"))
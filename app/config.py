@@ -1,6 +1,9 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.services.pool_metrics import TimedQueuePool, TimedAsyncQueuePool
 
 
 class Settings(BaseSettings):
@@ -10,15 +13,93 @@ class Settings(BaseSettings):
     COOKIE_SECRET_KEY: str
     TEST_DATABASE_URL: str | None = None
     DEBUG: bool | None = False
+    ASYNC_DATABASE: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    COUNT_CACHE_TTL: int = 5
+    COUNT_CACHE_SIZE: int = 1024
+    PAGINATION_COUNT_STRATEGY: Literal["separate", "window"] = "separate"
+    RESPONSE_CACHE_TTL: int = 5
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_URL: str | None = None
+    JWT_CACHE_SIZE: int = 10000
+    TOKEN_VERSION_CACHE_TTL: int = 30
+    TOKEN_VERSION_CACHE_SIZE: int = 10000
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_TIMEOUT: int = 0
+    DB_LOCK_TIMEOUT: int = 0
+    DATABASE_REPLICA_URLS: str | None = None
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5
+    REPLICA_HEALTH_CHECK_TIMEOUT: int = 2
+    READ_YOUR_WRITES_WINDOW: int = 5
+    QUERY_INSPECTION: bool = False
+    SLOW_QUERY_MS: int = 200
+    REPEATED_QUERY_LIMIT: int = 10
+    REPEATED_QUERY_RAISE: bool = False
+    TRACING_EXPORTER: Literal["none", "console", "otlp"] = "none"
+    TRACING_OTLP_ENDPOINT: str | None = None
+    TRACING_SERVICE_NAME: str = "fastapi-library"
 
     model_config = SettingsConfigDict(env_file=".env")
 
 
+def get_async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    return url.set(drivername=f"{url.get_backend_name()}+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+def engine_options(is_async: bool = False) -> dict:
+    """Pool sizing and per-session timeouts shared by the sync and async engines."""
+    # Timeouts are in milliseconds and set on every new connection, 0 disables them
+    timeouts = {
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT),
+        "lock_timeout": str(settings.DB_LOCK_TIMEOUT),
+    }
+    if is_async:
+        connect_args = {"server_settings": timeouts}
+    else:
+        connect_args = {
+            "options": " ".join(
+                f"-c {name}={value}" for name, value in timeouts.items()
+            )
+        }
+    return dict(
+        echo=settings.DEBUG,
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
 settings = Settings()
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_engine(settings.DATABASE_URL, **engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = (
+    create_async_engine(
+        settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+        **engine_options(is_async=True),
+    )
+    if settings.ASYNC_DATABASE
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -26,3 +107,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,66 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.author import Author
+from app.models.genre import Genre
+from app.models.book_author import BookAuthor
+from app.models.book_genre import BookGenre
+from app.schemas.api.v1.association import AssociationSchema
+from app.crud.shared.db_utils import stream_rows
+from app.crud.shared.bulk_utils import (
+    fetch_existing_ids,
+    find_duplicates,
+    insert_ignoring_conflicts,
+    bulk_response,
+)
+
+
+class AssociationsCrud:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def export_associations(self, model):
+        stmt = select(model.__table__).order_by(*model.__table__.primary_key)
+        return stream_rows(self.db, stmt)
+
+    def bulk_create_associations(self, associations: list[AssociationSchema]):
+        errors = self._find_missing_parents(associations)
+        pairs = [(item.book_id, item.author_id, item.genre_id) for item in associations]
+        for index in find_duplicates(pairs):
+            errors.setdefault(index, "Duplicate association in request")
+
+        created = {}
+        for model, column in ((BookAuthor, "author_id"), (BookGenre, "genre_id")):
+            rows = {
+                index: {"book_id": item.book_id, column: getattr(item, column)}
+                for index, item in enumerate(associations)
+                if index not in errors and getattr(item, column) is not None
+            }
+            inserted = insert_ignoring_conflicts(self.db, model, list(rows.values()))
+            for index, row in rows.items():
+                if (row["book_id"], row[column]) in inserted:
+                    created[index] = None
+                else:
+                    errors[index] = "Association already exists"
+        self.db.commit()
+        return bulk_response(len(associations), "created", created, errors)
+
+    def _find_missing_parents(self, associations: list[AssociationSchema]) -> dict:
+        books = fetch_existing_ids(self.db, Book, {a.book_id for a in associations})
+        authors = fetch_existing_ids(
+            self.db,
+            Author,
+            {a.author_id for a in associations if a.author_id is not None},
+        )
+        genres = fetch_existing_ids(
+            self.db, Genre, {a.genre_id for a in associations if a.genre_id is not None}
+        )
+        errors = {}
+        for index, item in enumerate(associations):
+            if item.book_id not in books:
+                errors[index] = "Book not found"
+            elif item.author_id is not None and item.author_id not in authors:
+                errors[index] = "Author not found"
+            elif item.genre_id is not None and item.genre_id not in genres:
+                errors[index] = "Genre not found"
+        return errors
@@ -5,19 +5,24 @@ from app.models.book import Book
 from app.models.author import Author
 from app.models.book_author import BookAuthor
 from app.schemas.api.v1.author import (
+    AuthorSchema,
     CreateAuthorSchema,
     UpdateAuthorSchema,
+    BulkUpdateAuthorSchema,
     AuthorSortingSchema,
 )
 from app.schemas.api.v1.book import BookSortingSchema
 from app.schemas.pagination import PaginationParams
-from app.services.sorting import apply_sorting
-from app.services.search import apply_filters
+from app.services.search import apply_filters, add_relevance_sort_field
 from app.crud.shared.db_utils import (
     fetch_by_id,
-    ensure_association_does_not_exist,
-    fetch_association,
+    fetch_version,
+    stream_rows,
+    eager_load,
+    create_association,
+    delete_association,
 )
+from app.crud.shared.bulk_utils import bulk_create, bulk_update, bulk_delete
 from app.crud.api.v1.shared.sort_fields import book_sort_fields, author_sort_fields
 from app.crud.api.v1.shared.search_filelds import (
     book_search_fields,
@@ -34,16 +39,38 @@ class AuthorsCrud:
         filters: dict,
         sorting_params: AuthorSortingSchema,
         pagination: PaginationParams,
+        include: set[str] = frozenset(),
     ):
-        stmt = select(Author)
+        stmt = select(Author).options(*eager_load(Author, include))
         if any(filters):
             stmt = apply_filters(stmt, filters, author_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, author_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                author_sort_fields, filters, author_search_fields
+            ),
+        )
+
+    def export_authors(self, filters: dict):
+        stmt = select(*[getattr(Author, name) for name in AuthorSchema.model_fields])
+        if any(filters):
+            stmt = apply_filters(stmt, filters, author_search_fields)
+        return stream_rows(self.db, stmt.order_by(Author.id))
 
-    def get_author_by_id(self, author_id: int):
-        return fetch_by_id(self.db, Author, author_id, "Author not found")
+    def get_author_version(self, author_id: int):
+        return fetch_version(self.db, Author, author_id)
+
+    def get_author_by_id(self, author_id: int, include: set[str] = frozenset()):
+        return fetch_by_id(
+            self.db,
+            Author,
+            author_id,
+            "Author not found",
+            options=eager_load(Author, include),
+        )
 
     def create_author(self, author_data: CreateAuthorSchema):
         author = Author(**author_data.model_dump())
@@ -68,6 +95,17 @@ class AuthorsCrud:
         self.db.delete(author)
         self.db.commit()
 
+    def bulk_create_authors(self, authors: list[CreateAuthorSchema]):
+        rows = [author.model_dump() for author in authors]
+        return bulk_create(self.db, Author, rows, {})
+
+    def bulk_update_authors(self, authors: list[BulkUpdateAuthorSchema]):
+        rows = [author.model_dump(exclude_unset=True) for author in authors]
+        return bulk_update(self.db, Author, rows, "Author not found", {})
+
+    def bulk_remove_authors(self, author_ids: list[int]):
+        return bulk_delete(self.db, Author, author_ids, "Author not found")
+
     def get_books_of_author(
         self,
         author_id: int,
@@ -83,28 +121,36 @@ class AuthorsCrud:
         )
         if any(filters):
             stmt = apply_filters(stmt, filters, book_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, book_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                book_sort_fields, filters, book_search_fields
+            ),
+        )
 
     def create_author_book_association(self, author_id: int, book_id: int):
-        self.get_author_by_id(author_id)
-        fetch_by_id(self.db, Book, book_id, "Book not found")
-        ensure_association_does_not_exist(
-            self.db, BookAuthor, author_id=author_id, book_id=book_id
+        create_association(
+            self.db,
+            BookAuthor,
+            {
+                "author_id": "Author not found",
+                "book_id": "Book not found",
+            },
+            author_id=author_id,
+            book_id=book_id,
         )
-        self.db.add(BookAuthor(author_id=author_id, book_id=book_id))
-        self.db.commit()
 
     def remove_author_book_association(self, author_id: int, book_id: int):
-        self.get_author_by_id(author_id)
-        fetch_by_id(self.db, Book, book_id, "Book not found")
-        association = fetch_association(
+        delete_association(
             self.db,
             BookAuthor,
-            "Association not found",
+            {
+                "author_id": "Author not found",
+                "book_id": "Book not found",
+            },
             author_id=author_id,
             book_id=book_id,
         )
-        self.db.delete(association)
-        self.db.commit()
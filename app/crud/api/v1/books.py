@@ -1,5 +1,6 @@
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, text
 from app.services.pagination import paginate
 from app.models.book import Book
 from app.models.author import Author
@@ -7,21 +8,35 @@ from app.models.book_author import BookAuthor
 from app.models.genre import Genre
 from app.models.book_genre import BookGenre
 from app.schemas.api.v1.book import (
+    BookSchema,
     CreateBookSchema,
     UpdateBookSchema,
+    BulkUpdateBookSchema,
     BookSortingSchema,
 )
 from app.schemas.api.v1.author import AuthorSortingSchema
 from app.schemas.api.v1.genre import GenreSortingSchema
 from app.schemas.pagination import PaginationParams
-from app.services.sorting import apply_sorting
-from app.services.search import apply_filters
+from app.services.search import apply_filters, add_relevance_sort_field
+from app.services.table_generations import bump_generations
 from app.crud.shared.db_utils import (
     fetch_by_id,
+    fetch_version,
+    stream_rows,
+    eager_load,
     ensure_unique,
-    ensure_association_does_not_exist,
-    fetch_association,
+    create_association,
+    delete_association,
+    replace_associations,
 )
+from app.crud.shared.bulk_utils import (
+    bulk_create,
+    bulk_update,
+    bulk_delete,
+    find_duplicates,
+    match_any,
+)
+from app.crud.shared.import_utils import batched, copy_rows
 from app.crud.api.v1.shared.sort_fields import (
     book_sort_fields,
     author_sort_fields,
@@ -43,16 +58,38 @@ class BooksCrud:
         filters: dict,
         sorting_params: BookSortingSchema,
         pagination: PaginationParams,
+        include: set[str] = frozenset(),
     ):
-        stmt = select(Book)
+        stmt = select(Book).options(*eager_load(Book, include))
         if any(filters):
             stmt = apply_filters(stmt, filters, book_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, book_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                book_sort_fields, filters, book_search_fields
+            ),
+        )
+
+    def export_books(self, filters: dict):
+        stmt = select(*[getattr(Book, name) for name in BookSchema.model_fields])
+        if any(filters):
+            stmt = apply_filters(stmt, filters, book_search_fields)
+        return stream_rows(self.db, stmt.order_by(Book.id))
+
+    def get_book_version(self, book_id: int):
+        return fetch_version(self.db, Book, book_id)
 
-    def get_book_by_id(self, book_id: int):
-        return fetch_by_id(self.db, Book, book_id, "Book not found")
+    def get_book_by_id(self, book_id: int, include: set[str] = frozenset()):
+        return fetch_by_id(
+            self.db,
+            Book,
+            book_id,
+            "Book not found",
+            options=eager_load(Book, include),
+        )
 
     def create_book(self, book_data: CreateBookSchema):
         ensure_unique(self.db, Book, "isbn", book_data.isbn, "ISBN must be unique")
@@ -83,6 +120,129 @@ class BooksCrud:
         self.db.delete(book)
         self.db.commit()
 
+    def bulk_create_books(self, books: list[CreateBookSchema]):
+        rows = [book.model_dump() for book in books]
+        # Valid rows need distinct ISBNs to be matched back to what was inserted
+        errors = {
+            index: "ISBN must be unique"
+            for index in find_duplicates([row["isbn"] for row in rows])
+        }
+        return bulk_create(
+            self.db,
+            Book,
+            rows,
+            errors,
+            conflict_column="isbn",
+            conflict_message="ISBN must be unique",
+        )
+
+    def bulk_update_books(self, books: list[BulkUpdateBookSchema]):
+        rows = [book.model_dump(exclude_unset=True) for book in books]
+        errors = self._find_isbn_conflicts(rows)
+        return bulk_update(self.db, Book, rows, "Book not found", errors)
+
+    def bulk_remove_books(self, book_ids: list[int]):
+        return bulk_delete(self.db, Book, book_ids, "Book not found")
+
+    def import_books(self, records, reject, batch_size: int = 5000) -> dict:
+        """Loads (line, record) pairs through COPY, one transaction per batch.
+
+        Invalid records, ISBNs repeated in the file and ISBNs already in the
+        catalog are passed to reject(line, record, detail) and skipped.
+        """
+        columns = list(CreateBookSchema.model_fields)
+        summary = {"imported": 0, "rejected": 0}
+        for batch in batched(records, batch_size):
+            originals = dict(batch)
+            valid = {}
+            for line, record in batch:
+                try:
+                    if record is None:
+                        raise ValueError("Invalid JSON object")
+                    valid[line] = CreateBookSchema.model_validate(record)
+                except ValidationError as error:
+                    reject(line, record, _validation_detail(error))
+                except ValueError as error:
+                    reject(line, record, str(error))
+            summary["rejected"] += len(batch) - len(valid)
+            if not valid:
+                continue
+
+            # Each commit may hand the session another pooled connection,
+            # so the temp table is ensured inside every batch's transaction
+            self.db.execute(
+                text(
+                    "CREATE TEMP TABLE IF NOT EXISTS book_import "
+                    "(line integer, title text, description text, "
+                    "year_of_publication integer, isbn text, series text, "
+                    "file_link text, edition text) ON COMMIT DELETE ROWS"
+                )
+            )
+            copy_rows(
+                self.db,
+                "book_import",
+                ["line", *columns],
+                ((line, *book.model_dump().values()) for line, book in valid.items()),
+            )
+            rejected = {}
+            for line in self.db.execute(
+                text(
+                    "SELECT line FROM book_import WHERE line NOT IN "
+                    "(SELECT DISTINCT ON (isbn) line FROM book_import "
+                    "ORDER BY isbn, line)"
+                )
+            ).scalars():
+                rejected[line] = "Duplicate ISBN in file"
+            if rejected:
+                self.db.execute(
+                    text("DELETE FROM book_import WHERE line = ANY(:lines)"),
+                    {"lines": list(rejected)},
+                )
+            # books_isbn_key settles ISBNs already in the catalog, including
+            # ones a concurrent import commits after this batch was staged
+            column_list = ", ".join(columns)
+            inserted = set(
+                self.db.execute(
+                    text(
+                        f"INSERT INTO books ({column_list}, created_at, updated_at) "
+                        f"SELECT {column_list}, now(), now() FROM book_import "
+                        "ORDER BY line ON CONFLICT (isbn) DO NOTHING RETURNING isbn"
+                    )
+                ).scalars()
+            )
+            for line, book in valid.items():
+                if line not in rejected and book.isbn not in inserted:
+                    rejected[line] = "ISBN must be unique"
+            imported = len(inserted)
+            self.db.commit()
+
+            for line in sorted(rejected):
+                reject(line, originals[line], rejected[line])
+            summary["imported"] += imported
+            summary["rejected"] += len(rejected)
+            # Raw SQL bypasses the ORM events that bump generations on commit
+            bump_generations(["books"])
+        return summary
+
+    def _find_isbn_conflicts(self, rows: list[dict]) -> dict:
+        indexes = [index for index, row in enumerate(rows) if row.get("isbn")]
+        isbns = [rows[index]["isbn"] for index in indexes]
+        if not isbns:
+            return {}
+        taken = dict(
+            self.db.execute(
+                select(Book.isbn, Book.id).where(match_any(Book.isbn, isbns))
+            ).all()
+        )
+        errors = {
+            indexes[position]: "ISBN must be unique"
+            for position in find_duplicates(isbns)
+        }
+        for index, isbn in zip(indexes, isbns):
+            if isbn in taken and taken[isbn] != rows[index].get("id"):
+                errors[index] = "ISBN must be unique"
+        return errors
+
     def get_authors_of_book(
         self,
         book_id: int,
@@ -98,31 +258,53 @@ class BooksCrud:
         )
         if any(filters):
             stmt = apply_filters(stmt, filters, author_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, author_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                author_sort_fields, filters, author_search_fields
+            ),
+        )
 
     def create_book_author_association(self, book_id: int, author_id: int):
-        self.get_book_by_id(book_id)
-        fetch_by_id(self.db, Author, author_id, "Author not found")
-        ensure_association_does_not_exist(
-            self.db, BookAuthor, book_id=book_id, author_id=author_id
+        create_association(
+            self.db,
+            BookAuthor,
+            {
+                "book_id": "Book not found",
+                "author_id": "Author not found",
+            },
+            book_id=book_id,
+            author_id=author_id,
         )
-        self.db.add(BookAuthor(book_id=book_id, author_id=author_id))
-        self.db.commit()
 
     def remove_book_author_association(self, book_id: int, author_id: int):
-        self.get_book_by_id(book_id)
-        fetch_by_id(self.db, Author, author_id, "Author not found")
-        association = fetch_association(
+        delete_association(
             self.db,
             BookAuthor,
-            "Association not found",
+            {
+                "book_id": "Book not found",
+                "author_id": "Author not found",
+            },
             book_id=book_id,
             author_id=author_id,
         )
-        self.db.delete(association)
-        self.db.commit()
+
+    def replace_book_authors(self, book_id: int, author_ids: list[int]):
+        return replace_associations(
+            self.db,
+            BookAuthor,
+            {
+                "book_id": "Book not found",
+                "author_id": "Author not found",
+            },
+            "book_id",
+            book_id,
+            "author_id",
+            author_ids,
+        )
 
     def get_genres_of_book(
         self,
@@ -139,28 +321,57 @@ class BooksCrud:
         )
         if any(filters):
             stmt = apply_filters(stmt, filters, genre_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, genre_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                genre_sort_fields, filters, genre_search_fields
+            ),
+        )
 
     def create_book_genre_association(self, book_id: int, genre_id: int):
-        self.get_book_by_id(book_id)
-        fetch_by_id(self.db, Genre, genre_id, "Genre not found")
-        ensure_association_does_not_exist(
-            self.db, BookGenre, book_id=book_id, genre_id=genre_id
+        create_association(
+            self.db,
+            BookGenre,
+            {
+                "book_id": "Book not found",
+                "genre_id": "Genre not found",
+            },
+            book_id=book_id,
+            genre_id=genre_id,
         )
-        self.db.add(BookGenre(book_id=book_id, genre_id=genre_id))
-        self.db.commit()
 
     def remove_book_genre_association(self, book_id: int, genre_id: int):
-        self.get_book_by_id(book_id)
-        fetch_by_id(self.db, Genre, genre_id, "Genre not found")
-        association = fetch_association(
+        delete_association(
             self.db,
             BookGenre,
-            "Association not found",
+            {
+                "book_id": "Book not found",
+                "genre_id": "Genre not found",
+            },
             book_id=book_id,
             genre_id=genre_id,
         )
-        self.db.delete(association)
-        self.db.commit()
+
+    def replace_book_genres(self, book_id: int, genre_ids: list[int]):
+        return replace_associations(
+            self.db,
+            BookGenre,
+            {
+                "book_id": "Book not found",
+                "genre_id": "Genre not found",
+            },
+            "book_id",
+            book_id,
+            "genre_id",
+            genre_ids,
+        )
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
@@ -5,19 +5,24 @@ from app.models.genre import Genre
 from app.models.book import Book
 from app.models.book_genre import BookGenre
 from app.schemas.api.v1.genre import (
+    GenreSchema,
     CreateGenreSchema,
     UpdateGenreSchema,
+    BulkUpdateGenreSchema,
     GenreSortingSchema,
 )
 from app.schemas.api.v1.book import BookSortingSchema
 from app.schemas.pagination import PaginationParams
-from app.services.sorting import apply_sorting
-from app.services.search import apply_filters
+from app.services.search import apply_filters, add_relevance_sort_field
 from app.crud.shared.db_utils import (
     fetch_by_id,
-    ensure_association_does_not_exist,
-    fetch_association,
+    fetch_version,
+    stream_rows,
+    eager_load,
+    create_association,
+    delete_association,
 )
+from app.crud.shared.bulk_utils import bulk_create, bulk_update, bulk_delete
 from app.crud.api.v1.shared.sort_fields import book_sort_fields, genre_sort_fields
 from app.crud.api.v1.shared.search_filelds import (
     book_search_fields,
@@ -34,16 +39,38 @@ class GenresCrud:
         filters: dict,
         sorting_params: GenreSortingSchema,
         pagination: PaginationParams,
+        include: set[str] = frozenset(),
     ):
-        stmt = select(Genre)
+        stmt = select(Genre).options(*eager_load(Genre, include))
         if any(filters):
             stmt = apply_filters(stmt, filters, genre_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, genre_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                genre_sort_fields, filters, genre_search_fields
+            ),
+        )
+
+    def export_genres(self, filters: dict):
+        stmt = select(*[getattr(Genre, name) for name in GenreSchema.model_fields])
+        if any(filters):
+            stmt = apply_filters(stmt, filters, genre_search_fields)
+        return stream_rows(self.db, stmt.order_by(Genre.id))
 
-    def get_genre_by_id(self, genre_id: int):
-        return fetch_by_id(self.db, Genre, genre_id, "Genre not found")
+    def get_genre_version(self, genre_id: int):
+        return fetch_version(self.db, Genre, genre_id)
+
+    def get_genre_by_id(self, genre_id: int, include: set[str] = frozenset()):
+        return fetch_by_id(
+            self.db,
+            Genre,
+            genre_id,
+            "Genre not found",
+            options=eager_load(Genre, include),
+        )
 
     def create_genre(self, genre_data: CreateGenreSchema):
         genre = Genre(**genre_data.model_dump())
@@ -68,6 +95,17 @@ class GenresCrud:
         self.db.delete(genre)
         self.db.commit()
 
+    def bulk_create_genres(self, genres: list[CreateGenreSchema]):
+        rows = [genre.model_dump() for genre in genres]
+        return bulk_create(self.db, Genre, rows, {})
+
+    def bulk_update_genres(self, genres: list[BulkUpdateGenreSchema]):
+        rows = [genre.model_dump(exclude_unset=True) for genre in genres]
+        return bulk_update(self.db, Genre, rows, "Genre not found", {})
+
+    def bulk_remove_genres(self, genre_ids: list[int]):
+        return bulk_delete(self.db, Genre, genre_ids, "Genre not found")
+
     def get_books_of_genre(
         self,
         genre_id: int,
@@ -83,28 +121,36 @@ class GenresCrud:
         )
         if any(filters):
             stmt = apply_filters(stmt, filters, book_search_fields)
-        if sorting_params.sort_by:
-            stmt = apply_sorting(stmt, sorting_params, book_sort_fields)
-        return paginate(self.db, stmt=stmt, pagination=pagination)
+        return paginate(
+            self.db,
+            stmt=stmt,
+            pagination=pagination,
+            sorting_params=sorting_params,
+            sort_fields=add_relevance_sort_field(
+                book_sort_fields, filters, book_search_fields
+            ),
+        )
 
     def create_genre_book_association(self, genre_id: int, book_id: int):
-        self.get_genre_by_id(genre_id)
-        fetch_by_id(self.db, Book, book_id, "Book not found")
-        ensure_association_does_not_exist(
-            self.db, BookGenre, genre_id=genre_id, book_id=book_id
+        create_association(
+            self.db,
+            BookGenre,
+            {
+                "genre_id": "Genre not found",
+                "book_id": "Book not found",
+            },
+            genre_id=genre_id,
+            book_id=book_id,
         )
-        self.db.add(BookGenre(genre_id=genre_id, book_id=book_id))
-        self.db.commit()
 
     def remove_genre_book_association(self, genre_id: int, book_id: int):
-        self.get_genre_by_id(genre_id)
-        fetch_by_id(self.db, Book, book_id, "Book not found")
-        association = fetch_association(
+        delete_association(
             self.db,
             BookGenre,
-            "Association not found",
+            {
+                "genre_id": "Genre not found",
+                "book_id": "Book not found",
+            },
             genre_id=genre_id,
             book_id=book_id,
         )
-        self.db.delete(association)
-        self.db.commit()
@@ -12,6 +12,7 @@ book_search_fields = {
     "edition": Book.edition,
     "created_at": Book.created_at,
     "updated_at": Book.updated_at,
+    "search": Book.search_vector,
 }
 
 author_search_fields = {
@@ -21,6 +22,7 @@ author_search_fields = {
     "biography": Author.biography,
     "created_at": Author.created_at,
     "updated_at": Author.updated_at,
+    "search": Author.search_vector,
 }
 
 genre_search_fields = {
@@ -28,4 +30,5 @@ genre_search_fields = {
     "description": Genre.description,
     "created_at": Genre.created_at,
     "updated_at": Genre.updated_at,
+    "search": Genre.search_vector,
 }
@@ -1,56 +1,61 @@
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from fastapi import HTTPException
 from app.models.user import User
-from app.schemas.api.v1.user import SignUpSchema, SignInSchema, UpdateUserSchema
+from app.schemas.api.v1.user import SignUpSchema, UpdateUserSchema
 from app.crud.shared.db_utils import ensure_unique, fetch_by_attr
+from app.services.token_versions import remember_token_version
 
 
 class UsersCrud:
     def __init__(self, db: Session):
         self.db = db
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    def sign_in_user(self, user_data: SignInSchema):
-        user = fetch_by_attr(self.db, User, "email", user_data.email, "User not found")
-        if not self._verify_password(user_data.password, user.hashed_password):
-            raise HTTPException(status_code=401, detail="Invalid password")
-        return user
+    def get_user_by_email(self, email: str):
+        return fetch_by_attr(self.db, User, "email", email, "User not found")
+
+    def ensure_email_available(self, email: str):
+        ensure_unique(self.db, User, "email", email, "Email already in use")
 
-    def sign_up_user(self, user_data: SignUpSchema):
-        ensure_unique(self.db, User, "email", user_data.email, "Email already in use")
-        user_params = user_data.model_dump()
-        user_params["hashed_password"] = self._get_password_hash(
-            user_params.pop("password")
-        )
+    def sign_up_user(self, user_data: SignUpSchema, hashed_password: str):
+        # Checked again, another sign up may have taken the email while hashing
+        self.ensure_email_available(user_data.email)
+        user_params = user_data.model_dump(exclude={"password"})
+        user_params["hashed_password"] = hashed_password
         user = User(**user_params)
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
         return user
 
-    def update_user(self, user: User, user_data: UpdateUserSchema):
-        user_params = user_data.model_dump(exclude_unset=True)
+    def update_user(
+        self,
+        user: User,
+        user_data: UpdateUserSchema,
+        hashed_password: str | None = None,
+    ):
+        user = self.db.merge(user)
+        user_params = user_data.model_dump(exclude_unset=True, exclude={"password"})
         if "email" in user_params and user_data.email != user.email:
             ensure_unique(
                 self.db, User, "email", user_data.email, "Email already in use"
             )
-        if "password" in user_params:
-            user_params["hashed_password"] = self._get_password_hash(
-                user_params.pop("password")
-            )
+        if hashed_password is not None:
+            # A new password signs out every existing token
+            user_params["hashed_password"] = hashed_password
+            user_params["token_version"] = user.token_version + 1
         for key, value in user_params.items():
             setattr(user, key, value)
         self.db.commit()
         self.db.refresh(user)
+        if hashed_password is not None:
+            remember_token_version(user.id, user.token_version)
         return user
 
-    def remove_user(self, user: User):
-        self.db.delete(user)
+    def update_password_hash(self, user: User, hashed_password: str):
+        user = self.db.merge(user)
+        user.hashed_password = hashed_password
         self.db.commit()
 
-    def _get_password_hash(self, password: str):
-        return self.pwd_context.hash(password)
-
-    def _verify_password(self, plain_password: str, hashed_password: str):
-        return self.pwd_context.verify(plain_password, hashed_password)
+    def remove_user(self, user: User):
+        self.db.delete(self.db.merge(user))
+        self.db.commit()
+        remember_token_version(user.id, None)
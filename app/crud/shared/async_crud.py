@@ -0,0 +1,36 @@
+from typing import Generic, TypeVar
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.services.tracing import traced
+
+CrudT = TypeVar("CrudT")
+
+
+class AsyncCrud(Generic[CrudT]):
+    """Exposes every method of a sync CRUD class as a coroutine.
+
+    With an ``AsyncSession`` the method runs through ``run_sync`` on the async
+    driver, with a plain ``Session`` it is offloaded to the threadpool. Either
+    way the event loop is never blocked by a query.
+    """
+
+    def __init__(self, crud_class: type[CrudT], db: Session | AsyncSession):
+        self.crud_class = crud_class
+        self.db = db
+
+    def __getattr__(self, name: str):
+        method = traced(f"{self.crud_class.__name__}.{name}")(
+            getattr(self.crud_class, name)
+        )
+
+        async def call(*args, **kwargs):
+            if isinstance(self.db, AsyncSession):
+                return await self.db.run_sync(
+                    lambda session: method(self.crud_class(session), *args, **kwargs)
+                )
+            return await run_in_threadpool(
+                method, self.crud_class(self.db), *args, **kwargs
+            )
+
+        return call
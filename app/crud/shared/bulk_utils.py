@@ -0,0 +1,138 @@
+from sqlalchemy import select, insert, update, delete, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.orm import Session
+from app.schemas.bulk import BulkItemResult, BulkResponse
+
+
+def match_any(column, values):
+    # One array parameter instead of one bind per value keeps large batches cheap
+    return column == any_(literal(list(values), ARRAY(column.type)))
+
+
+def fetch_existing_ids(db_session: Session, model, ids) -> set:
+    return set(db_session.scalars(select(model.id).where(match_any(model.id, ids))))
+
+
+def insert_ignoring_conflicts(db_session: Session, model, rows: list[dict]) -> set:
+    # Primary keys of the rows actually inserted; conflicting rows are skipped
+    if not rows:
+        return set()
+    primary_key = model.__table__.primary_key.columns
+    return set(
+        db_session.execute(
+            pg_insert(model).on_conflict_do_nothing().returning(*primary_key), rows
+        ).tuples()
+    )
+
+
+def find_duplicates(values: list) -> set:
+    # Indexes of values already seen earlier in the same batch
+    seen, duplicates = set(), set()
+    for index, value in enumerate(values):
+        if value in seen:
+            duplicates.add(index)
+        seen.add(value)
+    return duplicates
+
+
+def bulk_create(
+    db_session: Session,
+    model,
+    rows: list[dict],
+    errors: dict,
+    conflict_column: str | None = None,
+    conflict_message: str | None = None,
+) -> BulkResponse:
+    # Rows clashing on conflict_column's unique index are skipped by the insert
+    # itself and fail with conflict_message, so no lookup can race the insert
+    valid = [index for index in range(len(rows)) if index not in errors]
+    created = {}
+    if valid and conflict_column is None:
+        ids = db_session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [rows[index] for index in valid],
+        ).all()
+        db_session.commit()
+        created = dict(zip(valid, ids))
+    elif valid:
+        inserted = dict(
+            db_session.execute(
+                pg_insert(model)
+                .on_conflict_do_nothing(index_elements=[conflict_column])
+                .returning(getattr(model, conflict_column), model.id),
+                [rows[index] for index in valid],
+            ).all()
+        )
+        db_session.commit()
+        for index in valid:
+            key = rows[index][conflict_column]
+            if key in inserted:
+                created[index] = inserted[key]
+            else:
+                errors[index] = conflict_message
+    return bulk_response(len(rows), "created", created, errors)
+
+
+def bulk_update(
+    db_session: Session, model, rows: list[dict], not_found_message, errors: dict
+) -> BulkResponse:
+    ids = [row["id"] for row in rows]
+    existing = fetch_existing_ids(db_session, model, ids)
+    for index in find_duplicates(ids):
+        errors.setdefault(index, "Duplicate id in request")
+    for index, item_id in enumerate(ids):
+        if item_id not in existing:
+            errors.setdefault(index, not_found_message)
+
+    valid = [index for index in range(len(rows)) if index not in errors]
+    changes = [rows[index] for index in valid if len(rows[index]) > 1]
+    if changes:
+        db_session.execute(update(model), changes)
+        db_session.commit()
+    updated = {index: ids[index] for index in valid}
+    return bulk_response(len(rows), "updated", updated, errors, ids)
+
+
+def bulk_delete(
+    db_session: Session, model, ids: list[int], not_found_message
+) -> BulkResponse:
+    deleted = set(
+        db_session.scalars(
+            delete(model)
+            .where(match_any(model.id, ids))
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+    )
+    db_session.commit()
+    errors = {}
+    for index in find_duplicates(ids):
+        errors[index] = "Duplicate id in request"
+    for index, item_id in enumerate(ids):
+        if item_id not in deleted:
+            errors.setdefault(index, not_found_message)
+    succeeded = {
+        index: item_id for index, item_id in enumerate(ids) if index not in errors
+    }
+    return bulk_response(len(ids), "deleted", succeeded, errors, ids)
+
+
+def bulk_response(
+    total: int, status: str, succeeded: dict, errors: dict, ids: list | None = None
+) -> BulkResponse:
+    results = [
+        (
+            BulkItemResult(index=index, id=succeeded[index], status=status)
+            if index in succeeded
+            else BulkItemResult(
+                index=index,
+                id=ids[index] if ids else None,
+                status="failed",
+                detail=errors[index],
+            )
+        )
+        for index in range(total)
+    ]
+    return BulkResponse(
+        succeeded=len(succeeded), failed=total - len(succeeded), results=results
+    )
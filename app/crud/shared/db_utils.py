@@ -1,17 +1,46 @@
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException
+from app.crud.shared.bulk_utils import match_any
 
+FOREIGN_KEY_VIOLATION = "23503"
 
-def fetch_by_id(db_session: Session, model, item_id, not_found_message):
+
+def fetch_by_id(db_session: Session, model, item_id, not_found_message, options=()):
     item = db_session.execute(
-        select(model).where(model.id == item_id)
+        select(model).where(model.id == item_id).options(*options)
     ).scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail=not_found_message)
     return item
 
 
+def fetch_version(db_session: Session, model, item_id):
+    """(id, updated_at) of one row without loading it, None if it does not exist."""
+    return db_session.execute(
+        select(model.id, _with_time_zone(model.updated_at)).where(model.id == item_id)
+    ).first()
+
+
+def _with_time_zone(timestamp):
+    # Timestamps are stored without a zone in the server's TimeZone
+    return func.timezone(func.current_setting("TimeZone"), timestamp)
+
+
+def stream_rows(db_session: Session, stmt: select, batch_size: int = 1000):
+    """Yields rows through a server-side cursor, batch_size rows in memory at a time."""
+    result = db_session.execute(stmt, execution_options={"yield_per": batch_size})
+    for partition in result.partitions():
+        yield from partition
+
+
+def eager_load(model, relations) -> list:
+    # One SELECT ... WHERE id IN (...) per relation, regardless of page size
+    return [selectinload(getattr(model, relation)) for relation in sorted(relations)]
+
+
 def fetch_by_attr(db_session: Session, model, attr, value, not_found_message):
     item = db_session.execute(
         select(model).where(getattr(model, attr) == value)
@@ -22,21 +51,95 @@ def fetch_by_attr(db_session: Session, model, attr, value, not_found_message):
 
 
 def ensure_unique(db_session: Session, model, field, value, error_message):
-    if db_session.execute(
-        select(model).where(getattr(model, field) == value)
-    ).scalar_one_or_none():
+    if db_session.scalar(select(exists().where(getattr(model, field) == value))):
         raise HTTPException(status_code=400, detail=error_message)
 
 
-def ensure_association_does_not_exist(db_session: Session, model, **kwargs):
-    if db_session.execute(select(model).filter_by(**kwargs)).scalar_one_or_none():
+def create_association(db_session: Session, model, not_found_messages: dict, **kwargs):
+    stmt = (
+        insert(model)
+        .values(**kwargs)
+        .on_conflict_do_nothing()
+        .returning(*model.__table__.primary_key.columns)
+    )
+    try:
+        created = db_session.execute(stmt).first()
+    except IntegrityError as error:
+        db_session.rollback()
+        if getattr(error.orig, "pgcode", None) != FOREIGN_KEY_VIOLATION:
+            raise
+        raise_missing_parent(db_session, model, not_found_messages, **kwargs)
+        raise
+    if created is None:
+        db_session.rollback()
         raise HTTPException(status_code=400, detail="Association already exists")
+    db_session.commit()
+
+
+def delete_association(db_session: Session, model, not_found_messages: dict, **kwargs):
+    result = db_session.execute(delete(model).filter_by(**kwargs))
+    if result.rowcount:
+        db_session.commit()
+        return
+    db_session.rollback()
+    raise_missing_parent(db_session, model, not_found_messages, **kwargs)
+    raise HTTPException(status_code=404, detail="Association not found")
+
 
+def replace_associations(
+    db_session: Session,
+    model,
+    not_found_messages: dict,
+    owner_column: str,
+    owner_id: int,
+    target_column: str,
+    target_ids: list[int],
+):
+    owner = model.__table__.c[owner_column]
+    target = model.__table__.c[target_column]
+    (owner_key,) = owner.foreign_keys
+    (target_key,) = target.foreign_keys
+    desired = set(target_ids)
 
-def fetch_association(db_session: Session, model, not_found_message, **kwargs):
-    association = db_session.execute(
-        select(model).filter_by(**kwargs)
+    # Locking the owner row serializes concurrent replacements of the same set
+    locked = db_session.execute(
+        select(owner_key.column).where(owner_key.column == owner_id).with_for_update()
     ).scalar_one_or_none()
-    if not association:
-        raise HTTPException(status_code=404, detail=not_found_message)
-    return association
+    if locked is None:
+        raise HTTPException(status_code=404, detail=not_found_messages[owner_column])
+    found = set(
+        db_session.scalars(
+            select(target_key.column).where(match_any(target_key.column, desired))
+        )
+    )
+    if desired - found:
+        db_session.rollback()
+        raise HTTPException(status_code=404, detail=not_found_messages[target_column])
+
+    current = set(db_session.scalars(select(target).where(owner == owner_id)))
+    added, removed = desired - current, current - desired
+    if removed:
+        db_session.execute(
+            delete(model).where(owner == owner_id, match_any(target, removed))
+        )
+    if added:
+        db_session.execute(
+            insert(model).on_conflict_do_nothing(),
+            [{owner_column: owner_id, target_column: value} for value in added],
+        )
+    db_session.commit()
+    return {"ids": sorted(desired), "added": sorted(added), "removed": sorted(removed)}
+
+
+def raise_missing_parent(
+    db_session: Session, model, not_found_messages: dict, **kwargs
+):
+    # Only failed writes get here, so telling the parents apart costs one query
+    checks = {}
+    for column_name in not_found_messages:
+        (foreign_key,) = model.__table__.c[column_name].foreign_keys
+        checks[column_name] = exists().where(foreign_key.column == kwargs[column_name])
+    found = db_session.execute(select(*checks.values())).one()
+    for column_name, parent_exists in zip(checks, found):
+        if not parent_exists:
+            raise HTTPException(status_code=404, detail=not_found_messages[column_name])
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Iterator
+from sqlalchemy.orm import Session
+
+IMPORT_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+
+
+def import_format(filename: str) -> str | None:
+    """Format of an import file from its extension, None if unsupported."""
+    for suffix, file_format in IMPORT_FORMATS.items():
+        if filename.lower().endswith(suffix):
+            return file_format
+    return None
+
+
+def read_records(file: IO[str], file_format: str) -> Iterator[tuple[int, dict]]:
+    """Yields (line number, record) pairs without reading the whole file."""
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError:
+            record = None
+        # Lines that are not JSON objects come through as None
+        yield line, record if isinstance(record, dict) else None
+
+
+def batched(records, size: int):
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def copy_rows(db_session: Session, table: str, columns: list[str], rows) -> None:
+    """Loads rows with COPY ... FROM STDIN on the session's own connection."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db_session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_value(value) -> str:
+    # In COPY's CSV format only an unquoted empty field is NULL
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
@@ -1,15 +1,36 @@
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
-from app.routers.api.v1 import authors, genres, sessions, books
+from app.routers.api.v1 import authors, genres, sessions, books, associations
+from app.routers import metrics
 from app.admin.index import admin
+from app.services.response_cache import (
+    ResponseCacheMiddleware,
+    configure_response_cache,
+)
+from app.services.replicas import ReadYourWritesMiddleware
+from app.services.metrics import MetricsMiddleware
+from app.services.query_inspector import QueryInspectorMiddleware
+from app.services.tracing import TracingMiddleware, configure_tracing
 
+configure_tracing()
+configure_response_cache()
 app = FastAPI(debug=True)
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryInspectorMiddleware)
+app.add_middleware(TracingMiddleware)
+# Outermost, so cached responses and middleware time are measured too
+app.add_middleware(MetricsMiddleware)
 admin.mount_to(app)
 
 app.include_router(books.router, prefix="/api/v1/books", tags=["v1 books"])
 app.include_router(authors.router, prefix="/api/v1/authors", tags=["v1 authors"])
 app.include_router(genres.router, prefix="/api/v1/genres", tags=["v1 genres"])
 app.include_router(sessions.router, prefix="/api/v1/sessions", tags=["v1 sessions"])
+app.include_router(
+    associations.router, prefix="/api/v1/associations", tags=["v1 associations"]
+)
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 @app.get("/health")
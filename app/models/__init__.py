@@ -1,3 +1,5 @@
+from sqlalchemy import DDL, event
+from app.config import Base
 from app.models.book import Book
 from app.models.author import Author
 from app.models.genre import Genre
@@ -6,3 +8,8 @@ from app.models.book_genre import BookGenre
 from app.models.user import User
 
 __all__ = ["Book", "Author", "Genre", "BookAuthor", "BookGenre", "User"]
+
+# Trigram indexes need the extension before create_all builds them
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
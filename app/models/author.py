@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.config import Base
@@ -6,6 +7,32 @@ from app.config import Base
 
 class Author(Base):
     __tablename__ = "authors"
+    __table_args__ = (
+        Index("ix_authors_name_id", "name", "id"),
+        Index("ix_authors_surname_id", "surname", "id"),
+        Index("ix_authors_year_of_birth_id", "year_of_birth", "id"),
+        Index("ix_authors_created_at_id", "created_at", "id"),
+        Index("ix_authors_updated_at_id", "updated_at", "id"),
+        Index("ix_authors_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_authors_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_authors_surname_trgm",
+            "surname",
+            postgresql_using="gin",
+            postgresql_ops={"surname": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_authors_biography_trgm",
+            "biography",
+            postgresql_using="gin",
+            postgresql_ops={"biography": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
@@ -14,5 +41,14 @@ class Author(Base):
     biography = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(surname, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(biography, '')), 'B')",
+            persisted=True,
+        ),
+    )
 
     books = relationship("Book", secondary="book_author", back_populates="authors")
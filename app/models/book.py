@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.config import Base
@@ -6,6 +7,34 @@ from app.config import Base
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_title_id", "title", "id"),
+        Index("ix_books_year_of_publication_id", "year_of_publication", "id"),
+        Index("ix_books_series_id", "series", "id"),
+        Index("ix_books_file_link_id", "file_link", "id"),
+        Index("ix_books_edition_id", "edition", "id"),
+        Index("ix_books_created_at_id", "created_at", "id"),
+        Index("ix_books_updated_at_id", "updated_at", "id"),
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_books_series_trgm",
+            "series",
+            postgresql_using="gin",
+            postgresql_ops={"series": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
@@ -17,6 +46,15 @@ class Book(Base):
     edition = Column(String)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(series, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+    )
 
     authors = relationship("Author", secondary="book_author", back_populates="books")
     genres = relationship("Genre", secondary="book_genre", back_populates="books")
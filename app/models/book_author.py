@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, func
 from app.config import Base
 
 
 class BookAuthor(Base):
     __tablename__ = "book_author"
+    # The primary key leads with book_id, so lookups from the other side need this
+    __table_args__ = (
+        Index("ix_book_author_author_id_book_id", "author_id", "book_id"),
+    )
 
     book_id = Column(
         Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.config import Base
@@ -6,11 +7,37 @@ from app.config import Base
 
 class Genre(Base):
     __tablename__ = "genres"
+    __table_args__ = (
+        Index("ix_genres_name_id", "name", "id"),
+        Index("ix_genres_created_at_id", "created_at", "id"),
+        Index("ix_genres_updated_at_id", "updated_at", "id"),
+        Index("ix_genres_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_genres_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_genres_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     description = Column(Text)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
 
     books = relationship("Book", secondary="book_genre", back_populates="genres")
@@ -13,6 +13,8 @@ class User(Base):
     surname = Column(String)
     avatar_link = Column(String)
     access_level = Column(Integer, default=0)
+    # Bumped to revoke every token issued before the change
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,47 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.schemas.api.v1.association import AssociationSchema
+from app.schemas.bulk import BulkRequest, BulkResponse
+from app.crud.api.v1.associations import AssociationsCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.models.book_author import BookAuthor
+from app.models.book_genre import BookGenre
+from app.services.export import ExportFormat, export_response
+from app.services.tracing import TracedRoute
+from app.routers.shared.response_templates import invalid_authentication_responses
+from app.routers.api.v1.shared.depends import (
+    get_associations_crud,
+    get_stream_db,
+    get_librarian_user,
+)
+
+router = APIRouter(route_class=TracedRoute)
+
+association_tables = {"book_author": BookAuthor, "book_genre": BookGenre}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_associations(
+    table: Literal["book_author", "book_genre"],
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    db=Depends(get_stream_db),
+):
+    model = association_tables[table]
+    rows = AssociationsCrud(db).export_associations(model)
+    return export_response(
+        db, rows, model.__table__.columns.keys(), export_format, table
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_create_associations(
+    associations: BulkRequest[AssociationSchema],
+    crud: AsyncCrud[AssociationsCrud] = Depends(get_associations_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_create_associations(associations=associations.items)
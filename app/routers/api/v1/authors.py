@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.schemas.api.v1.author import (
     AuthorSchema,
     CreateAuthorSchema,
     UpdateAuthorSchema,
+    BulkUpdateAuthorSchema,
     AuthorSortingSchema,
     author_search_dependency,
 )
@@ -11,41 +13,95 @@ from app.schemas.api.v1.book import (
     BookSortingSchema,
     book_search_dependency,
 )
+from app.schemas.api.v1.include import (
+    AuthorWithBooksSchema,
+    author_include_dependency,
+)
 from app.schemas.pagination import PaginationParams, PaginatedResponse
+from app.schemas.bulk import BulkRequest, BulkDeleteRequest, BulkResponse
 from app.crud.api.v1.authors import AuthorsCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.services.export import ExportFormat, export_response
+from app.services.tracing import TracedRoute
 from app.routers.shared.response_templates import (
     not_found_response,
     bad_request_response,
     invalid_authentication_responses,
     filtering_validation_error_response,
+    invalid_cursor_response,
+    not_modified_response,
     combine_responses,
 )
-from app.routers.api.v1.shared.depends import get_authors_crud, get_librarian_user
+from app.routers.api.v1.shared.conditional import check_page_not_modified
+from app.routers.api.v1.shared.depends import (
+    get_authors_crud,
+    get_authors_read_crud,
+    get_stream_db,
+    get_librarian_user,
+    author_etag,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.get(
     "/",
-    response_model=PaginatedResponse[AuthorSchema],
-    responses=filtering_validation_error_response(),
+    response_model=PaginatedResponse[AuthorWithBooksSchema],
+    response_model_exclude_unset=True,
+    responses=combine_responses(
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
+        not_modified_response(),
+    ),
 )
 async def get_authors(
+    request: Request,
+    response: Response,
     filters: dict = Depends(author_search_dependency),
     sorting_params: AuthorSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    include: set[str] = Depends(author_include_dependency),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_read_crud),
 ):
-    return crud.get_authors(
-        filters=filters, sorting_params=sorting_params, pagination=pagination
+    page = await crud.get_authors(
+        filters=filters,
+        sorting_params=sorting_params,
+        pagination=pagination,
+        include=include,
     )
+    check_page_not_modified(request, response, page)
+    return page
 
 
 @router.get(
-    "/{author_id}", response_model=AuthorSchema, responses=not_found_response("author")
+    "/export",
+    response_class=StreamingResponse,
+    responses=filtering_validation_error_response(),
 )
-async def get_author(author_id: int, crud: AuthorsCrud = Depends(get_authors_crud)):
-    return crud.get_author_by_id(author_id=author_id)
+async def export_authors(
+    filters: dict = Depends(author_search_dependency),
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    db=Depends(get_stream_db),
+):
+    rows = AuthorsCrud(db).export_authors(filters=filters)
+    return export_response(
+        db, rows, list(AuthorSchema.model_fields), export_format, "authors"
+    )
+
+
+@router.get(
+    "/{author_id}",
+    response_model=AuthorWithBooksSchema,
+    response_model_exclude_unset=True,
+    responses=combine_responses(not_found_response("author"), not_modified_response()),
+    dependencies=[Depends(author_etag)],
+)
+async def get_author(
+    author_id: int,
+    include: set[str] = Depends(author_include_dependency),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_read_crud),
+):
+    return await crud.get_author_by_id(author_id=author_id, include=include)
 
 
 @router.post(
@@ -56,10 +112,49 @@ async def get_author(author_id: int, crud: AuthorsCrud = Depends(get_authors_cru
 )
 async def create_author(
     author: CreateAuthorSchema,
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.create_author(author_data=author)
+    return await crud.create_author(author_data=author)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_create_authors(
+    authors: BulkRequest[CreateAuthorSchema],
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_create_authors(authors=authors.items)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_update_authors(
+    authors: BulkRequest[BulkUpdateAuthorSchema],
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_update_authors(authors=authors.items)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_delete_authors(
+    request: BulkDeleteRequest,
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_remove_authors(author_ids=request.ids)
 
 
 @router.patch(
@@ -72,10 +167,10 @@ async def create_author(
 async def update_author(
     author_id: int,
     author: UpdateAuthorSchema,
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.update_author(author_id=author_id, author_data=author)
+    return await crud.update_author(author_id=author_id, author_data=author)
 
 
 @router.delete(
@@ -87,10 +182,10 @@ async def update_author(
 )
 async def delete_author(
     author_id: int,
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_author(author_id=author_id)
+    await crud.remove_author(author_id=author_id)
     return Response(status_code=204)
 
 
@@ -98,17 +193,19 @@ async def delete_author(
     "/{author_id}/books",
     response_model=PaginatedResponse[BookSchema],
     responses=combine_responses(
-        not_found_response("author"), filtering_validation_error_response()
+        not_found_response("author"),
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
     ),
 )
-def get_books_of_author(
+async def get_books_of_author(
     author_id: int,
     filters: dict = Depends(book_search_dependency),
     sorting_params: BookSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_read_crud),
 ):
-    return crud.get_books_of_author(
+    return await crud.get_books_of_author(
         author_id=author_id,
         filters=filters,
         sorting_params=sorting_params,
@@ -126,13 +223,13 @@ def get_books_of_author(
         invalid_authentication_responses(),
     ),
 )
-def create_author_book_association(
+async def create_author_book_association(
     author_id: int,
     book_id: int,
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.create_author_book_association(author_id=author_id, book_id=book_id)
+    await crud.create_author_book_association(author_id=author_id, book_id=book_id)
     return Response(status_code=201)
 
 
@@ -149,8 +246,8 @@ def create_author_book_association(
 async def delete_author_book_association(
     author_id: int,
     book_id: int,
-    crud: AuthorsCrud = Depends(get_authors_crud),
+    crud: AsyncCrud[AuthorsCrud] = Depends(get_authors_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_author_book_association(author_id=author_id, book_id=book_id)
+    await crud.remove_author_book_association(author_id=author_id, book_id=book_id)
     return Response(status_code=204)
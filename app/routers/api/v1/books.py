@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, Response
+import io
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.schemas.api.v1.book import (
     BookSchema,
     CreateBookSchema,
     UpdateBookSchema,
+    BulkUpdateBookSchema,
     BookSortingSchema,
     book_search_dependency,
 )
@@ -16,43 +28,109 @@ from app.schemas.api.v1.genre import (
     GenreSortingSchema,
     genre_search_dependency,
 )
+from app.schemas.api.v1.include import (
+    BookWithRelationsSchema,
+    book_include_dependency,
+)
 from app.schemas.pagination import PaginationParams, PaginatedResponse
+from app.schemas.bulk import (
+    BulkRequest,
+    BulkDeleteRequest,
+    BulkResponse,
+    IMPORT_REJECTS_LIMIT,
+    ImportReject,
+    ImportResponse,
+)
+from app.schemas.api.v1.association import (
+    ReplaceAssociationsSchema,
+    ReplaceAssociationsResponse,
+)
 from app.crud.api.v1.books import BooksCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.crud.shared.import_utils import import_format, read_records
+from app.config import get_db
+from app.services.export import ExportFormat, export_response
+from app.services.tracing import TracedRoute
 from app.routers.shared.response_templates import (
     not_found_response,
     bad_request_response,
     invalid_authentication_responses,
     filtering_validation_error_response,
+    invalid_cursor_response,
+    not_modified_response,
     combine_responses,
 )
-from app.routers.api.v1.shared.depends import get_books_crud, get_librarian_user
+from app.routers.api.v1.shared.conditional import check_page_not_modified
+from app.routers.api.v1.shared.depends import (
+    get_books_crud,
+    get_books_read_crud,
+    get_stream_db,
+    get_librarian_user,
+    get_admin_user,
+    book_etag,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.get(
     "/",
-    response_model=PaginatedResponse[BookSchema],
-    responses=filtering_validation_error_response(),
+    response_model=PaginatedResponse[BookWithRelationsSchema],
+    response_model_exclude_unset=True,
+    responses=combine_responses(
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
+        not_modified_response(),
+    ),
 )
 async def get_books(
+    request: Request,
+    response: Response,
     filters: dict = Depends(book_search_dependency),
     sorting_params: BookSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: BooksCrud = Depends(get_books_crud),
+    include: set[str] = Depends(book_include_dependency),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_read_crud),
 ):
-    return crud.get_books(
+    page = await crud.get_books(
         filters=filters,
         sorting_params=sorting_params,
         pagination=pagination,
+        include=include,
+    )
+    check_page_not_modified(request, response, page)
+    return page
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses=filtering_validation_error_response(),
+)
+async def export_books(
+    filters: dict = Depends(book_search_dependency),
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    db=Depends(get_stream_db),
+):
+    rows = BooksCrud(db).export_books(filters=filters)
+    return export_response(
+        db, rows, list(BookSchema.model_fields), export_format, "books"
     )
 
 
 @router.get(
-    "/{book_id}", response_model=BookSchema, responses=not_found_response("book")
+    "/{book_id}",
+    response_model=BookWithRelationsSchema,
+    response_model_exclude_unset=True,
+    responses=combine_responses(not_found_response("book"), not_modified_response()),
+    dependencies=[Depends(book_etag)],
 )
-async def get_book(book_id: int, crud: BooksCrud = Depends(get_books_crud)):
-    return crud.get_book_by_id(book_id=book_id)
+async def get_book(
+    book_id: int,
+    include: set[str] = Depends(book_include_dependency),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_read_crud),
+):
+    return await crud.get_book_by_id(book_id=book_id, include=include)
 
 
 @router.post(
@@ -65,10 +143,79 @@ async def get_book(book_id: int, crud: BooksCrud = Depends(get_books_crud)):
 )
 async def create_book(
     book: CreateBookSchema,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.create_book(book_data=book)
+
+
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    responses=invalid_authentication_responses(),
+)
+async def import_books(
+    file: UploadFile,
+    db=Depends(get_db),
+    current_user=Depends(get_admin_user),
+):
+    file_format = import_format(file.filename or "")
+    if file_format is None:
+        raise HTTPException(
+            status_code=422, detail="Import file must be .ndjson, .jsonl or .csv"
+        )
+    rejects = []
+
+    def reject(line, record, detail):
+        # A bad file can reject every line, the summary counts the rest
+        if len(rejects) < IMPORT_REJECTS_LIMIT:
+            rejects.append(ImportReject(line=line, detail=detail, record=record))
+
+    # COPY needs the psycopg2 connection, so this always runs on the sync session
+    records = read_records(
+        io.TextIOWrapper(file.file, encoding="utf-8", newline=""), file_format
+    )
+    summary = await run_in_threadpool(BooksCrud(db).import_books, records, reject)
+    return ImportResponse(**summary, rejects=rejects)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_create_books(
+    books: BulkRequest[CreateBookSchema],
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.create_book(book_data=book)
+    return await crud.bulk_create_books(books=books.items)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_update_books(
+    books: BulkRequest[BulkUpdateBookSchema],
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_update_books(books=books.items)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_delete_books(
+    request: BulkDeleteRequest,
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_remove_books(book_ids=request.ids)
 
 
 @router.patch(
@@ -83,10 +230,10 @@ async def create_book(
 async def update_book(
     book_id: int,
     book: UpdateBookSchema,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.update_book(book_id=book_id, book_data=book)
+    return await crud.update_book(book_id=book_id, book_data=book)
 
 
 @router.delete(
@@ -98,10 +245,10 @@ async def update_book(
 )
 async def delete_book(
     book_id: int,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_book(book_id=book_id)
+    await crud.remove_book(book_id=book_id)
     return Response(status_code=204)
 
 
@@ -109,17 +256,19 @@ async def delete_book(
     "/{book_id}/authors",
     response_model=PaginatedResponse[AuthorSchema],
     responses=combine_responses(
-        not_found_response("book"), filtering_validation_error_response()
+        not_found_response("book"),
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
     ),
 )
-def get_authors_of_book(
+async def get_authors_of_book(
     book_id: int,
     filters: dict = Depends(author_search_dependency),
     sorting_params: AuthorSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_read_crud),
 ):
-    return crud.get_authors_of_book(
+    return await crud.get_authors_of_book(
         book_id=book_id,
         filters=filters,
         sorting_params=sorting_params,
@@ -127,6 +276,24 @@ def get_authors_of_book(
     )
 
 
+@router.put(
+    "/{book_id}/authors",
+    response_model=ReplaceAssociationsResponse,
+    responses=combine_responses(
+        not_found_response("book"),
+        not_found_response("author"),
+        invalid_authentication_responses(),
+    ),
+)
+async def replace_book_authors(
+    book_id: int,
+    authors: ReplaceAssociationsSchema,
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.replace_book_authors(book_id=book_id, author_ids=authors.ids)
+
+
 @router.post(
     "/{book_id}/authors/{author_id}",
     status_code=201,
@@ -137,13 +304,13 @@ def get_authors_of_book(
         invalid_authentication_responses(),
     ),
 )
-def create_book_author_association(
+async def create_book_author_association(
     book_id: int,
     author_id: int,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.create_book_author_association(book_id=book_id, author_id=author_id)
+    await crud.create_book_author_association(book_id=book_id, author_id=author_id)
     return Response(status_code=201)
 
 
@@ -160,10 +327,10 @@ def create_book_author_association(
 async def delete_book_author_association(
     book_id: int,
     author_id: int,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_book_author_association(book_id=book_id, author_id=author_id)
+    await crud.remove_book_author_association(book_id=book_id, author_id=author_id)
     return Response(status_code=204)
 
 
@@ -171,17 +338,19 @@ async def delete_book_author_association(
     "/{book_id}/genres",
     response_model=PaginatedResponse[GenreSchema],
     responses=combine_responses(
-        not_found_response("book"), filtering_validation_error_response()
+        not_found_response("book"),
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
     ),
 )
-def get_genres_of_book(
+async def get_genres_of_book(
     book_id: int,
     filters: dict = Depends(genre_search_dependency),
     sorting_params: GenreSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_read_crud),
 ):
-    return crud.get_genres_of_book(
+    return await crud.get_genres_of_book(
         book_id=book_id,
         filters=filters,
         sorting_params=sorting_params,
@@ -189,6 +358,24 @@ def get_genres_of_book(
     )
 
 
+@router.put(
+    "/{book_id}/genres",
+    response_model=ReplaceAssociationsResponse,
+    responses=combine_responses(
+        not_found_response("book"),
+        not_found_response("genre"),
+        invalid_authentication_responses(),
+    ),
+)
+async def replace_book_genres(
+    book_id: int,
+    genres: ReplaceAssociationsSchema,
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.replace_book_genres(book_id=book_id, genre_ids=genres.ids)
+
+
 @router.post(
     "/{book_id}/genres/{genre_id}",
     status_code=201,
@@ -199,13 +386,13 @@ def get_genres_of_book(
         invalid_authentication_responses(),
     ),
 )
-def create_book_genre_association(
+async def create_book_genre_association(
     book_id: int,
     genre_id: int,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.create_book_genre_association(book_id=book_id, genre_id=genre_id)
+    await crud.create_book_genre_association(book_id=book_id, genre_id=genre_id)
     return Response(status_code=201)
 
 
@@ -222,8 +409,8 @@ def create_book_genre_association(
 async def delete_book_genre_association(
     book_id: int,
     genre_id: int,
-    crud: BooksCrud = Depends(get_books_crud),
+    crud: AsyncCrud[BooksCrud] = Depends(get_books_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_book_genre_association(book_id=book_id, genre_id=genre_id)
+    await crud.remove_book_genre_association(book_id=book_id, genre_id=genre_id)
     return Response(status_code=204)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.schemas.api.v1.genre import (
     GenreSchema,
     CreateGenreSchema,
     UpdateGenreSchema,
+    BulkUpdateGenreSchema,
     GenreSortingSchema,
     genre_search_dependency,
 )
@@ -11,41 +13,95 @@ from app.schemas.api.v1.book import (
     BookSortingSchema,
     book_search_dependency,
 )
+from app.schemas.api.v1.include import (
+    GenreWithBooksSchema,
+    genre_include_dependency,
+)
 from app.schemas.pagination import PaginationParams, PaginatedResponse
+from app.schemas.bulk import BulkRequest, BulkDeleteRequest, BulkResponse
 from app.crud.api.v1.genres import GenresCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.services.export import ExportFormat, export_response
+from app.services.tracing import TracedRoute
 from app.routers.shared.response_templates import (
     not_found_response,
     bad_request_response,
     invalid_authentication_responses,
     filtering_validation_error_response,
+    invalid_cursor_response,
+    not_modified_response,
     combine_responses,
 )
-from app.routers.api.v1.shared.depends import get_genres_crud, get_librarian_user
+from app.routers.api.v1.shared.conditional import check_page_not_modified
+from app.routers.api.v1.shared.depends import (
+    get_genres_crud,
+    get_genres_read_crud,
+    get_stream_db,
+    get_librarian_user,
+    genre_etag,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.get(
     "/",
-    response_model=PaginatedResponse[GenreSchema],
-    responses=filtering_validation_error_response(),
+    response_model=PaginatedResponse[GenreWithBooksSchema],
+    response_model_exclude_unset=True,
+    responses=combine_responses(
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
+        not_modified_response(),
+    ),
 )
 async def get_genres(
+    request: Request,
+    response: Response,
     filters: dict = Depends(genre_search_dependency),
     sorting_params: GenreSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: GenresCrud = Depends(get_genres_crud),
+    include: set[str] = Depends(genre_include_dependency),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_read_crud),
 ):
-    return crud.get_genres(
-        filters=filters, sorting_params=sorting_params, pagination=pagination
+    page = await crud.get_genres(
+        filters=filters,
+        sorting_params=sorting_params,
+        pagination=pagination,
+        include=include,
     )
+    check_page_not_modified(request, response, page)
+    return page
 
 
 @router.get(
-    "/{genre_id}", response_model=GenreSchema, responses=not_found_response("genre")
+    "/export",
+    response_class=StreamingResponse,
+    responses=filtering_validation_error_response(),
 )
-async def get_genre(genre_id: int, crud: GenresCrud = Depends(get_genres_crud)):
-    return crud.get_genre_by_id(genre_id=genre_id)
+async def export_genres(
+    filters: dict = Depends(genre_search_dependency),
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    db=Depends(get_stream_db),
+):
+    rows = GenresCrud(db).export_genres(filters=filters)
+    return export_response(
+        db, rows, list(GenreSchema.model_fields), export_format, "genres"
+    )
+
+
+@router.get(
+    "/{genre_id}",
+    response_model=GenreWithBooksSchema,
+    response_model_exclude_unset=True,
+    responses=combine_responses(not_found_response("genre"), not_modified_response()),
+    dependencies=[Depends(genre_etag)],
+)
+async def get_genre(
+    genre_id: int,
+    include: set[str] = Depends(genre_include_dependency),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_read_crud),
+):
+    return await crud.get_genre_by_id(genre_id=genre_id, include=include)
 
 
 @router.post(
@@ -56,10 +112,49 @@ async def get_genre(genre_id: int, crud: GenresCrud = Depends(get_genres_crud)):
 )
 async def create_genre(
     genre: CreateGenreSchema,
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.create_genre(genre_data=genre)
+    return await crud.create_genre(genre_data=genre)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_create_genres(
+    genres: BulkRequest[CreateGenreSchema],
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_create_genres(genres=genres.items)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_update_genres(
+    genres: BulkRequest[BulkUpdateGenreSchema],
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_update_genres(genres=genres.items)
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResponse,
+    responses=invalid_authentication_responses(),
+)
+async def bulk_delete_genres(
+    request: BulkDeleteRequest,
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
+    current_user=Depends(get_librarian_user),
+):
+    return await crud.bulk_remove_genres(genre_ids=request.ids)
 
 
 @router.patch(
@@ -72,10 +167,10 @@ async def create_genre(
 async def update_genre(
     genre_id: int,
     genre: UpdateGenreSchema,
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
     current_user=Depends(get_librarian_user),
 ):
-    return crud.update_genre(genre_id=genre_id, genre_data=genre)
+    return await crud.update_genre(genre_id=genre_id, genre_data=genre)
 
 
 @router.delete(
@@ -87,10 +182,10 @@ async def update_genre(
 )
 async def delete_genre(
     genre_id: int,
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_genre(genre_id=genre_id)
+    await crud.remove_genre(genre_id=genre_id)
     return Response(status_code=204)
 
 
@@ -98,17 +193,19 @@ async def delete_genre(
     "/{genre_id}/books",
     response_model=PaginatedResponse[BookSchema],
     responses=combine_responses(
-        not_found_response("genre"), filtering_validation_error_response()
+        not_found_response("genre"),
+        filtering_validation_error_response(),
+        invalid_cursor_response(),
     ),
 )
-def get_books_of_genre(
+async def get_books_of_genre(
     genre_id: int,
     filters: dict = Depends(book_search_dependency),
     sorting_params: BookSortingSchema = Depends(),
     pagination: PaginationParams = Depends(),
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_read_crud),
 ):
-    return crud.get_books_of_genre(
+    return await crud.get_books_of_genre(
         genre_id=genre_id,
         filters=filters,
         sorting_params=sorting_params,
@@ -126,13 +223,13 @@ def get_books_of_genre(
         invalid_authentication_responses(),
     ),
 )
-def create_genre_book_association(
+async def create_genre_book_association(
     genre_id: int,
     book_id: int,
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.create_genre_book_association(genre_id=genre_id, book_id=book_id)
+    await crud.create_genre_book_association(genre_id=genre_id, book_id=book_id)
     return Response(status_code=201)
 
 
@@ -149,8 +246,8 @@ def create_genre_book_association(
 async def delete_genre_book_association(
     genre_id: int,
     book_id: int,
-    crud: GenresCrud = Depends(get_genres_crud),
+    crud: AsyncCrud[GenresCrud] = Depends(get_genres_crud),
     current_user=Depends(get_librarian_user),
 ):
-    crud.remove_genre_book_association(genre_id=genre_id, book_id=book_id)
+    await crud.remove_genre_book_association(genre_id=genre_id, book_id=book_id)
     return Response(status_code=204)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, HTTPException, Response
 from app.crud.api.v1.users import UsersCrud
+from app.crud.shared.async_crud import AsyncCrud
 from app.schemas.api.v1.user import (
     UserSchema,
     SignUpSchema,
@@ -8,23 +9,35 @@ from app.schemas.api.v1.user import (
 )
 from app.routers.api.v1.shared.depends import get_users_crud
 from app.services.authorization import create_jwt_token, get_current_user
+from app.services.passwords import hash_password, verify_and_update_password
+from app.services.tracing import TracedRoute
 from app.schemas.token import Token
 from app.routers.shared.response_templates import (
     bad_request_response,
     invalid_authentication_responses,
     invalid_password_response,
     not_found_response,
+    service_unavailable_response,
     combine_responses,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post(
-    "/sign_up", status_code=201, responses=bad_request_response("Email already in use")
+    "/sign_up",
+    status_code=201,
+    responses=combine_responses(
+        bad_request_response("Email already in use"),
+        service_unavailable_response(),
+    ),
 )
-async def sign_up(user_data: SignUpSchema, crud: UsersCrud = Depends(get_users_crud)):
-    crud.sign_up_user(user_data)
+async def sign_up(
+    user_data: SignUpSchema, crud: AsyncCrud[UsersCrud] = Depends(get_users_crud)
+):
+    # Hashing is the expensive part, so a taken email is rejected before it
+    await crud.ensure_email_available(user_data.email)
+    await crud.sign_up_user(user_data, await hash_password(user_data.password))
     return Response(status_code=201)
 
 
@@ -34,14 +47,22 @@ async def sign_up(user_data: SignUpSchema, crud: UsersCrud = Depends(get_users_c
     responses=combine_responses(
         invalid_password_response(),
         not_found_response("User"),
+        service_unavailable_response(),
     ),
 )
 async def sign_in(
     user_data: SignInSchema,
-    crud: UsersCrud = Depends(get_users_crud),
+    crud: AsyncCrud[UsersCrud] = Depends(get_users_crud),
 ):
-    user = crud.sign_in_user(user_data)
-    return create_jwt_token(user.id)
+    user = await crud.get_user_by_email(user_data.email)
+    verified, new_hash = await verify_and_update_password(
+        user_data.password, user.hashed_password
+    )
+    if not verified:
+        raise HTTPException(status_code=401, detail="Invalid password")
+    if new_hash:
+        await crud.update_password_hash(user, new_hash)
+    return create_jwt_token(user)
 
 
 @router.get(
@@ -59,14 +80,18 @@ async def show_current_user(current_user=Depends(get_current_user)):
     responses=combine_responses(
         invalid_authentication_responses(),
         bad_request_response("Email already in use"),
+        service_unavailable_response(),
     ),
 )
 async def update_current_user(
     user_data: UpdateUserSchema,
     current_user=Depends(get_current_user),
-    crud: UsersCrud = Depends(get_users_crud),
+    crud: AsyncCrud[UsersCrud] = Depends(get_users_crud),
 ):
-    return crud.update_user(current_user, user_data)
+    hashed_password = None
+    if user_data.password is not None:
+        hashed_password = await hash_password(user_data.password)
+    return await crud.update_user(current_user, user_data, hashed_password)
 
 
 @router.delete(
@@ -74,7 +99,7 @@ async def update_current_user(
 )
 async def delete_current_user(
     current_user=Depends(get_current_user),
-    crud: UsersCrud = Depends(get_users_crud),
+    crud: AsyncCrud[UsersCrud] = Depends(get_users_crud),
 ):
-    crud.remove_user(current_user)
+    await crud.remove_user(current_user)
     return Response(status_code=204)
@@ -0,0 +1,40 @@
+from fastapi import Depends, Request, Response
+from app.crud.shared.async_crud import AsyncCrud
+from app.services.etags import check_not_modified, make_etag
+
+
+def entity_etag_dependency(get_crud, version_method: str, id_param: str):
+    """Weak ETag of a single row from its id and updated_at."""
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        crud: AsyncCrud = Depends(get_crud),
+    ):
+        if "include" in request.query_params:
+            return
+        try:
+            item_id = int(request.path_params[id_param])
+        except ValueError:
+            return
+        version = await getattr(crud, version_method)(item_id)
+        # Missing rows fall through to the route's own 404
+        if version is None:
+            return
+        check_not_modified(request, response, make_etag(*version), version[1])
+
+    return dependency
+
+
+def check_page_not_modified(request: Request, response: Response, page):
+    """Weak ETag of a fetched listing page from its query, total and rows' updated_at.
+
+    There is no Last-Modified: a delete lets an older row slide onto the page,
+    so the newest updated_at on it does not move forward.
+    """
+    # Embedded relations change without touching updated_at
+    if "include" in request.query_params or page.version is None:
+        return
+    query = sorted(request.query_params.multi_items())
+    etag = make_etag(request.url.path, query, page.total, page.has_next, page.version)
+    check_not_modified(request, response, etag, None)
@@ -1,28 +1,65 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.config import get_db
+from fastapi import Depends, Request
+from app.config import settings, get_db, get_async_db
 from app.crud.api.v1.books import BooksCrud
 from app.crud.api.v1.authors import AuthorsCrud
 from app.crud.api.v1.genres import GenresCrud
 from app.crud.api.v1.users import UsersCrud
+from app.crud.api.v1.associations import AssociationsCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.routers.api.v1.shared.conditional import entity_etag_dependency
 from app.services.authorization import get_current_user_with_minimum_role, Role
+from app.services.replicas import get_read_db, read_session
 
+get_session = get_async_db if settings.ASYNC_DATABASE else get_db
+# Replicas are sync engines, the async driver keeps reading from the primary
+get_read_session = get_async_db if settings.ASYNC_DATABASE else get_read_db
 
-def get_books_crud(db: Session = Depends(get_db)) -> BooksCrud:
-    return BooksCrud(db)
 
+def get_stream_db(request: Request):
+    # A yield dependency closes its session before a streamed body is sent,
+    # so streaming routes get a bare session and close it when the stream ends
+    return read_session(request)
 
-def get_authors_crud(db: Session = Depends(get_db)) -> AuthorsCrud:
-    return AuthorsCrud(db)
 
+def get_books_crud(db=Depends(get_session)) -> AsyncCrud[BooksCrud]:
+    return AsyncCrud(BooksCrud, db)
 
-def get_genres_crud(db: Session = Depends(get_db)) -> GenresCrud:
-    return GenresCrud(db)
 
+def get_authors_crud(db=Depends(get_session)) -> AsyncCrud[AuthorsCrud]:
+    return AsyncCrud(AuthorsCrud, db)
 
-def get_users_crud(db: Session = Depends(get_db)) -> UsersCrud:
-    return UsersCrud(db)
+
+def get_genres_crud(db=Depends(get_session)) -> AsyncCrud[GenresCrud]:
+    return AsyncCrud(GenresCrud, db)
+
+
+def get_books_read_crud(db=Depends(get_read_session)) -> AsyncCrud[BooksCrud]:
+    return AsyncCrud(BooksCrud, db)
+
+
+def get_authors_read_crud(db=Depends(get_read_session)) -> AsyncCrud[AuthorsCrud]:
+    return AsyncCrud(AuthorsCrud, db)
+
+
+def get_genres_read_crud(db=Depends(get_read_session)) -> AsyncCrud[GenresCrud]:
+    return AsyncCrud(GenresCrud, db)
+
+
+def get_users_crud(db=Depends(get_session)) -> AsyncCrud[UsersCrud]:
+    return AsyncCrud(UsersCrud, db)
+
+
+def get_associations_crud(db=Depends(get_session)) -> AsyncCrud[AssociationsCrud]:
+    return AsyncCrud(AssociationsCrud, db)
 
 
 get_librarian_user = get_current_user_with_minimum_role(Role.LIBRARIAN)
 get_admin_user = get_current_user_with_minimum_role(Role.ADMIN)
+
+book_etag = entity_etag_dependency(get_books_read_crud, "get_book_version", "book_id")
+author_etag = entity_etag_dependency(
+    get_authors_read_crud, "get_author_version", "author_id"
+)
+genre_etag = entity_etag_dependency(
+    get_genres_read_crud, "get_genre_version", "genre_id"
+)
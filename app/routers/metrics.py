@@ -0,0 +1,76 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.config import async_engine, engine
+from app.services.jwt_cache import get_jwt_cache_stats
+from app.services.metrics import CONTENT_TYPE, Counter, Gauge, render_metrics
+from app.services.pool_metrics import get_pool_stats
+from app.services.replicas import get_replica_stats
+from app.services.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+POOL_GAUGES = {
+    "size": "Connections the pool keeps open.",
+    "checked_out": "Connections in use.",
+    "overflow": "Connections opened beyond the pool size.",
+}
+POOL_COUNTERS = {
+    "checkouts": "Connections handed out.",
+    "wait_seconds_total": "Time spent waiting for a connection.",
+    "timeouts": "Checkouts that gave up waiting.",
+}
+
+
+def named_pool_stats() -> dict:
+    pools = {"sync": get_pool_stats(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = get_pool_stats(async_engine.pool)
+    for index, stats in enumerate(get_replica_stats()):
+        pools[f"replica-{index}"] = stats
+    return pools
+
+
+def state_metrics() -> list[Counter]:
+    """Pool and JWT cache state, read fresh for every scrape."""
+    pools = named_pool_stats()
+    metrics = []
+    for key, help_text in POOL_GAUGES.items():
+        gauge = Gauge(f"db_pool_{key}", help_text, ("pool",))
+        for name, stats in pools.items():
+            gauge.inc((name,), stats[key])
+        metrics.append(gauge)
+    for key, help_text in POOL_COUNTERS.items():
+        name = key if key.endswith("_total") else f"{key}_total"
+        counter = Counter(f"db_pool_{name}", help_text, ("pool",))
+        for pool, stats in pools.items():
+            counter.inc((pool,), stats[key])
+        metrics.append(counter)
+    jwt_stats = get_jwt_cache_stats()
+    for key, metric_class, help_text in (
+        ("hits", Counter, "Bearer tokens served from the JWT cache."),
+        ("misses", Counter, "Bearer tokens decoded and verified."),
+        ("size", Gauge, "Decoded tokens held in the JWT cache."),
+    ):
+        name = f"jwt_cache_{key}" if metric_class is Gauge else f"jwt_cache_{key}_total"
+        metric = metric_class(name, help_text)
+        metric.inc(amount=jwt_stats[key])
+        metrics.append(metric)
+    return metrics
+
+
+@router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, query, pool and JWT cache metrics in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(*state_metrics()), media_type=CONTENT_TYPE)
+
+
+@router.get("/pool")
+async def pool_metrics():
+    """Connection pool occupancy and checkout waits of this process."""
+    pools = {"sync": get_pool_stats(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = get_pool_stats(async_engine.pool)
+    replicas = get_replica_stats()
+    if replicas:
+        pools["replicas"] = replicas
+    return pools
@@ -40,6 +40,10 @@ def invalid_authentication_responses():
                             "summary": "Invalid token",
                             "value": {"detail": "Invalid token"},
                         },
+                        "token_revoked": {
+                            "summary": "Token revoked",
+                            "value": {"detail": "Token has been revoked"},
+                        },
                         "non_existent_user": {
                             "summary": "Token pointing to non-existent user",
                             "value": {"detail": "Token pointing to non-existent user"},
@@ -105,6 +109,43 @@ def filtering_validation_error_response():
     }
 
 
+def service_unavailable_response():
+    return {
+        "503": {
+            "description": "Service Unavailable",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Too many password checks in progress, retry later"
+                    }
+                }
+            },
+        }
+    }
+
+
+def not_modified_response():
+    return {"304": {"description": "Not Modified"}}
+
+
+def invalid_cursor_response():
+    return {
+        "422": {
+            "description": "Validation Error",
+            "content": {
+                "application/json": {
+                    "examples": {
+                        "invalid_cursor": {
+                            "summary": "Invalid cursor",
+                            "value": {"detail": "Invalid cursor"},
+                        },
+                    }
+                }
+            },
+        }
+    }
+
+
 def combine_responses(*responses):
     combined = {}
     for response in responses:
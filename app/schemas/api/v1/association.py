@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from app.schemas.bulk import BULK_MAX_ITEMS
+
+
+class AssociationSchema(BaseModel):
+    book_id: int
+    author_id: int | None = None
+    genre_id: int | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def check_single_target(self):
+        if (self.author_id is None) == (self.genre_id is None):
+            raise ValueError("Exactly one of author_id or genre_id is required")
+        return self
+
+
+class ReplaceAssociationsSchema(BaseModel):
+    ids: list[int] = Field(..., max_length=BULK_MAX_ITEMS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class ReplaceAssociationsResponse(BaseModel):
+    ids: list[int]
+    added: list[int]
+    removed: list[int]
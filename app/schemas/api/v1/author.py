@@ -3,6 +3,7 @@ from typing import Literal
 from pydantic import BaseModel, Field, ConfigDict
 from fastapi import Query
 from fastapi.openapi.models import Example
+from app.services.tracing import traced
 
 YearField = Field(..., ge=1000, le=9999)
 
@@ -35,6 +36,10 @@ class UpdateAuthorSchema(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class BulkUpdateAuthorSchema(UpdateAuthorSchema):
+    id: int
+
+
 class AuthorSortingSchema(BaseModel):
     sort_by: (
         Literal[
@@ -44,6 +49,7 @@ class AuthorSortingSchema(BaseModel):
             "biography",
             "created_at",
             "updated_at",
+            "relevance",
         ]
         | None
     ) = Query(None)
@@ -57,8 +63,10 @@ class AuthorSearchSchema(BaseModel):
     biography: str | None = None
     created_at: str | None = None
     updated_at: str | None = None
+    search: str | None = None
 
 
+@traced()
 def author_search_dependency(
     name: str | None = Query(
         default=None,
@@ -152,6 +160,20 @@ def author_search_dependency(
             ),
         },
     ),
+    search: str | None = Query(
+        default=None,
+        description="Full-text search over name, surname and biography; enables sort_by=relevance",
+        openapi_examples={
+            "example1": Example(
+                summary="All words",
+                value="nobel poet",
+            ),
+            "example2": Example(
+                summary="Web search syntax",
+                value='"science fiction" -fantasy',
+            ),
+        },
+    ),
 ) -> AuthorSearchSchema:
     return AuthorSearchSchema(
         name=name,
@@ -160,4 +182,5 @@ def author_search_dependency(
         biography=biography,
         created_at=created_at,
         updated_at=updated_at,
+        search=search,
     ).model_dump(exclude_none=True)
@@ -3,6 +3,7 @@ from typing import Literal
 from pydantic import BaseModel, Field, ConfigDict
 from fastapi import Query
 from fastapi.openapi.models import Example
+from app.services.tracing import traced
 
 YearField = Field(..., ge=1000, le=9999)
 ISBNField = Field(..., min_length=13, max_length=13, pattern=r"^\d{13}$")
@@ -45,6 +46,10 @@ class UpdateBookSchema(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class BulkUpdateBookSchema(UpdateBookSchema):
+    id: int
+
+
 class BookSortingSchema(BaseModel):
     sort_by: (
         Literal[
@@ -57,6 +62,7 @@ class BookSortingSchema(BaseModel):
             "edition",
             "created_at",
             "updated_at",
+            "relevance",
         ]
         | None
     ) = Query(None)
@@ -73,8 +79,10 @@ class BookSearchSchema(BaseModel):
     edition: str | None = None
     created_at: str | None = None
     updated_at: str | None = None
+    search: str | None = None
 
 
+@traced()
 def book_search_dependency(
     title: str | None = Query(
         default=None,
@@ -210,6 +218,20 @@ def book_search_dependency(
             ),
         },
     ),
+    search: str | None = Query(
+        default=None,
+        description="Full-text search over title, series and description; enables sort_by=relevance",
+        openapi_examples={
+            "example1": Example(
+                summary="All words",
+                value="python programming",
+            ),
+            "example2": Example(
+                summary="Web search syntax",
+                value="Python -snake",
+            ),
+        },
+    ),
 ) -> BookSearchSchema:
     return BookSearchSchema(
         title=title,
@@ -221,4 +243,5 @@ def book_search_dependency(
         edition=edition,
         created_at=created_at,
         updated_at=updated_at,
+        search=search,
     ).model_dump(exclude_none=True)
@@ -3,6 +3,7 @@ from typing import Literal
 from pydantic import BaseModel, ConfigDict
 from fastapi import Query
 from fastapi.openapi.models import Example
+from app.services.tracing import traced
 
 
 class GenreSchema(BaseModel):
@@ -27,6 +28,10 @@ class UpdateGenreSchema(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+class BulkUpdateGenreSchema(UpdateGenreSchema):
+    id: int
+
+
 class GenreSortingSchema(BaseModel):
     sort_by: (
         Literal[
@@ -34,6 +39,7 @@ class GenreSortingSchema(BaseModel):
             "description",
             "created_at",
             "updated_at",
+            "relevance",
         ]
         | None
     ) = Query(None)
@@ -45,8 +51,10 @@ class GenreSearchSchema(BaseModel):
     description: str | None = None
     created_at: str | None = None
     updated_at: str | None = None
+    search: str | None = None
 
 
+@traced()
 def genre_search_dependency(
     name: str | None = Query(
         default=None,
@@ -112,10 +120,25 @@ def genre_search_dependency(
             ),
         },
     ),
+    search: str | None = Query(
+        default=None,
+        description="Full-text search over name and description; enables sort_by=relevance",
+        openapi_examples={
+            "example1": Example(
+                summary="All words",
+                value="science fiction",
+            ),
+            "example2": Example(
+                summary="Web search syntax",
+                value="mystery or thriller",
+            ),
+        },
+    ),
 ) -> GenreSearchSchema:
     return GenreSearchSchema(
         name=name,
         description=description,
         created_at=created_at,
         updated_at=updated_at,
+        search=search,
     ).model_dump(exclude_none=True)
@@ -0,0 +1,62 @@
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, model_validator
+from sqlalchemy import inspect
+from app.config import Base
+from app.schemas.api.v1.book import BookSchema
+from app.schemas.api.v1.author import AuthorSchema
+from app.schemas.api.v1.genre import GenreSchema
+
+
+class IncludeSchema(BaseModel):
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_relations(cls, data):
+        # Relations that were not eager-loaded stay unset instead of lazy loading
+        if not isinstance(data, Base):
+            return data
+        state = inspect(data)
+        skipped = state.unloaded.intersection(state.mapper.relationships.keys())
+        return {
+            field: getattr(data, field)
+            for field in cls.model_fields
+            if field not in skipped
+        }
+
+
+class BookWithRelationsSchema(BookSchema, IncludeSchema):
+    authors: list[AuthorSchema] | None = None
+    genres: list[GenreSchema] | None = None
+
+
+class AuthorWithBooksSchema(AuthorSchema, IncludeSchema):
+    books: list[BookSchema] | None = None
+
+
+class GenreWithBooksSchema(GenreSchema, IncludeSchema):
+    books: list[BookSchema] | None = None
+
+
+def include_dependency(*relations: str):
+    def dependency(
+        include: str | None = Query(
+            default=None,
+            description=f"Comma-separated related data to embed: {', '.join(relations)}",
+        ),
+    ) -> set[str]:
+        if not include:
+            return set()
+        requested = {name.strip() for name in include.split(",") if name.strip()}
+        unsupported = requested - set(relations)
+        if unsupported:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unsupported include: '{sorted(unsupported)[0]}'",
+            )
+        return requested
+
+    return dependency
+
+
+book_include_dependency = include_dependency("authors", "genres")
+author_include_dependency = include_dependency("books")
+genre_include_dependency = include_dependency("books")
@@ -0,0 +1,47 @@
+from typing import TypeVar, Generic, Literal
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar("T")
+
+BULK_MAX_ITEMS = 10000
+IMPORT_REJECTS_LIMIT = 100
+
+
+class BulkRequest(BaseModel, Generic[T]):
+    items: list[T] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int | None = None
+    status: Literal["created", "updated", "deleted", "failed"]
+    detail: str | None = None
+
+
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class ImportReject(BaseModel):
+    line: int
+    detail: str
+    record: dict | None = None
+
+
+class ImportResponse(BaseModel):
+    imported: int
+    rejected: int
+    rejects: list[ImportReject] = Field(
+        ...,
+        description=f"The first {IMPORT_REJECTS_LIMIT} rejected lines, rejected counts all of them",
+    )
@@ -1,5 +1,5 @@
-from typing import TypeVar, Generic, Sequence
-from pydantic import BaseModel
+from typing import TypeVar, Generic, Sequence, Literal
+from pydantic import BaseModel, PrivateAttr
 from fastapi import Query
 
 T = TypeVar("T")
@@ -12,11 +12,28 @@ class PaginationParams(BaseModel):
     size: int = Query(
         50, gt=0, description="Page size, default is 50, must be greater than 0"
     )
+    cursor: str | None = Query(
+        None,
+        description="Opaque cursor from next_cursor or prev_cursor, page is ignored when set",
+    )
+    count: Literal["exact", "estimated", "none"] = Query(
+        "exact",
+        description="Total count mode: exact (default), estimated from planner statistics or none",
+    )
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: Sequence[T]
-    total: int
+    total: int | None
     page: int
     size: int
-    pages: int
+    pages: int | None
+    has_next: bool | None = None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    # (id, updated_at) of every item, set by paginate
+    _version: list | None = PrivateAttr(default=None)
+
+    @property
+    def version(self) -> list | None:
+        return self._version
@@ -4,3 +4,9 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class TokenClaims(BaseModel):
+    user_id: int
+    access_level: int
+    token_version: int
@@ -3,11 +3,15 @@ from enum import IntEnum
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import ValidationError
 from sqlalchemy import select
 from app.config import settings
-from app.schemas.token import Token
+from app.schemas.token import Token, TokenClaims
 from app.config import get_db
 from app.models.user import User
+from app.services.jwt_cache import cache_claims, get_cached_claims
+from app.services.token_versions import get_token_version
+from app.services.tracing import traced
 
 auth_bearer = HTTPBearer()
 
@@ -18,9 +22,11 @@ class Role(IntEnum):
     ADMIN = 2
 
 
-def create_jwt_token(user_id: int):
+def create_jwt_token(user: User):
     payload = {
-        "sub": str(user_id),
+        "sub": str(user.id),
+        "lvl": user.access_level or Role.USER,
+        "ver": user.token_version,
         "exp": datetime.now(timezone.utc)
         + timedelta(minutes=settings.JWT_TOKEN_EXPIRATION),
     }
@@ -29,8 +35,12 @@ def create_jwt_token(user_id: int):
 
 
 def decode_jwt_token(token: str):
+    payload = get_cached_claims(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+        cache_claims(token, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -38,13 +48,42 @@ def decode_jwt_token(token: str):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
-def get_current_user(
+def decode_token_claims(token: str) -> TokenClaims:
+    payload = decode_jwt_token(token)
+    try:
+        return TokenClaims(
+            user_id=payload["sub"],
+            access_level=payload["lvl"],
+            token_version=payload["ver"],
+        )
+    except (KeyError, ValidationError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
+@traced()
+def get_token_claims(
     auth: HTTPAuthorizationCredentials = Depends(auth_bearer),
     db=Depends(get_db),
+) -> TokenClaims:
+    claims = decode_token_claims(auth.credentials)
+    version = get_token_version(db, claims.user_id)
+    if version is None:
+        raise HTTPException(
+            status_code=401, detail="Token pointing to non-existent user"
+        )
+    if version != claims.token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return claims
+
+
+@traced()
+def get_current_user(
+    claims: TokenClaims = Depends(get_token_claims),
+    db=Depends(get_db),
 ):
-    token = auth.credentials
-    user_id = int(decode_jwt_token(token)["sub"])
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = db.execute(
+        select(User).where(User.id == claims.user_id)
+    ).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=401, detail="Token pointing to non-existent user"
@@ -53,11 +92,13 @@ def get_current_user(
 
 
 def get_current_user_with_minimum_role(required_role: Role):
+    # Authorizes from the token claims, routes needing the User use get_current_user
+    @traced(f"get_current_user_with_minimum_role({required_role.name})")
     def dependency(
-        user: User = Depends(get_current_user),
+        claims: TokenClaims = Depends(get_token_claims),
     ):
-        if user.access_level < required_role:
+        if claims.access_level < required_role:
             raise HTTPException(status_code=403, detail="Insufficient rights")
-        return user
+        return claims
 
     return dependency
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+from app.config import settings
+from app.services.table_generations import get_generations
+
+_cache_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def count_rows(db: Session, stmt: select, mode: str) -> int | None:
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        return count_estimated(db, stmt)
+    return count_exact(db, stmt)
+
+
+def count_exact(db: Session, stmt: select, compute=None) -> int:
+    if compute is None:
+        total_count_stmt = select(func.count()).select_from(stmt.subquery())
+        compute = lambda: db.execute(total_count_stmt).scalar()
+    if settings.COUNT_CACHE_TTL <= 0:
+        return compute()
+
+    compiled = _compile(db, stmt)
+    key = (str(compiled), tuple(sorted(compiled.params.items())))
+    generations = get_generations(_table_names(stmt))
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > now and entry[1] == generations:
+            _cache.move_to_end(key)
+            return entry[2]
+
+    total_count = compute()
+    with _cache_lock:
+        _cache[key] = (now + settings.COUNT_CACHE_TTL, generations, total_count)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.COUNT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return total_count
+
+
+def count_estimated(db: Session, stmt: select) -> int:
+    table_names = _table_names(stmt)
+    if stmt.whereclause is None and len(table_names) == 1:
+        reltuples = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": table_names.pop()},
+        ).scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    compiled = _compile(db, stmt)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = (
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def clear_count_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _compile(db: Session, stmt: select):
+    return stmt.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+    )
+
+
+def _table_names(stmt: select) -> set:
+    return {table.name for table in find_tables(stmt, include_joins=True)}
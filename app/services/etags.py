@@ -0,0 +1,59 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def check_not_modified(
+    request: Request, response: Response, etag: str, last_modified: datetime | None
+):
+    """Sets the validators on the response, raises 304 when the client has them."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None):
+    # If-Modified-Since is only consulted when the client sent no ETag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    return _not_modified_since(request.headers.get("if-modified-since"), last_modified)
+
+
+def _not_modified_since(if_modified_since: str | None, last_modified) -> bool:
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds only
+    return last_modified.replace(microsecond=0) <= since
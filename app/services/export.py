@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+ExportFormat = Literal["ndjson", "csv"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CHUNK_ROWS = 1000
+
+
+def export_response(
+    db: Session,
+    rows: Iterable,
+    columns: list[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    def body():
+        try:
+            yield from _serialize(rows, columns, export_format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"'
+        },
+    )
+
+
+def _serialize(rows: Iterable, columns: list[str], export_format: ExportFormat):
+    # Rows are written in chunks so the socket sees few large writes
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        values = [_plain(value) for value in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values))))
+            buffer.write("\n")
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
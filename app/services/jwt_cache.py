@@ -0,0 +1,56 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from app.config import settings
+
+_cache_lock = threading.Lock()
+_cache = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+def get_cached_claims(token: str) -> dict | None:
+    """Decoded claims of a token seen before, None if it has to be verified."""
+    global _hits, _misses
+    if settings.JWT_CACHE_SIZE <= 0:
+        return None
+    key = _token_key(token)
+    with _cache_lock:
+        payload = _cache.get(key)
+        if payload is not None and payload["exp"] > time.time():
+            _cache.move_to_end(key)
+            _hits += 1
+            return payload
+        # Expired tokens go back through jwt.decode so they fail the usual way
+        _cache.pop(key, None)
+        _misses += 1
+    return None
+
+
+def cache_claims(token: str, payload: dict):
+    if settings.JWT_CACHE_SIZE <= 0 or "exp" not in payload:
+        return
+    key = _token_key(token)
+    with _cache_lock:
+        _cache[key] = payload
+        _cache.move_to_end(key)
+        while len(_cache) > settings.JWT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def get_jwt_cache_stats() -> dict:
+    with _cache_lock:
+        return {"hits": _hits, "misses": _misses, "size": len(_cache)}
+
+
+def clear_jwt_cache():
+    global _hits, _misses
+    with _cache_lock:
+        _cache.clear()
+        _hits = 0
+        _misses = 0
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
@@ -0,0 +1,200 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, label_values: tuple = (), amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return _header(self) + [
+            f"{self.name}{_labels(self.labels, key)} {value}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, label_values: tuple = (), amount: float = 1):
+        self.inc(label_values, -amount)
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, label_values: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket counts with +Inf last, followed by the sum
+            entry = self._values.setdefault(label_values, [0] * (len(self.buckets) + 2))
+            entry[index] += 1
+            entry[-1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, list(entry)) for key, entry in self._values.items())
+        lines = _header(self)
+        bounds = [*(str(bound) for bound in self.buckets), "+Inf"]
+        for key, entry in values:
+            cumulative = 0
+            for bound, count in zip(bounds, entry):
+                cumulative += count
+                labels = _labels((*self.labels, "le"), (*key, bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {entry[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+def _header(metric: Counter) -> list[str]:
+    return [
+        f"# HELP {metric.name} {metric.help_text}",
+        f"# TYPE {metric.name} {metric.kind}",
+    ]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template and status.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled.", ("method",)
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed by route template.", ("route",)
+)
+DB_QUERY_SECONDS = Counter(
+    "db_query_seconds_total", "Time spent in SQL statements by route.", ("route",)
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("route",),
+    QUERY_COUNT_BUCKETS,
+)
+REQUEST_METRICS = (
+    REQUEST_DURATION,
+    REQUESTS_IN_PROGRESS,
+    DB_QUERIES,
+    DB_QUERY_SECONDS,
+    REQUEST_DB_QUERIES,
+)
+
+# [queries, seconds] of the request being handled, shared with threadpool workers
+_request_queries: ContextVar[list | None] = ContextVar("request_queries", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if _request_queries.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    queries = _request_queries.get()
+    started = conn.info.get("query_started")
+    if queries is None or not started:
+        return
+    queries[0] += 1
+    queries[1] += time.perf_counter() - started.pop()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up cardinality
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and counts its SQL statements.
+
+    A plain ASGI middleware, so streamed bodies are timed to the last chunk
+    and no extra task is spawned per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500
+        queries = [0, 0.0]
+        token = _request_queries.set(queries)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.dec((method,))
+            _request_queries.reset(token)
+            route = route_template(scope)
+            REQUEST_DURATION.observe((method, route, str(status)), elapsed)
+            REQUEST_DB_QUERIES.observe((route,), queries[0])
+            if queries[0]:
+                DB_QUERIES.inc((route,), queries[0])
+                DB_QUERY_SECONDS.inc((route,), queries[1])
+
+
+def clear_request_metrics():
+    for metric in REQUEST_METRICS:
+        metric.clear()
+
+
+def render_metrics(*extra: Counter) -> str:
+    lines = []
+    for metric in (*REQUEST_METRICS, *extra):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
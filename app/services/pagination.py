@@ -1,25 +1,190 @@
-from sqlalchemy import select, func
-from sqlalchemy.orm import Session
+import base64
+import json
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, tuple_, and_, or_
+from sqlalchemy.orm import Session, QueryableAttribute
+from app.config import settings
 from app.schemas.pagination import PaginationParams, PaginatedResponse
+from app.services.sorting import apply_sorting, get_sort_key
+from app.services.counting import count_rows, count_exact
+from app.services.tracing import span
 
 
 def paginate(
-    db: Session, stmt: select, pagination: PaginationParams
+    db: Session,
+    stmt: select,
+    pagination: PaginationParams,
+    sorting_params=None,
+    sort_fields: dict | None = None,
 ) -> PaginatedResponse:
-    offset = (pagination.page - 1) * pagination.size
-    limit = pagination.size
+    if pagination.cursor:
+        results, has_next, next_cursor, prev_cursor = _fetch_by_cursor(
+            db, stmt, pagination, sorting_params, sort_fields
+        )
+        with span("paginate.count", count_mode=pagination.count):
+            total_count = count_rows(db, stmt, pagination.count)
+    else:
+        results, has_next, next_cursor, prev_cursor, total_count = _fetch_by_offset(
+            db, stmt, pagination, sorting_params, sort_fields
+        )
 
-    paginated_stmt = stmt.offset(offset).limit(limit)
-    results = db.execute(paginated_stmt).scalars().all()
-    subquery = stmt.subquery()
-    total_count_stmt = select(func.count()).select_from(subquery)
-    total_count = db.execute(total_count_stmt).scalar()
-    total_pages = (total_count + pagination.size - 1) // pagination.size
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + pagination.size - 1) // pagination.size
 
-    return PaginatedResponse(
+    page = PaginatedResponse(
         items=results,
         total=total_count,
         page=pagination.page,
         size=pagination.size,
         pages=total_pages,
+        has_next=has_next,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
     )
+    page._version = _page_version(results)
+    return page
+
+
+def _page_version(results):
+    # List validators come from the rows already fetched, never another query
+    return [(item.id, item.updated_at) for item in results]
+
+
+def _fetch_by_offset(db, stmt, pagination, sorting_params, sort_fields):
+    offset = (pagination.page - 1) * pagination.size
+    # One extra row tells whether a next page exists without counting
+    limit = pagination.size + 1
+
+    paginated_stmt = stmt
+    if sorting_params is not None:
+        paginated_stmt = apply_sorting(stmt, sorting_params, sort_fields)
+    paginated_stmt = paginated_stmt.offset(offset).limit(limit)
+
+    if pagination.count == "exact" and settings.PAGINATION_COUNT_STRATEGY == "window":
+        with span("paginate.items_and_count"):
+            results, total_count = _fetch_with_window_count(db, stmt, paginated_stmt)
+    else:
+        with span("paginate.items"):
+            results = db.execute(paginated_stmt).scalars().all()
+        with span("paginate.count", count_mode=pagination.count):
+            total_count = count_rows(db, stmt, pagination.count)
+
+    has_next = len(results) > pagination.size
+    results = results[: pagination.size]
+    if sorting_params is None or not results:
+        return results, has_next, None, None, total_count
+
+    sort_key = get_sort_key(stmt, sorting_params, sort_fields)
+    if not _supports_cursor(sort_key):
+        return results, has_next, None, None, total_count
+    next_cursor = prev_cursor = None
+    if has_next:
+        next_cursor = _encode_cursor(results[-1], sort_key, backward=False)
+    if offset > 0:
+        prev_cursor = _encode_cursor(results[0], sort_key, backward=True)
+    return results, has_next, next_cursor, prev_cursor, total_count
+
+
+def _fetch_with_window_count(db, stmt, paginated_stmt):
+    page = None
+
+    def fetch_page_and_count():
+        nonlocal page
+        rows = db.execute(paginated_stmt.add_columns(func.count().over())).all()
+        page = [row[0] for row in rows]
+        if rows:
+            return rows[0][1]
+        # Past the last page there is no row to carry the window count
+        return db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+    total_count = count_exact(db, stmt, compute=fetch_page_and_count)
+    if page is None:
+        page = db.execute(paginated_stmt).scalars().all()
+    return page, total_count
+
+
+def _fetch_by_cursor(db, stmt, pagination, sorting_params, sort_fields):
+    sort_key = get_sort_key(stmt, sorting_params, sort_fields)
+    key, backward = _decode_cursor(pagination.cursor, sort_key)
+    ascending = sort_key[2] == backward
+
+    paginated_stmt = (
+        apply_sorting(stmt, sorting_params, sort_fields, reverse=backward)
+        .where(_seek_condition(sort_key, key, ascending))
+        .limit(pagination.size + 1)
+    )
+    with span("paginate.items"):
+        results = list(db.execute(paginated_stmt).scalars().all())
+    has_more = len(results) > pagination.size
+    results = results[: pagination.size]
+    if backward:
+        results.reverse()
+    has_next = has_more or (backward and bool(results))
+    if not results:
+        return results, has_next, None, None
+
+    next_cursor = prev_cursor = None
+    if has_next:
+        next_cursor = _encode_cursor(results[-1], sort_key, backward=False)
+    if has_more or not backward:
+        prev_cursor = _encode_cursor(results[0], sort_key, backward=True)
+    return results, has_next, next_cursor, prev_cursor
+
+
+def _supports_cursor(sort_key) -> bool:
+    # Computed sort keys such as relevance are not loaded onto the items
+    column = sort_key[0]
+    return column is None or isinstance(column, QueryableAttribute)
+
+
+def _seek_condition(sort_key, key, ascending: bool):
+    # NULLs sort last in ascending order, so they behave as the largest value
+    column, id_column, _ = sort_key
+    if column is None:
+        (item_id,) = key
+        return id_column > item_id if ascending else id_column < item_id
+
+    value, item_id = key
+    if value is None:
+        if ascending:
+            return and_(column.is_(None), id_column > item_id)
+        return or_(and_(column.is_(None), id_column < item_id), column.is_not(None))
+
+    row, bound = tuple_(column, id_column), tuple_(value, item_id)
+    if ascending:
+        return or_(row > bound, column.is_(None))
+    return row < bound
+
+
+def _encode_cursor(item, sort_key, backward: bool) -> str:
+    column, _, descending = sort_key
+    key = [item.id] if column is None else [getattr(item, column.key), item.id]
+    payload = {
+        "sort": [column.key if column is not None else None, descending],
+        "key": jsonable_encoder(key),
+        "backward": backward,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort_key):
+    column, _, descending = sort_key
+    if not _supports_cursor(sort_key):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    key_types = [int] if column is None else [column.type.python_type | None, int]
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["sort"] != [column.key if column is not None else None, descending]:
+            raise ValueError("Cursor was issued for a different sort order")
+        if len(payload["key"]) != len(key_types):
+            raise ValueError("Cursor key does not match the sort order")
+        key = [
+            TypeAdapter(key_type).validate_python(value)
+            for key_type, value in zip(key_types, payload["key"])
+        ]
+        return key, bool(payload["backward"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.config import settings
+
+# Hashes made with a different cost report needs_update() and are rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread pool uses every core it is given
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Returns whether the password matches and a new hash if it needs an upgrade."""
+    return await _run(pwd_context.verify_and_update, password, hashed_password)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+        return _executor
+
+
+def _release(_future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+async def _run(func, *args):
+    global _pending
+    with _pending_lock:
+        capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+        if _pending >= capacity:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many password checks in progress, retry later",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    # The slot is freed when bcrypt finishes, even if the request was cancelled
+    future = _get_executor().submit(func, *args)
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,72 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+_lock = threading.Lock()
+_waits: dict[str, dict] = {}
+
+
+def _empty_waits() -> dict:
+    return {
+        "checkouts": 0,
+        "wait_seconds_total": 0.0,
+        "wait_seconds_max": 0.0,
+        "timeouts": 0,
+    }
+
+
+def record_checkout(name: str, waited: float, timed_out: bool = False):
+    with _lock:
+        waits = _waits.setdefault(name, _empty_waits())
+        if timed_out:
+            waits["timeouts"] += 1
+        else:
+            waits["checkouts"] += 1
+        waits["wait_seconds_total"] += waited
+        waits["wait_seconds_max"] = max(waits["wait_seconds_max"], waited)
+
+
+class CheckoutTimingMixin:
+    """Records how long each checkout waited for a pooled connection."""
+
+    metrics_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            record_checkout(self.metrics_name, time.perf_counter() - started, True)
+            raise
+        record_checkout(self.metrics_name, time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(CheckoutTimingMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class TimedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+def get_pool_stats(pool) -> dict:
+    """Occupancy of the pool next to the checkout waits recorded for it."""
+    with _lock:
+        waits = dict(_waits.get(pool.metrics_name, _empty_waits()))
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool counts overflow from -size until the pool is full
+        "overflow": max(pool.overflow(), 0),
+        **waits,
+    }
+
+
+def clear_pool_metrics():
+    with _lock:
+        _waits.clear()
@@ -0,0 +1,110 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.services.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+PARAMETERS_LOG_LENGTH = 500
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+class RepeatedQueryError(RuntimeError):
+    """A request ran one statement more often than REPEATED_QUERY_LIMIT allows."""
+
+
+class QueryLog:
+    """Statements a request ran, grouped by their normalized text."""
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.counts = Counter()
+        self.slow = []
+
+    def repeated(self, limit: int) -> dict[str, int]:
+        return {
+            statement: count
+            for statement, count in self.counts.items()
+            if count > limit
+        }
+
+
+_query_log: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+
+def normalize(statement: str) -> str:
+    """Statement text with literals and bind parameters replaced by '?'."""
+    statement = _PLACEHOLDER.sub("?", " ".join(statement.split()))
+    # IN lists of any length are one statement
+    return _PLACEHOLDER_LIST.sub("?", statement)
+
+
+@contextmanager
+def inspect_queries(scope=None):
+    """Collects the statements run inside the block, e.g. around a CRUD call in a test."""
+    log = QueryLog(scope)
+    token = _query_log.set(log)
+    try:
+        yield log
+    finally:
+        _query_log.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if _query_log.get() is not None:
+        conn.info.setdefault("inspector_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    log = _query_log.get()
+    started = conn.info.get("inspector_started")
+    if log is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    log.counts[normalize(statement)] += 1
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        log.slow.append((elapsed, statement, parameters))
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s; parameters: %.*s",
+            elapsed * 1000,
+            route_template(log.scope) if log.scope else "-",
+            " ".join(statement.split()),
+            PARAMETERS_LOG_LENGTH,
+            repr(parameters),
+        )
+
+
+def check_repeated(log: QueryLog, where: str):
+    """Logs statements repeated past REPEATED_QUERY_LIMIT, raising when configured to."""
+    repeated = log.repeated(settings.REPEATED_QUERY_LIMIT)
+    for statement, count in repeated.items():
+        logger.warning("Possible N+1 on %s: %d runs of %s", where, count, statement)
+    if repeated and settings.REPEATED_QUERY_RAISE:
+        statement, count = max(repeated.items(), key=lambda item: item[1])
+        raise RepeatedQueryError(
+            f"{where} ran {count} times (limit {settings.REPEATED_QUERY_LIMIT}): "
+            f"{statement}"
+        )
+
+
+class QueryInspectorMiddleware:
+    """Logs slow statements and repeated ones (N+1) per request when QUERY_INSPECTION is on."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_INSPECTION:
+            return await self.app(scope, receive, send)
+        with inspect_queries(scope) as log:
+            await self.app(scope, receive, send)
+        check_repeated(log, f"{scope['method']} {route_template(scope)}")
@@ -0,0 +1,186 @@
+import itertools
+import threading
+import time
+from http.cookies import SimpleCookie
+from fastapi import Request
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.datastructures import MutableHeaders
+from app.config import SessionLocal, engine_options, settings
+from app.services.pool_metrics import get_pool_stats
+
+PRIMARY_COOKIE = "read_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    def __init__(self, url: str, index: int):
+        self.url = url
+        self.engine = create_engine(url, **engine_options())
+        # Keeps replica checkout waits apart from the primary's in /metrics/pool
+        self.engine.pool.metrics_name = f"replica-{index}"
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # Health checks open their own connection, so an exhausted pool or a
+        # host that drops packets cannot hold a request for the full timeouts
+        self.probe_engine = create_engine(
+            url,
+            poolclass=NullPool,
+            connect_args={"connect_timeout": settings.REPLICA_HEALTH_CHECK_TIMEOUT},
+        )
+        self.check_lock = threading.Lock()
+        self.healthy = True
+        self.checked_at = None
+
+
+class ReplicaSet:
+    """Hands out replicas round-robin, skipping ones that failed their last health check."""
+
+    def __init__(self, urls: list[str], check_interval: float):
+        self.replicas = [Replica(url, index) for index, url in enumerate(urls)]
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Replica | None:
+        with self._lock:
+            start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if self.is_healthy(replica):
+                return replica
+        return None
+
+    def is_healthy(self, replica: Replica) -> bool:
+        if not self._check_due(replica):
+            return replica.healthy
+        # One caller probes, the others go on with the last known status
+        if not replica.check_lock.acquire(blocking=False):
+            return replica.healthy
+        try:
+            if self._check_due(replica):
+                replica.checked_at = time.monotonic()
+                try:
+                    with replica.probe_engine.connect() as connection:
+                        connection.execute(text("SELECT 1"))
+                    replica.healthy = True
+                except DBAPIError:
+                    replica.healthy = False
+        finally:
+            replica.check_lock.release()
+        return replica.healthy
+
+    def _check_due(self, replica: Replica) -> bool:
+        return (
+            replica.checked_at is None
+            or time.monotonic() - replica.checked_at >= self.check_interval
+        )
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+            replica.probe_engine.dispose()
+
+
+_replica_set = None
+_replica_set_lock = threading.Lock()
+
+
+def replica_urls() -> list[str]:
+    return [
+        url.strip()
+        for url in (settings.DATABASE_REPLICA_URLS or "").split(",")
+        if url.strip()
+    ]
+
+
+def get_replica_set() -> ReplicaSet | None:
+    global _replica_set
+    with _replica_set_lock:
+        if _replica_set is None and replica_urls():
+            _replica_set = ReplicaSet(
+                replica_urls(), settings.REPLICA_HEALTH_CHECK_INTERVAL
+            )
+        return _replica_set
+
+
+def reset_replica_set():
+    global _replica_set
+    with _replica_set_lock:
+        if _replica_set is not None:
+            _replica_set.dispose()
+        _replica_set = None
+
+
+def get_replica_stats() -> list[dict]:
+    replica_set = get_replica_set()
+    if replica_set is None:
+        return []
+    return [
+        {
+            "host": make_url(replica.url).host,
+            "healthy": replica.healthy,
+            **get_pool_stats(replica.engine.pool),
+        }
+        for replica in replica_set.replicas
+    ]
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """True for a client that wrote within the last READ_YOUR_WRITES_WINDOW seconds."""
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_session(request: Request) -> Session:
+    """A session on a healthy replica, or on the primary when none is usable."""
+    replica_set = get_replica_set()
+    if replica_set is None or pinned_to_primary(request):
+        return SessionLocal()
+    replica = replica_set.choose()
+    return replica.Session() if replica else SessionLocal()
+
+
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def primary_cookie() -> str:
+    """The Set-Cookie value pinning a client to the primary for the write window."""
+    cookie = SimpleCookie()
+    cookie[PRIMARY_COOKIE] = f"{time.time() + settings.READ_YOUR_WRITES_WINDOW:.3f}"
+    cookie[PRIMARY_COOKIE]["max-age"] = settings.READ_YOUR_WRITES_WINDOW
+    cookie[PRIMARY_COOKIE]["path"] = "/"
+    cookie[PRIMARY_COOKIE]["httponly"] = True
+    cookie[PRIMARY_COOKIE]["samesite"] = "lax"
+    return cookie.output(header="").strip()
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary for a while after each successful write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or settings.READ_YOUR_WRITES_WINDOW <= 0
+            or not replica_urls()
+        ):
+            return await self.app(scope, receive, send)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", primary_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from app.config import settings
+from app.services import table_generations
+from app.services.etags import is_not_modified
+from app.services.replicas import pinned_to_primary
+
+# Catalog responses can embed any of these, so a write to one invalidates all
+CATALOG_TABLES = ("authors", "book_author", "book_genre", "books", "genres")
+CATALOG_PREFIXES = ("/api/v1/books", "/api/v1/authors", "/api/v1/genres")
+SKIPPED_HEADERS = {"content-length", "x-cache"}
+
+
+class MemoryCacheBackend:
+    """In-process LRU, generations come from this process's commits."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_generations(self, table_names) -> tuple:
+        return table_generations.get_generations(table_names)
+
+
+class RedisCacheBackend:
+    """Redis-compatible server shared by every process, generations included.
+
+    Its calls block on the network, so the middleware runs them on the
+    threadpool and bumps from commits on the event loop go to an executor.
+    """
+
+    prefix = "response-cache:"
+    blocking = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self._pending = set()
+        table_generations.add_bump_listener(self.bump_generations)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def get_generations(self, table_names) -> tuple:
+        names = sorted(set(table_names))
+        values = self.client.mget([f"{self.prefix}gen:{name}" for name in names])
+        return tuple((name, int(value or 0)) for name, value in zip(names, values))
+
+    def bump_generations(self, table_names):
+        names = list(table_names)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync sessions commit on a worker thread, which may block
+            self._publish(names)
+            return
+        # Async sessions commit on the event loop
+        future = loop.run_in_executor(None, self._publish, names)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def wait_for_bumps(self):
+        """Waits for this loop's bumps still on their way to the server."""
+        loop = asyncio.get_running_loop()
+        pending = [future for future in self._pending if future.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending)
+
+    def _publish(self, table_names):
+        pipeline = self.client.pipeline()
+        for name in table_names:
+            pipeline.incr(f"{self.prefix}gen:{name}")
+        pipeline.execute()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.RESPONSE_CACHE_URL:
+                _backend = RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+            else:
+                _backend = MemoryCacheBackend(settings.RESPONSE_CACHE_SIZE)
+        return _backend
+
+
+def configure_response_cache():
+    """Builds a shared backend at startup, so it hears bumps from the first commit.
+
+    A Redis backend built on the first cached GET would miss the writes a
+    process makes before it, and other processes would keep serving pages
+    those writes made stale.
+    """
+    if settings.RESPONSE_CACHE_URL:
+        get_response_cache()
+
+
+def clear_response_cache():
+    get_response_cache().clear()
+
+
+def cache_key(request: Request, generations: tuple) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}#{generations}"
+
+
+def _lookup(backend, request: Request):
+    # Generations are read first, so a write landing mid-request
+    # leaves the stored entry under a key that is already stale
+    key = cache_key(request, backend.get_generations(CATALOG_TABLES))
+    return key, backend.get(key)
+
+
+async def _call(backend, func, *args):
+    if backend.blocking:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+def _cacheable(request: Request) -> bool:
+    return (
+        settings.RESPONSE_CACHE_TTL > 0
+        and request.method == "GET"
+        and request.url.path.startswith(CATALOG_PREFIXES)
+        and not request.url.path.endswith("/export")
+        # Entries may come from a lagging replica, so read-your-writes skips them
+        and not pinned_to_primary(request)
+    )
+
+
+class ResponseCacheMiddleware:
+    """Serves repeated catalog GETs from the response cache."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        request = Request(scope)
+        if not _cacheable(request):
+            return await self.app(scope, receive, send)
+
+        backend = get_response_cache()
+        if backend.blocking:
+            await backend.wait_for_bumps()
+        key, cached = await _call(backend, _lookup, backend, request)
+        if cached is not None:
+            response = _cached_response(request, cached)
+            return await response(scope, receive, send)
+
+        start = None
+        chunks = []
+
+        async def send_and_store(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] == 200:
+                    message = {
+                        **message,
+                        "headers": [*message["headers"], (b"x-cache", b"MISS")],
+                    }
+            await send(message)
+            if message["type"] == "http.response.body" and start["status"] == 200:
+                chunks.append(message.get("body", b""))
+                # Stored once the client has the last chunk
+                if not message.get("more_body", False):
+                    await _call(backend, _store, backend, key, start, b"".join(chunks))
+
+        await self.app(scope, receive, send_and_store)
+
+
+def _store(backend, key: str, start: dict, body: bytes):
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in start["headers"]
+        if name.decode("latin-1").lower() not in SKIPPED_HEADERS
+    }
+    meta = json.dumps([start["status"], headers]).encode()
+    backend.set(key, meta + b"\n" + body, settings.RESPONSE_CACHE_TTL)
+
+
+def _cached_response(request: Request, cached: bytes) -> Response:
+    meta, body = cached.split(b"\n", 1)
+    status_code, headers = json.loads(meta)
+    if "etag" in headers and is_not_modified(
+        request, headers["etag"], _last_modified(headers)
+    ):
+        validators = {
+            name: value
+            for name, value in headers.items()
+            if name in ("etag", "last-modified")
+        }
+        return Response(status_code=304, headers=validators)
+    response = Response(body, status_code=status_code, headers=headers)
+    response.headers["X-Cache"] = "HIT"
+    return response
+
+
+def _last_modified(headers: dict):
+    if "last-modified" not in headers:
+        return None
+    return parsedate_to_datetime(headers["last-modified"])
@@ -1,7 +1,25 @@
 from fastapi import HTTPException
-from sqlalchemy import select
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
-ALLOWED_OPERATORS = {"eq", "ne", "lt", "lte", "gt", "gte", "like", "ilike", "in"}
+ALLOWED_OPERATORS = {
+    "eq",
+    "ne",
+    "lt",
+    "lte",
+    "gt",
+    "gte",
+    "like",
+    "ilike",
+    "in",
+    "search",
+}
+TEXT_SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def text_search_query(value: str):
+    return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, value)
 
 
 def parse_filter(raw_value: str):
@@ -17,6 +35,19 @@ def parse_filter(raw_value: str):
     return operator, value
 
 
+def coerce_value(field: str, column, value: str):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        return TypeAdapter(python_type).validate_python(value)
+    except ValidationError:
+        raise HTTPException(
+            status_code=422, detail=f"Invalid value for '{field}': '{value}'"
+        )
+
+
 def apply_filters(stmt: select, filters: dict, allowed_fields: dict) -> select:
     operator_map = {
         "eq": lambda col, val: col == val,
@@ -27,7 +58,8 @@ def apply_filters(stmt: select, filters: dict, allowed_fields: dict) -> select:
         "gte": lambda col, val: col >= val,
         "like": lambda col, val: col.like(val),
         "ilike": lambda col, val: col.ilike(val),
-        "in": lambda col, val: col.in_(val.split(",")),
+        "in": lambda col, val: col.in_(val),
+        "search": lambda col, val: col.bool_op("@@")(text_search_query(val)),
     }
 
     for field, raw_value in filters.items():
@@ -38,7 +70,33 @@ def apply_filters(stmt: select, filters: dict, allowed_fields: dict) -> select:
 
         operator, value = parse_filter(raw_value)
         column = allowed_fields[field]
+        if isinstance(column.type, TSVECTOR):
+            if operator not in ("eq", "search"):
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Unsupported filter operator for '{field}': '{operator}'",
+                )
+            operator = "search"
+        elif operator == "search":
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unsupported filter operator for '{field}': '{operator}'",
+            )
+        elif operator == "in":
+            value = [coerce_value(field, column, item) for item in value.split(",")]
+        elif operator not in ("like", "ilike"):
+            value = coerce_value(field, column, value)
 
         stmt = stmt.where(operator_map[operator](column, value))
 
     return stmt
+
+
+def add_relevance_sort_field(
+    sort_fields: dict, filters: dict, allowed_fields: dict
+) -> dict:
+    if "search" not in filters:
+        return sort_fields
+    _, value = parse_filter(filters["search"])
+    rank = func.ts_rank(allowed_fields["search"], text_search_query(value))
+    return {**sort_fields, "relevance": rank}
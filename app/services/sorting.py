@@ -1,9 +1,26 @@
+from fastapi import HTTPException
 from sqlalchemy import asc, desc, select
 
 
-def apply_sorting(stmt: select, sorting_params, sort_fields: dict) -> select:
-    field = sorting_params.sort_by
-    order = sorting_params.sort_order
-    column = sort_fields[field]
+def get_sort_key(stmt: select, sorting_params, sort_fields: dict):
+    id_column = stmt.column_descriptions[0]["entity"].id
+    if sorting_params is None or not sorting_params.sort_by:
+        return None, id_column, False
+    if sorting_params.sort_by not in sort_fields:
+        # Only relevance is conditional: it exists when a search filter is set
+        raise HTTPException(
+            status_code=422,
+            detail=f"Sorting by '{sorting_params.sort_by}' requires a search filter",
+        )
+    column = sort_fields[sorting_params.sort_by]
+    return column, id_column, sorting_params.sort_order != "asc"
 
-    return stmt.order_by(asc(column) if order == "asc" else desc(column))
+
+def apply_sorting(
+    stmt: select, sorting_params, sort_fields: dict, reverse: bool = False
+) -> select:
+    column, id_column, descending = get_sort_key(stmt, sorting_params, sort_fields)
+    direction = desc if descending != reverse else asc
+    if column is None:
+        return stmt.order_by(direction(id_column))
+    return stmt.order_by(direction(column), direction(id_column))
@@ -0,0 +1,80 @@
+import threading
+from collections import defaultdict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+_lock = threading.Lock()
+_generations = defaultdict(int)
+_bump_listeners = []
+
+
+def get_generations(table_names) -> tuple:
+    with _lock:
+        return tuple((name, _generations[name]) for name in sorted(set(table_names)))
+
+
+def bump_generations(table_names):
+    with _lock:
+        for name in table_names:
+            _generations[name] += 1
+    for listener in _bump_listeners:
+        listener(table_names)
+
+
+def add_bump_listener(listener):
+    """Calls listener(table_names) after every bump, e.g. to share it across processes."""
+    _bump_listeners.append(listener)
+
+
+def _written_tables(session: Session) -> set:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context):
+    tables = _written_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        tables.update(table.name for table in state.mapper.tables)
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is None:
+                continue
+            history = state.attrs[relationship.key].history
+            if obj in session.deleted or history.has_changes():
+                tables.add(relationship.secondary.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_executed_tables(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        table = orm_execute_state.statement.table
+        tables = _written_tables(orm_execute_state.session)
+        tables.add(table.name)
+        if orm_execute_state.is_delete:
+            # ON DELETE rules change referencing rows the session never sees
+            tables.update(_referencing_tables(table))
+
+
+def _referencing_tables(table) -> set:
+    return {
+        other.name
+        for other in table.metadata.tables.values()
+        for foreign_key in other.foreign_keys
+        if foreign_key.column.table.name == table.name and foreign_key.ondelete
+    }
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session):
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        bump_generations(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session: Session):
+    session.info.pop("written_tables", None)
@@ -0,0 +1,43 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.user import User
+
+_cache_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def get_token_version(db: Session, user_id: int) -> int | None:
+    """Current token version of a user, None once the user is deleted."""
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] > now:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    version = db.execute(
+        select(User.token_version).where(User.id == user_id)
+    ).scalar_one_or_none()
+    remember_token_version(user_id, version)
+    return version
+
+
+def remember_token_version(user_id: int, version: int | None):
+    # Called after bumps and deletes so this process rejects old tokens at once,
+    # other processes pick the change up when their entry expires
+    if settings.TOKEN_VERSION_CACHE_TTL <= 0:
+        return
+    with _cache_lock:
+        _cache[user_id] = (time.monotonic() + settings.TOKEN_VERSION_CACHE_TTL, version)
+        _cache.move_to_end(user_id)
+        while len(_cache) > settings.TOKEN_VERSION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_token_version_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,207 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.services.metrics import route_template
+
+STATEMENT_ATTRIBUTE_LENGTH = 1000
+
+_tracer = None
+_endpoint_returned: ContextVar[dict | None] = ContextVar(
+    "endpoint_returned", default=None
+)
+
+
+def configure_tracing(exporter=None) -> bool:
+    """Sets up spans for TRACING_EXPORTER, or for the given exporter in tests.
+
+    Needs the ``tracing`` extra: ``opentelemetry-sdk``, plus
+    ``opentelemetry-exporter-otlp-proto-http`` for the otlp exporter.
+    """
+    global _tracer
+    if exporter is None and settings.TRACING_EXPORTER == "none":
+        _tracer = None
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+
+    if exporter is not None:
+        processor = SimpleSpanProcessor(exporter)
+    elif settings.TRACING_EXPORTER == "console":
+        processor = SimpleSpanProcessor(ConsoleSpanExporter())
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        processor = BatchSpanProcessor(
+            OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+        )
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME})
+    )
+    provider.add_span_processor(processor)
+    _tracer = provider.get_tracer(__name__)
+    return True
+
+
+def disable_tracing():
+    global _tracer
+    _tracer = None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """A child span of the current one, or nothing while tracing is off."""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def traced(name: str | None = None):
+    """Runs the decorated function, sync or async, inside a span."""
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    if _tracer is None:
+        return
+    statement_span = _tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:STATEMENT_ATTRIBUTE_LENGTH],
+        },
+    )
+    conn.info.setdefault("trace_spans", []).append(statement_span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        spans.pop().end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        failed = spans.pop()
+        failed.record_exception(exception_context.original_exception)
+        failed.end()
+
+
+class TracingMiddleware:
+    """Opens the root span of each HTTP request, named after its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with span(method, **{"http.method": method}) as request_span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_template(scope)
+                request_span.update_name(f"{method} {route}")
+                request_span.set_attribute("http.route", route)
+                request_span.set_attribute("http.status_code", status)
+
+
+def _mark_return(endpoint):
+    def mark(result):
+        returned = _endpoint_returned.get()
+        # A Response goes out as it is, with nothing for FastAPI to serialize
+        if returned is not None and not isinstance(result, Response):
+            returned["at"] = time.time_ns()
+        return result
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_endpoint(*args, **kwargs):
+            return mark(await endpoint(*args, **kwargs))
+
+        return async_endpoint
+
+    @functools.wraps(endpoint)
+    def sync_endpoint(*args, **kwargs):
+        return mark(endpoint(*args, **kwargs))
+
+    return sync_endpoint
+
+
+class TracedRoute(APIRoute):
+    """Records serialize_response, from the endpoint returning to its response being built."""
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _mark_return(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            if _tracer is None:
+                return await handler(request)
+            returned = {}
+            token = _endpoint_returned.set(returned)
+            try:
+                response = await handler(request)
+            finally:
+                _endpoint_returned.reset(token)
+            if "at" in returned:
+                _tracer.start_span(
+                    "serialize_response", start_time=returned["at"]
+                ).end()
+            return response
+
+        return traced_handler
@@ -0,0 +1,322 @@
+"""End-to-end API latency suite.
+
+Drives the real ``app.main:app`` through either transport:
+
+* ``asgi``    - in-process ``httpx.ASGITransport``, no sockets
+* ``uvicorn`` - a uvicorn server on a local port, over HTTP
+
+and reports p50/p95/p99 latency and req/s per scenario as JSON, so runs on
+different commits can be compared. The response cache is switched off unless
+``--response-cache`` is given, so list scenarios measure ``paginate`` and
+``apply_filters`` rather than cache hits.
+
+    python -m benchmarks.api_suite --seed-books 100000 --output before.json
+    python -m benchmarks.api_suite --compare before.json --output after.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+import httpx
+import uvicorn
+from sqlalchemy import select
+from app.config import SessionLocal, settings
+from app.main import app
+from app.models import Author, Book, User
+from app.services.authorization import Role
+from app.services.passwords import pwd_context
+
+BENCH_EMAIL = "benchmark-librarian@example.com"
+BENCH_PASSWORD = "BenchPass123"
+PAGE_SIZE = 50
+SCENARIOS = (
+    "list",
+    "filter",
+    "sort",
+    "deep_page",
+    "nested",
+    "book_authors",
+    "association_write",
+    "sign_in",
+)
+
+
+def prepare_dataset(args) -> dict:
+    """Seeds when asked, makes sure the sign-in user exists and returns the sizes."""
+    with SessionLocal() as db:
+        if args.seed_books:
+            from migrations.seeds import seed
+
+            seed(
+                db,
+                authors=args.seed_authors,
+                genres=args.seed_genres,
+                books=args.seed_books,
+                users=0,
+                seed_value=args.random_seed,
+                workers=args.workers,
+            )
+        if not db.execute(select(User.id).where(User.email == BENCH_EMAIL)).first():
+            db.add(
+                User(
+                    email=BENCH_EMAIL,
+                    hashed_password=pwd_context.hash(BENCH_PASSWORD),
+                    name="Benchmark",
+                    surname="Librarian",
+                    access_level=Role.LIBRARIAN,
+                )
+            )
+            db.commit()
+        book_ids = db.execute(select(Book.id).order_by(Book.id)).scalars().all()
+        author_ids = db.execute(select(Author.id).order_by(Author.id)).scalars().all()
+    if not book_ids or not author_ids:
+        sys.exit("The database has no books or authors, pass --seed-books to seed")
+    return {"book_ids": book_ids, "author_ids": author_ids}
+
+
+def build_scenarios(dataset: dict, rng: random.Random) -> dict:
+    """Scenario name -> callable returning the next (method, url, json) request."""
+    book_ids, author_ids = dataset["book_ids"], dataset["author_ids"]
+    last_page = max(1, len(book_ids) // PAGE_SIZE)
+    letters = "abcdefghilmnoprstu"
+
+    def write_authors():
+        ids = rng.sample(author_ids, k=min(3, len(author_ids)))
+        return "PUT", f"/api/v1/books/{rng.choice(book_ids)}/authors", {"ids": ids}
+
+    return {
+        "list": lambda: ("GET", f"/api/v1/books/?page={rng.randint(1, 20)}", None),
+        "filter": lambda: (
+            "GET",
+            f"/api/v1/books/?title=ilike:%25{rng.choice(letters)}%25"
+            f"&year_of_publication=gte:{rng.randint(1970, 2020)}",
+            None,
+        ),
+        "sort": lambda: (
+            "GET",
+            f"/api/v1/books/?sort_by=title&sort_order={rng.choice(['asc', 'desc'])}"
+            f"&page={rng.randint(1, 20)}",
+            None,
+        ),
+        "deep_page": lambda: (
+            "GET",
+            f"/api/v1/books/?page={rng.randint(max(1, last_page - 10), last_page)}",
+            None,
+        ),
+        "nested": lambda: (
+            "GET",
+            f"/api/v1/books/?include=authors,genres&page={rng.randint(1, 20)}",
+            None,
+        ),
+        "book_authors": lambda: (
+            "GET",
+            f"/api/v1/books/{rng.choice(book_ids)}/authors",
+            None,
+        ),
+        "association_write": write_authors,
+        "sign_in": lambda: (
+            "POST",
+            "/api/v1/sessions/sign_in",
+            {"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+        ),
+    }
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted latencies."""
+    index = max(0, min(len(latencies) - 1, round(fraction * len(latencies)) - 1))
+    return latencies[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+async def run_scenario(client, next_request, headers, args) -> dict:
+    for _ in range(args.warmup):
+        method, url, body = next_request()
+        await client.request(method, url, json=body, headers=headers)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        method, url, body = next_request()
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body, headers=headers)
+            latency = time.perf_counter() - started
+        # Redirects count too, they never reach the route being measured
+        if not response.is_success:
+            errors += 1
+        else:
+            latencies.append(latency)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.requests)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_transport(client, scenarios: dict, args) -> dict:
+    response = await client.post(
+        "/api/v1/sessions/sign_in",
+        json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+    )
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    results = {}
+    for name, next_request in scenarios.items():
+        results[name] = await run_scenario(client, next_request, headers, args)
+        print(f"  {name:<18}{json.dumps(results[name])}", file=sys.stderr)
+    return results
+
+
+async def run_asgi(scenarios: dict, args) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        return await run_transport(client, scenarios, args)
+
+
+async def run_uvicorn(scenarios: dict, args) -> dict:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            return await run_transport(client, scenarios, args)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+TRANSPORTS = {"asgi": run_asgi, "uvicorn": run_uvicorn}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Scenarios whose p95 grew by more than threshold over the baseline."""
+    regressions = []
+    for transport, scenarios in report["results"].items():
+        for name, result in scenarios.items():
+            before = baseline.get("results", {}).get(transport, {}).get(name, {})
+            if "p95_ms" not in before or "p95_ms" not in result:
+                continue
+            change = result["p95_ms"] / before["p95_ms"] - 1
+            print(
+                f"{transport:<8}{name:<18}p95 {before['p95_ms']:>8.2f} -> "
+                f"{result['p95_ms']:>8.2f} ms ({change:+.0%})",
+                file=sys.stderr,
+            )
+            if change > threshold:
+                regressions.append(f"{transport}/{name}")
+    return regressions
+
+
+async def main(args):
+    if not args.response_cache:
+        settings.RESPONSE_CACHE_TTL = 0
+    dataset = prepare_dataset(args)
+    results = {}
+    for transport in args.transport:
+        print(f"{transport}:", file=sys.stderr)
+        # Same request sequence on every transport
+        scenarios = build_scenarios(dataset, random.Random(args.random_seed))
+        if args.scenario:
+            scenarios = {name: scenarios[name] for name in args.scenario}
+        results[transport] = await TRANSPORTS[transport](scenarios, args)
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "books": len(dataset["book_ids"]),
+        "authors": len(dataset["author_ids"]),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "response_cache": args.response_cache,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API latency benchmark suite.")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--transport", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS)
+    )
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=SCENARIOS,
+    )
+    parser.add_argument("--seed-books", type=int, default=0)
+    parser.add_argument("--seed-authors", type=int, default=10000)
+    parser.add_argument("--seed-genres", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--response-cache", action="store_true")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare p95 with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative p95 growth that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        if regressions:
+            sys.exit(f"p95 regressions: {', '.join(regressions)}")
@@ -0,0 +1,43 @@
+"""Per-request cost of decoding a bearer token with the JWT cache on and off.
+
+Each iteration decodes the same token, the way a client reuses one token
+until it expires. No database is needed.
+
+    python -m benchmarks.auth_overhead --iterations 100000
+"""
+
+import argparse
+import time
+from app.config import settings
+from app.models.user import User
+from app.services.authorization import create_jwt_token, decode_token_claims
+from app.services.jwt_cache import clear_jwt_cache, get_jwt_cache_stats
+
+
+def run_mode(token: str, cache_size: int, iterations: int):
+    settings.JWT_CACHE_SIZE = cache_size
+    clear_jwt_cache()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode_token_claims(token)
+    elapsed = time.perf_counter() - started
+    return elapsed / iterations, get_jwt_cache_stats()
+
+
+def main(iterations: int):
+    user = User(id=1, access_level=1, token_version=0)
+    token = create_jwt_token(user).access_token
+    cache_size = settings.JWT_CACHE_SIZE or 10000
+    print(f"{'cache':<8}{'us/request':>12}{'hits':>10}{'misses':>10}")
+    for name, size in (("off", 0), ("on", cache_size)):
+        per_request, stats = run_mode(token, size, iterations)
+        print(
+            f"{name:<8}{per_request * 1e6:>12.2f}{stats['hits']:>10}{stats['misses']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JWT decode benchmark.")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,100 @@
+"""Concurrent-request throughput of the CRUD layer.
+
+Compares the three ways a route can run ``BooksCrud.get_books``:
+
+* ``blocking``   - sync call straight inside the coroutine (pre-async routes)
+* ``threadpool`` - ``AsyncCrud`` over a sync ``Session``
+* ``async``      - ``AsyncCrud`` over an ``AsyncSession`` (asyncpg)
+
+Run against a migrated and seeded database:
+
+    python -m benchmarks.concurrent_requests --requests 1000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.config import SessionLocal, settings, get_async_database_url
+from app.crud.api.v1.books import BooksCrud
+from app.crud.shared.async_crud import AsyncCrud
+from app.schemas.api.v1.book import BookSortingSchema
+from app.schemas.pagination import PaginationParams
+
+QUERY = dict(
+    filters={"title": "ilike:%a%"},
+    sorting_params=BookSortingSchema(sort_by="title", sort_order="asc"),
+    pagination=PaginationParams(page=1, size=50),
+)
+
+
+async def blocking_call(_):
+    db = SessionLocal()
+    try:
+        return BooksCrud(db).get_books(**QUERY)
+    finally:
+        db.close()
+
+
+async def threadpool_call(_):
+    db = SessionLocal()
+    try:
+        return await AsyncCrud(BooksCrud, db).get_books(**QUERY)
+    finally:
+        db.close()
+
+
+async def async_call(session_factory):
+    async with session_factory() as db:
+        return await AsyncCrud(BooksCrud, db).get_books(**QUERY)
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005):
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_mode(call, session_factory, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker():
+        async with semaphore:
+            await call(session_factory)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return requests / elapsed, await lag_task
+
+
+async def main(requests: int, concurrency: int):
+    async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_URL),
+        pool_size=concurrency,
+    )
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    modes = {
+        "blocking": blocking_call,
+        "threadpool": threadpool_call,
+        "async": async_call,
+    }
+    print(f"{'mode':<12}{'req/s':>10}{'max loop lag (ms)':>20}")
+    for name, call in modes.items():
+        throughput, lag = await run_mode(call, session_factory, requests, concurrency)
+        print(f"{name:<12}{throughput:>10.1f}{lag * 1000:>20.1f}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CRUD concurrency benchmark.")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
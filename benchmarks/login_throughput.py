@@ -0,0 +1,68 @@
+"""Sign-in throughput with bcrypt on and off the event loop.
+
+Compares the two ways a route can verify a password:
+
+* ``inline`` - ``pwd_context.verify_and_update`` inside the coroutine (pre-pool routes)
+* ``pool``   - ``verify_and_update_password`` on the bounded password-hash pool
+
+Rejected checks are the 503s a saturated pool answers with.
+
+    python -m benchmarks.login_throughput --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from fastapi import HTTPException
+from app.services.passwords import pwd_context, verify_and_update_password
+from benchmarks.concurrent_requests import measure_loop_lag
+
+PASSWORD = "ValidPass123"
+
+
+async def inline_call(hashed_password):
+    return pwd_context.verify_and_update(PASSWORD, hashed_password)
+
+
+async def pool_call(hashed_password):
+    return await verify_and_update_password(PASSWORD, hashed_password)
+
+
+async def run_mode(call, hashed_password, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def worker():
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await call(hashed_password)
+            except HTTPException:
+                rejected += 1
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return (requests - rejected) / elapsed, await lag_task, rejected
+
+
+async def main(requests: int, concurrency: int):
+    hashed_password = pwd_context.hash(PASSWORD)
+    modes = {"inline": inline_call, "pool": pool_call}
+    print(f"{'mode':<8}{'sign-ins/s':>12}{'max loop lag (ms)':>20}{'rejected':>10}")
+    for name, call in modes.items():
+        throughput, lag, rejected = await run_mode(
+            call, hashed_password, requests, concurrency
+        )
+        print(f"{name:<8}{throughput:>12.1f}{lag * 1000:>20.1f}{rejected:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Password verification benchmark.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
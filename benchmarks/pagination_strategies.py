@@ -0,0 +1,81 @@
+"""Page + exact count: two statements versus one ``count(*) OVER ()`` query.
+
+The count cache is disabled so every call pays for its count. Run against a
+migrated and seeded database:
+
+    python -m benchmarks.pagination_strategies --iterations 50
+"""
+
+import argparse
+import statistics
+import time
+from sqlalchemy import select, func
+from app.config import SessionLocal, settings
+from app.crud.api.v1.authors import AuthorsCrud
+from app.crud.api.v1.books import BooksCrud
+from app.models.book_author import BookAuthor
+from app.schemas.api.v1.book import BookSortingSchema
+from app.schemas.pagination import PaginationParams
+
+
+def scenarios(db):
+    author_id = db.execute(
+        select(BookAuthor.author_id)
+        .group_by(BookAuthor.author_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    ).scalar()
+    by_title = BookSortingSchema(sort_by="title", sort_order="asc")
+    unsorted = BookSortingSchema(sort_by=None, sort_order=None)
+    return {
+        "books first page": lambda: BooksCrud(db).get_books(
+            {}, by_title, PaginationParams(page=1, size=50)
+        ),
+        "books page 1000": lambda: BooksCrud(db).get_books(
+            {}, unsorted, PaginationParams(page=1000, size=50)
+        ),
+        "books filtered": lambda: BooksCrud(db).get_books(
+            {"year_of_publication": "gte:1990", "title": "ilike:%an%"},
+            by_title,
+            PaginationParams(page=1, size=50),
+        ),
+        "books past the end": lambda: BooksCrud(db).get_books(
+            {"year_of_publication": "gte:1990"},
+            unsorted,
+            PaginationParams(page=10**6, size=50),
+        ),
+        "author books": lambda: AuthorsCrud(db).get_books_of_author(
+            author_id, {}, unsorted, PaginationParams(page=1, size=50)
+        ),
+    }
+
+
+def measure(call, iterations: int):
+    call()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.mean(timings)
+
+
+def main(iterations: int):
+    settings.COUNT_CACHE_TTL = 0
+    db = SessionLocal()
+    try:
+        print(f"{'scenario':<22}{'strategy':<10}{'p50 (ms)':>10}{'mean (ms)':>11}")
+        for name, call in scenarios(db).items():
+            for strategy in ("separate", "window"):
+                settings.PAGINATION_COUNT_STRATEGY = strategy
+                p50, mean = measure(call, iterations)
+                print(f"{name:<22}{strategy:<10}{p50:>10.2f}{mean:>11.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pagination count benchmark.")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    main(args.iterations)
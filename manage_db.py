@@ -1,8 +1,14 @@
 import argparse
+import json
 from sqlalchemy_utils import database_exists, create_database, drop_database
 import subprocess
 from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 from app.config import settings
+from app.crud.api.v1.books import BooksCrud
+from app.crud.shared.import_utils import import_format, read_records
+from app.services.response_cache import configure_response_cache
+from migrations.seeds import seed
 
 
 def get_engine(use_test_db):
@@ -33,12 +39,80 @@ def run_migrations(engine):
     subprocess.run(["alembic", "upgrade", "head"])
 
 
+def import_books(engine, path, rejects_path, batch_size):
+    file_format = import_format(path)
+    if file_format is None:
+        raise ValueError("Import file must be .ndjson, .jsonl or .csv")
+    rejects_path = rejects_path or f"{path}.rejects.ndjson"
+    with (
+        open(path, encoding="utf-8", newline="") as file,
+        open(rejects_path, "w", encoding="utf-8") as rejects,
+        Session(engine) as session,
+    ):
+
+        def reject(line, record, detail):
+            rejects.write(
+                json.dumps({"line": line, "detail": detail, "record": record}) + "\n"
+            )
+
+        summary = BooksCrud(session).import_books(
+            read_records(file, file_format), reject, batch_size
+        )
+    print(
+        f"Imported {summary['imported']} books, rejected {summary['rejected']} "
+        f"(see {rejects_path})."
+    )
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Database management script.")
     parser.add_argument(
         "command",
-        choices=["create", "drop", "migrate"],
-        help="Command to execute: 'create' to create the database, 'drop' to drop the database, 'migrate' to run migrations.",
+        choices=["create", "drop", "migrate", "import", "seed"],
+        help="Command to execute: 'create' to create the database, 'drop' to drop the database, 'migrate' to run migrations, 'import' to load books from a file, 'seed' to fill it with random data.",
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        help="Books file for 'import', as .ndjson, .jsonl or .csv with CreateBookSchema fields.",
+    )
+    parser.add_argument(
+        "--rejects",
+        help="Where 'import' writes rejected rows, defaults to <path>.rejects.ndjson.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Rows per COPY batch and transaction for 'import' and 'seed'.",
+    )
+    for entity in ("books", "authors", "genres", "users"):
+        parser.add_argument(
+            f"--{entity}",
+            type=int,
+            default=300,
+            help=f"Number of {entity} 'seed' creates.",
+        )
+    parser.add_argument(
+        "--authors-per-book",
+        type=int,
+        default=3,
+        help="Most authors 'seed' links to one book.",
+    )
+    parser.add_argument(
+        "--genres-per-book",
+        type=int,
+        default=2,
+        help="Most genres 'seed' links to one book.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Faker and random seed for 'seed'."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes generating rows for 'seed'.",
     )
     parser.add_argument(
         "--use-test-db",
@@ -48,6 +122,8 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     engine = get_engine(args.use_test_db)
+    # Imports and seeds must invalidate the pages running workers cached
+    configure_response_cache()
 
     if args.command == "create":
         create_db(engine)
@@ -55,3 +131,21 @@ if __name__ == "__main__":
         drop_db(engine)
     elif args.command == "migrate":
         run_migrations(engine)
+    elif args.command == "import":
+        if not args.path:
+            parser.error("import requires a file path")
+        import_books(engine, args.path, args.rejects, args.batch_size)
+    elif args.command == "seed":
+        with Session(engine) as session:
+            seed(
+                session,
+                authors=args.authors,
+                genres=args.genres,
+                books=args.books,
+                users=args.users,
+                authors_per_book=args.authors_per_book,
+                genres_per_book=args.genres_per_book,
+                seed_value=args.seed,
+                batch_size=args.batch_size,
+                workers=args.workers,
+            )
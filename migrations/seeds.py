@@ -1,78 +1,238 @@
 import random
+from datetime import datetime
+from multiprocessing import Pool
 from faker import Faker
+from sqlalchemy import BigInteger, cast, select, func, text
 from sqlalchemy.orm import Session
 from app.models import Author, Book, Genre, User
 from app.config import SessionLocal
-from passlib.context import CryptContext
+from app.crud.shared.import_utils import copy_rows
+from app.services.passwords import pwd_context
+from app.services.table_generations import bump_generations
 
 fake = Faker()
 
-hashed_password = CryptContext(schemes=["bcrypt"], deprecated="auto").hash("password")
+AUTHOR_COLUMNS = ["name", "surname", "year_of_birth", "biography"]
+GENRE_COLUMNS = ["name", "description"]
+BOOK_COLUMNS = [
+    "title",
+    "description",
+    "year_of_publication",
+    "isbn",
+    "series",
+    "file_link",
+    "edition",
+]
+USER_COLUMNS = [
+    "email",
+    "hashed_password",
+    "name",
+    "surname",
+    "avatar_link",
+    "access_level",
+]
+TIMESTAMP_COLUMNS = ["created_at", "updated_at"]
+ISBN_BASE = 9780000000000
 
 
-def create_authors(session: Session, count: int = 300):
-    authors = []
-    for _ in range(count):
-        author = Author(
-            name=fake.first_name(),
-            surname=fake.last_name(),
-            year_of_birth=fake.year(),
-            biography=fake.text(),
+def generate_chunk(task):
+    """Rows of one chunk, seeded by (seed, kind, start) to match for any worker count."""
+    kind, start, count, seed, options = task
+    chunk_seed = f"{seed}:{kind}:{start}"
+    fake.seed_instance(chunk_seed)
+    rng = random.Random(chunk_seed)
+    numbers = range(start, start + count)
+    if kind == "authors":
+        return [
+            (fake.first_name(), fake.last_name(), int(fake.year()), fake.text())
+            for _ in numbers
+        ]
+    if kind == "genres":
+        return [(fake.word(), fake.text()) for _ in numbers]
+    if kind == "books":
+        return [
+            (
+                fake.sentence(nb_words=4),
+                fake.text(),
+                int(fake.year()),
+                str(ISBN_BASE + options["isbn_offset"] + number),
+                fake.word().title(),
+                fake.url(),
+                f"{rng.randint(1, 10)} edition",
+            )
+            for number in numbers
+        ]
+    if kind == "users":
+        return [
+            (
+                f"user{options['email_offset'] + number}@example.com",
+                options["hashed_password"],
+                fake.first_name(),
+                fake.last_name(),
+                fake.url(),
+                rng.randint(0, 1),
+            )
+            for number in numbers
+        ]
+    # Links come back as (book index, author or genre index) pairs
+    targets, per_book = options["targets"], options["per_book"]
+    return [
+        (number, target)
+        for number in numbers
+        for target in rng.sample(
+            range(targets), k=rng.randint(1, min(per_book, targets))
         )
-        session.add(author)
-        authors.append(author)
-        session.commit()
-    return authors
-
-
-def create_books(session: Session, authors: list, genres: list, count: int = 300):
-    for _ in range(count):
-        book = Book(
-            title=fake.sentence(nb_words=4),
-            description=fake.text(),
-            year_of_publication=fake.year(),
-            isbn=fake.isbn13().replace("-", ""),
-            series=fake.word().title(),
-            file_link=fake.url(),
-            edition=f"{random.randint(1, 10)} edition",
+    ]
+
+
+def generate(kind, count, seed, batch_size, pool, **options):
+    tasks = [
+        (kind, start, min(batch_size, count - start), seed, options)
+        for start in range(0, count, batch_size)
+    ]
+    chunks = pool.imap(generate_chunk, tasks) if pool else map(generate_chunk, tasks)
+    yield from chunks
+
+
+def seed_table(session, model, columns, chunks, stamp) -> list[int]:
+    """COPYs the chunks into the table, one commit per chunk, and returns the new ids."""
+    table = model.__tablename__
+    last_id = max_id(session, model)
+    for rows in chunks:
+        copy_rows(
+            session,
+            table,
+            columns + TIMESTAMP_COLUMNS,
+            (row + (stamp, stamp) for row in rows),
         )
-        # Assign random authors and genres
-        book.authors = random.sample(authors, k=random.randint(1, 3))
-        book.genres = random.sample(genres, k=random.randint(1, 2))
-        session.add(book)
         session.commit()
+    return list(
+        session.execute(
+            select(model.id).where(model.id > last_id).order_by(model.id)
+        ).scalars()
+    )
+
+
+def max_id(session, model) -> int:
+    return session.execute(select(func.coalesce(func.max(model.id), 0))).scalar()
+
+
+def isbn_offset(session) -> int:
+    """Numbers new ISBNs after the largest 978 one stored, whoever created it."""
+    largest = session.execute(
+        select(func.max(Book.isbn)).where(Book.isbn.regexp_match(r"^978[0-9]{10}$"))
+    ).scalar()
+    return int(largest) - ISBN_BASE + 1 if largest else 0
+
 
+def email_offset(session) -> int:
+    """Numbers new emails after the largest userN@example.com one stored."""
+    number = func.substring(User.email, r"^user([0-9]+)@example\.com$")
+    largest = session.execute(select(func.max(cast(number, BigInteger)))).scalar()
+    return largest + 1 if largest is not None else 0
 
-def create_genres(session: Session, count: int = 300):
-    genres = []
-    for _ in range(count):
-        genre = Genre(
-            name=fake.word(),
-            description=fake.text(),
+
+def seed_links(session, table, target_column, chunks, book_ids, target_ids, stamp):
+    for pairs in chunks:
+        copy_rows(
+            session,
+            table,
+            ["book_id", target_column, "created_at"],
+            ((book_ids[book], target_ids[target], stamp) for book, target in pairs),
         )
-        session.add(genre)
-        genres.append(genre)
         session.commit()
-    return genres
-
-
-def create_users(session: Session, count: int = 300):
-    for _ in range(count):
-        user = User(
-            email=fake.email(),
-            hashed_password=hashed_password,
-            name=fake.first_name(),
-            surname=fake.last_name(),
-            avatar_link=fake.url(),
-            access_level=random.randint(0, 1),
+
+
+def seed(
+    session: Session,
+    authors: int = 300,
+    genres: int = 300,
+    books: int = 300,
+    users: int = 300,
+    authors_per_book: int = 3,
+    genres_per_book: int = 2,
+    seed_value: int = 42,
+    batch_size: int = 10000,
+    workers: int = 1,
+):
+    stamp = datetime.now()
+    pool = Pool(workers) if workers > 1 else None
+
+    def generate_kind(kind, count, **options):
+        return generate(kind, count, seed_value, batch_size, pool, **options)
+
+    try:
+        author_ids = seed_table(
+            session, Author, AUTHOR_COLUMNS, generate_kind("authors", authors), stamp
         )
-        session.add(user)
-        session.commit()
+        genre_ids = seed_table(
+            session, Genre, GENRE_COLUMNS, generate_kind("genres", genres), stamp
+        )
+        # Numbering ISBNs after the stored ones keeps reruns unique
+        book_offset = isbn_offset(session)
+        book_ids = seed_table(
+            session,
+            Book,
+            BOOK_COLUMNS,
+            generate_kind("books", books, isbn_offset=book_offset),
+            stamp,
+        )
+        if book_ids and author_ids:
+            seed_links(
+                session,
+                "book_author",
+                "author_id",
+                generate_kind(
+                    "book_author",
+                    len(book_ids),
+                    targets=len(author_ids),
+                    per_book=authors_per_book,
+                ),
+                book_ids,
+                author_ids,
+                stamp,
+            )
+        if book_ids and genre_ids:
+            seed_links(
+                session,
+                "book_genre",
+                "genre_id",
+                generate_kind(
+                    "book_genre",
+                    len(book_ids),
+                    targets=len(genre_ids),
+                    per_book=genres_per_book,
+                ),
+                book_ids,
+                genre_ids,
+                stamp,
+            )
+        user_offset = email_offset(session)
+        seed_table(
+            session,
+            User,
+            USER_COLUMNS,
+            generate_kind(
+                "users",
+                users,
+                email_offset=user_offset,
+                hashed_password=pwd_context.hash("password"),
+            ),
+            stamp,
+        )
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    # Fresh statistics, so load tests see the plans production would
+    tables = ("authors", "genres", "books", "book_author", "book_genre", "users")
+    for table in tables:
+        session.execute(text(f"ANALYZE {table}"))
+    session.commit()
+    # COPY bypasses the ORM events that bump generations on commit
+    bump_generations(tables)
 
 
-session = SessionLocal()
-authors = create_authors(session)
-genres = create_genres(session)
-create_books(session, authors, genres)
-create_users(session)
-session.close()
+if __name__ == "__main__":
+    with SessionLocal() as session:
+        seed(session)
@@ -0,0 +1,62 @@
+import asyncio
+import random
+import httpx
+from app.main import app
+from app.models import Author, Book, User
+from app.services.passwords import pwd_context
+from benchmarks.api_suite import (
+    BENCH_EMAIL,
+    BENCH_PASSWORD,
+    SCENARIOS,
+    build_scenarios,
+)
+
+
+def seed_dataset(session) -> dict:
+    authors = [
+        Author(
+            name=f"Author {index}",
+            surname="Surname",
+            year_of_birth=1950,
+            biography="Biography",
+        )
+        for index in range(3)
+    ]
+    book = Book(
+        title="Garden",
+        isbn="9780000000001",
+        year_of_publication=2000,
+        description="Description",
+        series="Series",
+        file_link="https://example.com/book.pdf",
+        edition="First",
+    )
+    user = User(
+        email=BENCH_EMAIL,
+        hashed_password=pwd_context.hash(BENCH_PASSWORD),
+        name="Benchmark",
+        surname="Librarian",
+    )
+    session.add_all([*authors, book, user])
+    session.commit()
+    return {"book_ids": [book.id], "author_ids": [author.id for author in authors]}
+
+
+# Test for every scenario reaching its route rather than a redirect
+def test_scenarios_reach_their_routes(authorized_librarian, session):
+    scenarios = build_scenarios(seed_dataset(session), random.Random(0))
+    assert tuple(scenarios) == SCENARIOS
+
+    async def run_once() -> dict:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            statuses = {}
+            for name, next_request in scenarios.items():
+                method, url, body = next_request()
+                response = await client.request(method, url, json=body)
+                statuses[name] = response.status_code
+            return statuses
+
+    assert asyncio.run(run_once()) == {name: 200 for name in SCENARIOS}
@@ -7,7 +7,17 @@ from app.config import settings
 from app.models import *
 from app.main import app
 from app.services.authorization import get_current_user
-from app.routers.api.v1.shared.depends import get_librarian_user, get_admin_user
+from app.services.counting import clear_count_cache
+from app.services.jwt_cache import clear_jwt_cache
+from app.services.metrics import clear_request_metrics
+from app.services.response_cache import clear_response_cache
+from app.services.replicas import get_read_db
+from app.services.token_versions import clear_token_version_cache
+from app.routers.api.v1.shared.depends import (
+    get_librarian_user,
+    get_admin_user,
+    get_stream_db,
+)
 
 
 @pytest.fixture(scope="session")
@@ -28,14 +38,27 @@ def session(engine):
     yield session
     session.close()
     Base.metadata.drop_all(engine)
+    clear_count_cache()
+    clear_token_version_cache()
+    clear_jwt_cache()
+    clear_response_cache()
+    clear_request_metrics()
 
 
 @pytest.fixture(scope="function")
-def client(session):
+def client(session, engine, monkeypatch):
+    # Any route repeating a statement past the limit fails its test
+    monkeypatch.setattr(settings, "QUERY_INSPECTION", True)
+    monkeypatch.setattr(settings, "REPEATED_QUERY_RAISE", True)
     app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[get_read_db] = lambda: session
+    StreamSession = sessionmaker(bind=engine)
+    app.dependency_overrides[get_stream_db] = lambda: StreamSession()
     client = TestClient(app)
     yield client
     app.dependency_overrides.pop(get_db)
+    app.dependency_overrides.pop(get_read_db)
+    app.dependency_overrides.pop(get_stream_db)
 
 
 @pytest.fixture(scope="function")
@@ -370,3 +370,31 @@ def test_remove_book_genre_association_non_existent_genre(book_crud, sample_book
         )  # Non-existent genre
     assert excinfo.value.status_code == 404
     assert excinfo.value.detail == "Genre not found"
+
+
+# Positive and negative Test: Import books, rejecting bad and conflicting rows
+def test_import_books(book_crud, sample_book, session):
+    records = [
+        (1, {"title": "A", "year_of_publication": 2001, "isbn": "1000000000001"}),
+        (2, {"title": "B", "year_of_publication": 2002, "isbn": "1000000000001"}),
+        (3, {"title": "C", "year_of_publication": 20, "isbn": "1000000000003"}),
+        (4, None),
+        (5, {"title": "D", "year_of_publication": 2004, "isbn": sample_book.isbn}),
+        (
+            6,
+            {"title": 'E "x", y', "year_of_publication": 2005, "isbn": "1000000000006"},
+        ),
+    ]
+    rejects = []
+    summary = book_crud.import_books(
+        records, lambda *args: rejects.append(args), batch_size=4
+    )
+    assert summary == {"imported": 2, "rejected": 4}
+    assert {line: detail for line, _, detail in rejects} == {
+        2: "Duplicate ISBN in file",
+        3: "year_of_publication: Input should be greater than or equal to 1000",
+        4: "Invalid JSON object",
+        5: "ISBN must be unique",
+    }
+    titles = session.query(Book.title).order_by(Book.id).all()
+    assert [title for (title,) in titles] == ["Sample Book", "A", 'E "x", y']
@@ -2,10 +2,13 @@ import pytest
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.schemas.api.v1.user import SignUpSchema, SignInSchema, UpdateUserSchema
+from app.schemas.api.v1.user import SignUpSchema, UpdateUserSchema
 from app.crud.api.v1.users import UsersCrud
 
 
+HASHED_PASSWORD = "$2b$12$KIXTOzQF5Y8G1Z1Z1Z1Z1u"
+
+
 @pytest.fixture
 def user_crud(session: Session):
     return UsersCrud(db=session)
@@ -20,7 +23,7 @@ def sample_user(session: Session, user_crud: UsersCrud):
         surname="User",
         avatar_link="https://example.com/avatar.jpg",
     )
-    user = user_crud.sign_up_user(user)
+    user = user_crud.sign_up_user(user, HASHED_PASSWORD)
     return user
 
 
@@ -33,8 +36,9 @@ def test_sign_up_user(user_crud):
         password="ValidPass123",
         avatar_link="https://example.com/avatar.jpg",
     )
-    user = user_crud.sign_up_user(user_data)
+    user = user_crud.sign_up_user(user_data, HASHED_PASSWORD)
     assert user.email == "newuser@example.com"
+    assert user.hashed_password == HASHED_PASSWORD
     assert user.name == "New"
     assert user.surname == "User"
 
@@ -49,35 +53,21 @@ def test_sign_up_user_existing_email(user_crud, sample_user):
         avatar_link="https://example.com/avatar.jpg",
     )
     with pytest.raises(HTTPException) as excinfo:
-        user_crud.sign_up_user(user_data)
+        user_crud.sign_up_user(user_data, HASHED_PASSWORD)
     assert excinfo.value.status_code == 400
     assert excinfo.value.detail == "Email already in use"
 
 
-# Positive Test: Sign in with correct credentials
-def test_sign_in_user(user_crud, sample_user):
-    user_data = SignInSchema(
-        email="test@example.com",
-        password="ValidPass123",  # Assuming this matches the hashed password
-    )
-    user = user_crud.sign_in_user(user_data)
-    assert user.email == "test@example.com"
+# Positive Test: Get user by email
+def test_get_user_by_email(user_crud, sample_user):
+    user = user_crud.get_user_by_email("test@example.com")
+    assert user.id == sample_user.id
 
 
-# Negative Test: Sign in with incorrect password
-def test_sign_in_user_invalid_password(user_crud, sample_user):
-    user_data = SignInSchema(email="test@example.com", password="InvalidPass123")
+# Negative Test: Get user by non-existent email
+def test_get_user_by_email_non_existent(user_crud):
     with pytest.raises(HTTPException) as excinfo:
-        user_crud.sign_in_user(user_data)
-    assert excinfo.value.status_code == 401
-    assert excinfo.value.detail == "Invalid password"
-
-
-# Negative Test: Sign in with non-existent email
-def test_sign_in_user_non_existent_email(user_crud):
-    user_data = SignInSchema(email="nonexistent@example.com", password="ValidPass123")
-    with pytest.raises(HTTPException) as excinfo:
-        user_crud.sign_in_user(user_data)
+        user_crud.get_user_by_email("nonexistent@example.com")
     assert excinfo.value.status_code == 404
     assert excinfo.value.detail == "User not found"
 
@@ -91,6 +81,14 @@ def test_update_user(user_crud, sample_user):
     assert updated_user.name == "Updated"
     assert updated_user.surname == "User"
     assert updated_user.email == "updated@example.com"
+    assert updated_user.hashed_password == HASHED_PASSWORD
+
+
+# Positive Test: Update user password
+def test_update_user_password(user_crud, sample_user):
+    update_data = UpdateUserSchema(password="NewValidPass123")
+    updated_user = user_crud.update_user(sample_user, update_data, "new_hash")
+    assert updated_user.hashed_password == "new_hash"
 
 
 # Negative Test: Update user with existing email
@@ -98,7 +96,7 @@ def test_update_user_existing_email(user_crud, sample_user, session: Session):
     # Create another user with a different email
     another_user = User(
         email="another@example.com",
-        hashed_password="$2b$12$KIXTOzQF5Y8G1Z1Z1Z1Z1u",
+        hashed_password=HASHED_PASSWORD,
         name="Another",
         surname="User",
         avatar_link="https://example.com/avatar.jpg",
@@ -120,9 +118,7 @@ def test_remove_user(user_crud, sample_user):
     user_crud.remove_user(sample_user)
     # Attempt to fetch the user should raise an exception or return None
     with pytest.raises(HTTPException) as excinfo:
-        user_crud.sign_in_user(
-            SignInSchema(email="test@example.com", password="ValidPass123")
-        )
+        user_crud.get_user_by_email("test@example.com")
     assert excinfo.value.status_code == 404
     assert excinfo.value.detail == "User not found"
 
@@ -132,7 +128,7 @@ def test_remove_non_existent_user(user_crud, session: Session):
     non_existent_user = User(
         id=999,  # Assuming this ID doesn't exist
         email="nonexistent@example.com",
-        hashed_password="$2b$12$KIXTOzQF5Y8G1Z1Z1Z1Z1u",
+        hashed_password=HASHED_PASSWORD,
         name="Non",
         surname="Existent",
         avatar_link="https://example.com/avatar.jpg",
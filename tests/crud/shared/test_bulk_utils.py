@@ -0,0 +1,66 @@
+from sqlalchemy import select
+from app.models.book import Book
+from app.models.genre import Genre
+from app.crud.shared.bulk_utils import (
+    bulk_create,
+    bulk_update,
+    bulk_delete,
+    find_duplicates,
+    match_any,
+)
+
+
+def test_find_duplicates():
+    assert find_duplicates(["a", "b", "a", "c", "b", "a"]) == {2, 4, 5}
+    assert find_duplicates([]) == set()
+
+
+def test_match_any_uses_one_parameter(session):
+    session.add_all([Genre(name="A"), Genre(name="B"), Genre(name="C")])
+    session.commit()
+    stmt = select(Genre.name).where(match_any(Genre.name, ["A", "C"]))
+    assert len(stmt.compile().params) == 1
+    assert sorted(session.scalars(stmt)) == ["A", "C"]
+
+
+def test_bulk_create_skips_failed_rows(session):
+    rows = [{"name": "A"}, {"name": "B"}, {"name": "C"}]
+    response = bulk_create(session, Genre, rows, {1: "Rejected"})
+    assert (response.succeeded, response.failed) == (2, 1)
+    assert response.results[1].detail == "Rejected"
+    names = session.scalars(select(Genre.name).order_by(Genre.id)).all()
+    assert names == ["A", "C"]
+    assert response.results[2].id == session.scalar(
+        select(Genre.id).where(Genre.name == "C")
+    )
+
+
+def test_bulk_create_reports_conflicting_rows(session):
+    session.add(Book(title="Taken", isbn="1"))
+    session.commit()
+    rows = [{"title": "A", "isbn": "2"}, {"title": "B", "isbn": "1"}]
+    response = bulk_create(
+        session, Book, rows, {}, conflict_column="isbn", conflict_message="Taken"
+    )
+    assert [result.status for result in response.results] == ["created", "failed"]
+    assert response.results[1].detail == "Taken"
+    assert response.results[0].id == session.scalar(
+        select(Book.id).where(Book.isbn == "2")
+    )
+
+
+def test_bulk_update_without_changes(session):
+    genre = Genre(name="A")
+    session.add(genre)
+    session.commit()
+    response = bulk_update(session, Genre, [{"id": genre.id}], "Genre not found", {})
+    assert response.results[0].status == "updated"
+
+
+def test_bulk_delete_reports_missing_ids(session):
+    genre = Genre(name="A")
+    session.add(genre)
+    session.commit()
+    response = bulk_delete(session, Genre, [genre.id, 999], "Genre not found")
+    assert [result.status for result in response.results] == ["deleted", "failed"]
+    assert session.scalars(select(Genre)).all() == []
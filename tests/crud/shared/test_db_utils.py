@@ -1,11 +1,15 @@
 import pytest
+from sqlalchemy import select
 from app.models.book import Book
+from app.models.author import Author
+from app.models.book_author import BookAuthor
 from app.crud.shared.db_utils import (
     fetch_by_id,
+    fetch_version,
     fetch_by_attr,
     ensure_unique,
-    ensure_association_does_not_exist,
-    fetch_association,
+    create_association,
+    delete_association,
 )
 
 
@@ -29,6 +33,17 @@ def test_fetch_by_id(session):
     assert "Book not found" in str(exc_info.value)
 
 
+def test_fetch_version(session):
+    book = Book(title="Test Book", isbn="1234567890")
+    session.add(book)
+    session.commit()
+
+    book_id, updated_at = fetch_version(session, Book, book.id)
+    assert book_id == book.id
+    assert updated_at.tzinfo is not None
+    assert fetch_version(session, Book, 999) is None
+
+
 def test_fetch_by_attr(session):
     book = Book(
         title="Test Book",
@@ -68,39 +83,77 @@ def test_ensure_unique(session):
     ensure_unique(session, Book, "isbn", "1234567890", "ISBN must be unique")
 
 
-def test_ensure_association_does_not_exist(session):
-    book = Book(
-        title="Test Book",
-        description="Description",
-        year_of_publication=2023,
-        isbn="1234567890",
-    )
-    session.add(book)
+NOT_FOUND_MESSAGES = {"book_id": "Book not found", "author_id": "Author not found"}
+
+
+@pytest.fixture
+def book_and_author(session):
+    book = Book(title="Test Book", isbn="1234567890")
+    author = Author(name="Test Author")
+    session.add_all([book, author])
     session.commit()
+    return book.id, author.id
+
+
+def test_create_association(session, book_and_author):
+    book_id, author_id = book_and_author
+    create_association(
+        session, BookAuthor, NOT_FOUND_MESSAGES, book_id=book_id, author_id=author_id
+    )
+    assert session.execute(select(BookAuthor)).scalar_one().author_id == author_id
 
     with pytest.raises(Exception) as exc_info:
-        ensure_association_does_not_exist(session, Book, id=book.id)
+        create_association(
+            session,
+            BookAuthor,
+            NOT_FOUND_MESSAGES,
+            book_id=book_id,
+            author_id=author_id,
+        )
     assert exc_info.value.status_code == 400
     assert "Association already exists" in str(exc_info.value)
 
-    # Ensure no exception for non-existing association
-    ensure_association_does_not_exist(session, Book, id=999)
 
+@pytest.mark.parametrize(
+    "missing, message",
+    [("book_id", "Book not found"), ("author_id", "Author not found")],
+)
+def test_create_association_missing_parent(session, book_and_author, missing, message):
+    book_id, author_id = book_and_author
+    ids = {"book_id": book_id, "author_id": author_id, missing: 999}
+    with pytest.raises(Exception) as exc_info:
+        create_association(session, BookAuthor, NOT_FOUND_MESSAGES, **ids)
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == message
 
-def test_fetch_association(session):
-    book = Book(
-        title="Test Book",
-        description="Description",
-        year_of_publication=2023,
-        isbn="1234567890",
-    )
-    session.add(book)
+
+def test_delete_association(session, book_and_author):
+    book_id, author_id = book_and_author
+    session.add(BookAuthor(book_id=book_id, author_id=author_id))
     session.commit()
 
-    fetched_book = fetch_association(session, Book, "Book not found", id=book.id)
-    assert fetched_book.id == book.id
+    delete_association(
+        session, BookAuthor, NOT_FOUND_MESSAGES, book_id=book_id, author_id=author_id
+    )
+    assert session.execute(select(BookAuthor)).scalar_one_or_none() is None
 
     with pytest.raises(Exception) as exc_info:
-        fetch_association(session, Book, "Book not found", id=999)
+        delete_association(
+            session,
+            BookAuthor,
+            NOT_FOUND_MESSAGES,
+            book_id=book_id,
+            author_id=author_id,
+        )
     assert exc_info.value.status_code == 404
-    assert "Book not found" in str(exc_info.value)
+    assert exc_info.value.detail == "Association not found"
+
+
+def test_delete_association_missing_parent(session, book_and_author):
+    book_id, _ = book_and_author
+    with pytest.raises(Exception) as exc_info:
+        delete_association(
+            session, BookAuthor, NOT_FOUND_MESSAGES, book_id=book_id, author_id=999
+        )
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Author not found"
@@ -0,0 +1,47 @@
+import io
+from sqlalchemy import text
+from app.crud.shared.import_utils import (
+    batched,
+    copy_rows,
+    import_format,
+    read_records,
+)
+
+
+def test_import_format():
+    assert import_format("books.NDJSON") == "ndjson"
+    assert import_format("books.jsonl") == "ndjson"
+    assert import_format("books.csv") == "csv"
+    assert import_format("books.xlsx") is None
+
+
+def test_read_ndjson_records():
+    file = io.StringIO('{"title": "A"}\n\n[1]\nnot json\n{"title": "B"}\n')
+    assert list(read_records(file, "ndjson")) == [
+        (1, {"title": "A"}),
+        (3, None),
+        (4, None),
+        (5, {"title": "B"}),
+    ]
+
+
+def test_read_csv_records():
+    file = io.StringIO('title,isbn\n"multi\nline",1\nB,2\n')
+    assert list(read_records(file, "csv")) == [
+        (3, {"title": "multi\nline", "isbn": "1"}),
+        (4, {"title": "B", "isbn": "2"}),
+    ]
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_copy_rows(session):
+    session.execute(text("CREATE TEMP TABLE copy_test (id integer, value text)"))
+    copy_rows(
+        session, "copy_test", ["id", "value"], [(1, 'a "b", c'), (2, ""), (3, None)]
+    )
+    rows = session.execute(text("SELECT id, value FROM copy_test ORDER BY id")).all()
+    assert rows == [(1, 'a "b", c'), (2, ""), (3, None)]
+    session.rollback()
@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from sqlalchemy import func, select, text
+from app.models import Author, Book, BookAuthor, BookGenre, Genre, User
+from migrations.seeds import ISBN_BASE, seed
+
+ROOT = Path(__file__).resolve().parents[2]
+SEEDED_TABLES = "authors, genres, books, book_author, book_genre, users"
+
+
+def count(session, model) -> int:
+    return session.execute(select(func.count()).select_from(model)).scalar()
+
+
+def seeded_rows(session) -> dict:
+    """Table contents without ids and timestamps, which differ between runs."""
+    return {
+        "authors": session.execute(
+            select(Author.name, Author.surname, Author.biography).order_by(Author.id)
+        ).all(),
+        "genres": session.execute(
+            select(Genre.name, Genre.description).order_by(Genre.id)
+        ).all(),
+        "books": session.execute(
+            select(Book.title, Book.isbn, Book.edition).order_by(Book.id)
+        ).all(),
+        "book_author": session.execute(
+            select(BookAuthor.book_id, BookAuthor.author_id).order_by(
+                BookAuthor.book_id, BookAuthor.author_id
+            )
+        ).all(),
+        "book_genre": session.execute(
+            select(BookGenre.book_id, BookGenre.genre_id).order_by(
+                BookGenre.book_id, BookGenre.genre_id
+            )
+        ).all(),
+        "users": session.execute(
+            select(User.email, User.name, User.access_level).order_by(User.id)
+        ).all(),
+    }
+
+
+def truncate(session):
+    session.execute(text(f"TRUNCATE {SEEDED_TABLES} RESTART IDENTITY CASCADE"))
+    session.commit()
+
+
+SIZES = dict(authors=7, genres=5, books=9, users=4, batch_size=3)
+
+
+# Test for seeding creating the requested rows in every table
+def test_seed_row_counts(session):
+    seed(session, authors_per_book=2, genres_per_book=3, **SIZES)
+
+    assert count(session, Author) == 7
+    assert count(session, Genre) == 5
+    assert count(session, Book) == 9
+    assert count(session, User) == 4
+    for model, per_book in ((BookAuthor, 2), (BookGenre, 3)):
+        per_book_counts = (
+            session.execute(
+                select(func.count()).select_from(model).group_by(model.book_id)
+            )
+            .scalars()
+            .all()
+        )
+        assert len(per_book_counts) == 9
+        assert all(1 <= links <= per_book for links in per_book_counts)
+
+
+# Test for the data depending on the seed only, not the worker count
+def test_seed_is_deterministic_across_workers(session):
+    seed(session, workers=1, **SIZES)
+    single = seeded_rows(session)
+    truncate(session)
+
+    seed(session, workers=2, **SIZES)
+
+    assert seeded_rows(session) == single
+
+
+# Test for reruns numbering ISBNs and emails after rows created elsewhere
+def test_seed_skips_existing_isbns_and_emails(session):
+    session.add_all(
+        [
+            Book(title="Imported", isbn=str(ISBN_BASE + 5)),
+            User(
+                email="user3@example.com",
+                hashed_password="hash",
+                name="Signed",
+                surname="Up",
+            ),
+        ]
+    )
+    session.commit()
+
+    seed(session, **SIZES)
+    seed(session, **SIZES)
+
+    isbns = session.execute(select(Book.isbn)).scalars().all()
+    emails = session.execute(select(User.email)).scalars().all()
+    assert len(isbns) == len(set(isbns)) == 19
+    assert len(emails) == len(set(emails)) == 9
+
+
+# Test for the seed command passing its options through to the seeder
+def test_seed_command(session):
+    subprocess.run(
+        [
+            sys.executable,
+            "manage_db.py",
+            "seed",
+            "--use-test-db",
+            "--books=4",
+            "--authors=3",
+            "--genres=2",
+            "--users=1",
+            "--authors-per-book=1",
+            "--genres-per-book=1",
+            "--workers=2",
+        ],
+        cwd=ROOT,
+        env=os.environ,
+        check=True,
+    )
+
+    assert [count(session, model) for model in (Author, Genre, Book, User)] == [
+        3,
+        2,
+        4,
+        1,
+    ]
+    assert count(session, BookAuthor) == count(session, BookGenre) == 4
@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.exc import IntegrityError
 from app.models.book import Book
 
@@ -48,3 +48,14 @@ def test_unique_isbn_constraint(session):
     session.add(book2)
     with pytest.raises(IntegrityError):
         session.commit()
+
+
+def test_sorted_page_walks_sort_index(session):
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    stmt = select(Book).order_by(Book.title.desc(), Book.id.desc()).limit(10)
+    compiled = stmt.compile(
+        dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = session.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+    assert any("ix_books_title_id" in line for line in plan)
+    assert not any("Sort" in line for line in plan)
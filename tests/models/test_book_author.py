@@ -2,7 +2,7 @@ import pytest
 from app.models.book import Book
 from app.models.author import Author
 from app.models.book_author import BookAuthor
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.exc import IntegrityError
 
 
@@ -61,3 +61,15 @@ def test_cascade_delete(session, data):
         select(BookAuthor).filter_by(book_id=1, author_id=1)
     ).scalar_one_or_none()
     assert result is None
+
+
+def test_author_lookup_uses_reverse_index(session, data):
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = (
+        session.execute(
+            text("EXPLAIN SELECT book_id FROM book_author WHERE author_id = 1")
+        )
+        .scalars()
+        .all()
+    )
+    assert any("ix_book_author_author_id_book_id" in line for line in plan)
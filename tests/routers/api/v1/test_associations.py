@@ -0,0 +1,91 @@
+import pytest
+from fastapi import status
+
+
+@pytest.fixture
+def sample_ids(authorized_librarian):
+    books = [
+        {
+            "title": f"Book {idx}",
+            "year_of_publication": 2020,
+            "isbn": f"300000000000{idx}",
+        }
+        for idx in range(2)
+    ]
+    authors = [{"name": "John", "surname": "Doe", "year_of_birth": 1970}]
+    genres = [{"name": "Fiction"}]
+    ids = {}
+    for entity, items in (("books", books), ("authors", authors), ("genres", genres)):
+        response = authorized_librarian.post(
+            f"/api/v1/{entity}/bulk", json={"items": items}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        ids[entity] = [result["id"] for result in response.json()["results"]]
+    return ids
+
+
+def test_bulk_create_associations(authorized_librarian, sample_ids):
+    book_1, book_2 = sample_ids["books"]
+    (author_id,) = sample_ids["authors"]
+    (genre_id,) = sample_ids["genres"]
+    response = authorized_librarian.post(f"/api/v1/books/{book_1}/authors/{author_id}")
+    assert response.status_code == status.HTTP_201_CREATED
+
+    associations = [
+        {"book_id": book_1, "genre_id": genre_id},
+        {"book_id": book_2, "author_id": author_id},
+        {"book_id": book_2, "genre_id": genre_id},
+        {"book_id": book_1, "author_id": author_id},
+        {"book_id": book_2, "genre_id": 999},
+        {"book_id": book_2, "author_id": author_id},
+    ]
+    response = authorized_librarian.post(
+        "/api/v1/associations/bulk", json={"items": associations}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["succeeded"] == 3
+    assert [result["detail"] for result in data["results"][3:]] == [
+        "Association already exists",
+        "Genre not found",
+        "Duplicate association in request",
+    ]
+
+    response = authorized_librarian.get(f"/api/v1/genres/{genre_id}/books")
+    assert response.json()["total"] == 2
+    response = authorized_librarian.get(f"/api/v1/authors/{author_id}/books")
+    assert response.json()["total"] == 2
+
+
+def test_bulk_create_associations_requires_one_target(authorized_librarian):
+    response = authorized_librarian.post(
+        "/api/v1/associations/bulk", json={"items": [{"book_id": 1}]}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_bulk_create_associations_unauthorized(client):
+    response = client.post(
+        "/api/v1/associations/bulk", json={"items": [{"book_id": 1, "author_id": 1}]}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_export_associations(client, authorized_librarian, sample_ids):
+    book_1, book_2 = sample_ids["books"]
+    (genre_id,) = sample_ids["genres"]
+    for book_id in (book_2, book_1):
+        authorized_librarian.post(f"/api/v1/books/{book_id}/genres/{genre_id}")
+    response = client.get("/api/v1/associations/export?table=book_genre&format=csv")
+    assert response.status_code == status.HTTP_200_OK
+    lines = response.text.splitlines()
+    assert lines[0].startswith("book_id,genre_id")
+    assert [line.split(",")[:2] for line in lines[1:]] == [
+        [str(book_1), str(genre_id)],
+        [str(book_2), str(genre_id)],
+    ]
+
+
+def test_export_associations_unknown_table(client):
+    response = client.get("/api/v1/associations/export?table=users")
+    assert response.status_code == 422
@@ -58,6 +58,13 @@ def test_get_nonexistent_author(client):
     assert response.json() == {"detail": "Author not found"}
 
 
+def test_get_authors_with_included_books(client, associate_author_and_book):
+    response = client.get("/api/v1/authors/?include=books")
+    assert response.status_code == status.HTTP_200_OK
+    (author,) = response.json()["items"]
+    assert [book["title"] for book in author["books"]] == ["Sample Book"]
+
+
 # Test for creating a new author
 def test_create_author(authorized_librarian):
     response = authorized_librarian.post("/api/v1/authors/", json=valid_author_data)
@@ -119,6 +126,31 @@ def test_delete_author(authorized_librarian, create_sample_author):
     assert response.json() == {"detail": "Author not found"}
 
 
+def test_bulk_create_update_delete_authors(authorized_librarian):
+    authors = [valid_author_data, {**valid_author_data, "name": "Jane"}]
+    response = authorized_librarian.post(
+        "/api/v1/authors/bulk", json={"items": authors}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    ids = [result["id"] for result in response.json()["results"]]
+    assert response.json()["succeeded"] == 2
+
+    response = authorized_librarian.patch(
+        "/api/v1/authors/bulk",
+        json={"items": [{"id": ids[0], "surname": "Smith"}, {"id": ids[0]}]},
+    )
+    assert response.json()["results"][1]["detail"] == "Duplicate id in request"
+    response = authorized_librarian.get(f"/api/v1/authors/{ids[0]}")
+    assert response.json()["surname"] == "Smith"
+
+    response = authorized_librarian.request(
+        "DELETE", "/api/v1/authors/bulk", json={"ids": ids}
+    )
+    assert response.json()["succeeded"] == 2
+    response = authorized_librarian.get(f"/api/v1/authors/{ids[1]}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 # Test for attempting to delete a non-existent author
 def test_delete_nonexistent_author(authorized_librarian):
     response = authorized_librarian.delete("/api/v1/authors/999999")
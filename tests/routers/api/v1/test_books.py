@@ -1,5 +1,10 @@
+import csv
+import io
+import json
 import pytest
 from fastapi import status
+from app.config import settings
+from app.routers.api.v1 import books as books_router
 
 
 valid_book_data = {
@@ -86,6 +91,183 @@ def test_get_nonexistent_book(client):
     assert response.json() == {"detail": "Book not found"}
 
 
+def test_get_books_with_included_relations(client, associate_book_and_author):
+    response = client.get("/api/v1/books/?include=authors,genres")
+    assert response.status_code == status.HTTP_200_OK
+    (book,) = response.json()["items"]
+    assert [author["id"] for author in book["authors"]] == [
+        associate_book_and_author["author_id"]
+    ]
+    assert book["genres"] == []
+
+
+def test_get_book_with_included_authors(client, associate_book_and_author):
+    book_id = associate_book_and_author["book_id"]
+    response = client.get(f"/api/v1/books/{book_id}?include=authors")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["authors"]) == 1
+    assert "genres" not in response.json()
+
+
+def test_get_books_without_include(client, create_sample_book):
+    response = client.get("/api/v1/books/")
+    (book,) = response.json()["items"]
+    assert "authors" not in book
+    assert "genres" not in book
+
+
+def test_get_books_with_unsupported_include(client):
+    response = client.get("/api/v1/books/?include=authors,publisher")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {"detail": "Unsupported include: 'publisher'"}
+
+
+# Test for a 304 when the book has not changed since its ETag
+def test_get_book_not_modified(authorized_librarian, create_sample_book):
+    url = f"/api/v1/books/{create_sample_book['id']}"
+    response = authorized_librarian.get(url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "Last-Modified" in response.headers
+    response = authorized_librarian.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    authorized_librarian.patch(url, json={"title": "Updated Title"})
+    response = authorized_librarian.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+# Test for a 304 on a listing, with and without a cached response
+@pytest.mark.parametrize("cache_ttl", [0, 5])
+def test_get_books_not_modified(client, create_sample_book, monkeypatch, cache_ttl):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_TTL", cache_ttl)
+    response = client.get("/api/v1/books/?size=10")
+    etag = response.headers["ETag"]
+    response = client.get("/api/v1/books/?size=10", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    response = client.get("/api/v1/books/?size=5", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+# Test for listings ignoring If-Modified-Since
+def test_get_books_has_no_last_modified(client, create_sample_book):
+    response = client.get("/api/v1/books/")
+    assert "ETag" in response.headers
+    assert "Last-Modified" not in response.headers
+    response = client.get(
+        "/api/v1/books/", headers={"If-Modified-Since": "Mon, 01 Jan 2100 00:00:00 GMT"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+# Test for a delete changing a listing whose newest row stays the same
+def test_get_books_after_delete_is_modified(authorized_librarian, create_sample_book):
+    older = {**valid_book_data, "title": "Older", "isbn": "9876543210987"}
+    older_id = authorized_librarian.post("/api/v1/books/", json=older).json()["id"]
+    newer = {**valid_book_data, "title": "Newer", "isbn": "9876543210988"}
+    authorized_librarian.post("/api/v1/books/", json=newer)
+    url = "/api/v1/books/?sort_by=isbn&sort_order=desc&size=2"
+    etag = authorized_librarian.get(url).headers["ETag"]
+    since = "Mon, 01 Jan 2100 00:00:00 GMT"
+
+    authorized_librarian.delete(f"/api/v1/books/{older_id}")
+    response = authorized_librarian.get(url, headers={"If-Modified-Since": since})
+    assert response.status_code == status.HTTP_200_OK
+    response = authorized_librarian.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+# Test for a listing ETag without a count following its rows
+def test_get_books_without_count_etag_follows_rows(
+    authorized_librarian, create_sample_book
+):
+    url = "/api/v1/books/?count=none"
+    etag = authorized_librarian.get(url).headers["ETag"]
+    response = authorized_librarian.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    authorized_librarian.patch(
+        f"/api/v1/books/{create_sample_book['id']}", json={"title": "Updated Title"}
+    )
+    response = authorized_librarian.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+# Test for embedded relations skipping the ETag
+def test_get_books_with_include_has_no_etag(client, associate_book_and_author):
+    response = client.get("/api/v1/books/?include=authors")
+    assert "ETag" not in response.headers
+
+
+# Test for importing a books file as an admin
+def test_import_books(authorized_admin, create_sample_book):
+    rows = [
+        {**valid_book_data, "isbn": "9876543210987"},
+        {**valid_book_data, "year_of_publication": "soon"},
+        valid_book_data,
+    ]
+    body = "\n".join(json.dumps(row) for row in rows)
+    response = authorized_admin.post(
+        "/api/v1/books/import", files={"file": ("books.ndjson", body)}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert (data["imported"], data["rejected"]) == (1, 2)
+    assert [reject["line"] for reject in data["rejects"]] == [2, 3]
+    assert data["rejects"][1]["detail"] == "ISBN must be unique"
+    response = authorized_admin.get("/api/v1/books/?isbn=eq:9876543210987")
+    assert response.json()["total"] == 1
+
+
+# Test for capping the rejects an import returns
+def test_import_books_caps_rejects(authorized_admin, monkeypatch):
+    monkeypatch.setattr(books_router, "IMPORT_REJECTS_LIMIT", 2)
+    body = "\n".join(json.dumps({"title": ""}) for _ in range(5))
+    response = authorized_admin.post(
+        "/api/v1/books/import", files={"file": ("books.ndjson", body)}
+    )
+    data = response.json()
+    assert (data["imported"], data["rejected"]) == (0, 5)
+    assert [reject["line"] for reject in data["rejects"]] == [1, 2]
+
+
+# Test for rejecting an import file of unknown type
+def test_import_books_unsupported_file(authorized_admin):
+    response = authorized_admin.post(
+        "/api/v1/books/import", files={"file": ("books.xml", "<books/>")}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+# Test for streaming the catalog as NDJSON with filters
+def test_export_books_ndjson(client, authorized_librarian, create_sample_book):
+    other_book = {**valid_book_data, "title": "Other", "isbn": "9876543210987"}
+    authorized_librarian.post("/api/v1/books/", json=other_book)
+    response = client.get("/api/v1/books/export?title=eq:Other")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["isbn"] == "9876543210987"
+
+
+# Test for streaming the catalog as CSV
+def test_export_books_csv(client, create_sample_book):
+    response = client.get("/api/v1/books/export?format=csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert rows[0]["id"] == str(create_sample_book["id"])
+    assert rows[0]["title"] == valid_book_data["title"]
+
+
+# Test for export rejecting unsupported filters before streaming
+def test_export_books_invalid_filter(client):
+    response = client.get("/api/v1/books/export?title=search:garden")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 # Test for creating a new book
 def test_create_book(authorized_librarian):
     response = authorized_librarian.post("/api/v1/books/", json=valid_book_data)
@@ -153,6 +335,78 @@ def test_delete_nonexistent_book(authorized_librarian):
     assert response.json() == {"detail": "Book not found"}
 
 
+def test_bulk_create_books(authorized_librarian, create_sample_book):
+    books = [
+        {**valid_book_data, "title": "Bulk 1", "isbn": "2000000000001"},
+        {**valid_book_data, "title": "Bulk 2", "isbn": "2000000000002"},
+        {**valid_book_data, "title": "Taken", "isbn": valid_book_data["isbn"]},
+        {**valid_book_data, "title": "Repeated", "isbn": "2000000000001"},
+    ]
+    response = authorized_librarian.post("/api/v1/books/bulk", json={"items": books})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 2
+    assert [result["status"] for result in data["results"]] == [
+        "created",
+        "created",
+        "failed",
+        "failed",
+    ]
+    assert data["results"][2]["detail"] == "ISBN must be unique"
+    assert data["results"][3]["detail"] == "ISBN must be unique"
+
+    book_id = data["results"][1]["id"]
+    response = authorized_librarian.get(f"/api/v1/books/{book_id}")
+    assert response.json()["title"] == "Bulk 2"
+
+
+def test_bulk_update_books(authorized_librarian, create_sample_book):
+    book_id = create_sample_book["id"]
+    response = authorized_librarian.patch(
+        "/api/v1/books/bulk",
+        json={
+            "items": [
+                {"id": book_id, "title": "Renamed"},
+                {"id": 999, "title": "Missing"},
+            ]
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [
+        {"index": 0, "id": book_id, "status": "updated", "detail": None},
+        {"index": 1, "id": 999, "status": "failed", "detail": "Book not found"},
+    ]
+    response = authorized_librarian.get(f"/api/v1/books/{book_id}")
+    assert response.json()["title"] == "Renamed"
+
+
+def test_bulk_delete_books(authorized_librarian, associate_book_and_author):
+    book_id = associate_book_and_author["book_id"]
+    author_id = associate_book_and_author["author_id"]
+    response = authorized_librarian.get(f"/api/v1/authors/{author_id}/books")
+    assert response.json()["total"] == 1
+
+    response = authorized_librarian.request(
+        "DELETE", "/api/v1/books/bulk", json={"ids": [book_id, 999]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["succeeded"] == 1
+    assert response.json()["results"][1]["detail"] == "Book not found"
+    response = authorized_librarian.get(f"/api/v1/authors/{author_id}/books")
+    assert response.json()["total"] == 0
+
+
+def test_bulk_create_books_unauthorized(client):
+    response = client.post("/api/v1/books/bulk", json={"items": [valid_book_data]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_bulk_create_books_empty(authorized_librarian):
+    response = authorized_librarian.post("/api/v1/books/bulk", json={"items": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 # Test for getting authors of a book
 def test_get_authors_of_book(client, associate_book_and_author):
     book_id = associate_book_and_author["book_id"]
@@ -257,6 +511,52 @@ def test_delete_book_author_association_nonexistent_author(client, create_sample
     assert response.json() == {"detail": "Author not found"}
 
 
+def test_replace_book_authors(authorized_librarian, associate_book_and_author):
+    book_id = associate_book_and_author["book_id"]
+    old_author_id = associate_book_and_author["author_id"]
+    response = authorized_librarian.post(
+        "/api/v1/authors/bulk",
+        json={
+            "items": [
+                {"name": "Ann", "surname": "Lee", "year_of_birth": 1960},
+                {"name": "Bob", "surname": "Ray", "year_of_birth": 1970},
+            ]
+        },
+    )
+    new_ids = [result["id"] for result in response.json()["results"]]
+
+    response = authorized_librarian.put(
+        f"/api/v1/books/{book_id}/authors", json={"ids": new_ids}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "ids": sorted(new_ids),
+        "added": sorted(new_ids),
+        "removed": [old_author_id],
+    }
+    response = authorized_librarian.get(f"/api/v1/books/{book_id}/authors")
+    assert sorted(author["id"] for author in response.json()["items"]) == new_ids
+
+    response = authorized_librarian.put(
+        f"/api/v1/books/{book_id}/authors", json={"ids": []}
+    )
+    assert response.json()["removed"] == sorted(new_ids)
+
+
+def test_replace_book_authors_nonexistent_author(
+    authorized_librarian, associate_book_and_author
+):
+    book_id = associate_book_and_author["book_id"]
+    response = authorized_librarian.put(
+        f"/api/v1/books/{book_id}/authors", json={"ids": [999]}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Author not found"}
+    # The existing set is left untouched
+    response = authorized_librarian.get(f"/api/v1/books/{book_id}/authors")
+    assert response.json()["total"] == 1
+
+
 # Test for getting genres of a book
 def test_get_genres_of_book(client, associate_book_and_genre):
     book_id = associate_book_and_genre["book_id"]
@@ -365,6 +665,22 @@ def test_delete_book_genre_association_nonexistent_genre(
     assert response.json() == {"detail": "Genre not found"}
 
 
+def test_replace_book_genres(authorized_librarian, associate_book_and_genre):
+    book_id = associate_book_and_genre["book_id"]
+    genre_id = associate_book_and_genre["genre_id"]
+    response = authorized_librarian.put(
+        f"/api/v1/books/{book_id}/genres", json={"ids": [genre_id]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"ids": [genre_id], "added": [], "removed": []}
+
+
+def test_replace_genres_of_nonexistent_book(authorized_librarian):
+    response = authorized_librarian.put("/api/v1/books/999/genres", json={"ids": []})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Book not found"}
+
+
 def test_sort_books_by_title_ascending(authorized_librarian):
     titles = ["TestTitle C", "TestTitle A", "TestTitle B"]
     created_ids = []
@@ -415,6 +731,94 @@ def test_sort_books_by_year_descending(authorized_librarian):
     ), f"Expected order: {expected_order}, got: {sorted_years}"
 
 
+def test_paginate_books_with_cursor(authorized_librarian):
+    for idx, year in enumerate([1990, 2000, 1980, 2010, 1970]):
+        book_data = valid_book_data.copy()
+        book_data["year_of_publication"] = year
+        book_data["isbn"] = str(int(valid_book_data["isbn"]) + idx + 20)
+        response = authorized_librarian.post("/api/v1/books/", json=book_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    url = "/api/v1/books/?sort_by=year_of_publication&sort_order=desc&size=2"
+    response = authorized_librarian.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    years = [book["year_of_publication"] for book in response.json()["items"]]
+    assert response.json()["prev_cursor"] is None
+
+    next_cursor = response.json()["next_cursor"]
+    while next_cursor:
+        response = authorized_librarian.get(f"{url}&cursor={next_cursor}")
+        assert response.status_code == status.HTTP_200_OK
+        years += [book["year_of_publication"] for book in response.json()["items"]]
+        next_cursor = response.json()["next_cursor"]
+
+    assert years == [2010, 2000, 1990, 1980, 1970]
+    assert response.json()["prev_cursor"] is not None
+
+
+def test_paginate_books_with_invalid_cursor(client):
+    response = client.get("/api/v1/books/?cursor=invalid")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_get_books_without_count(client, create_sample_book):
+    response = client.get("/api/v1/books/?count=none")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] is None
+    assert response.json()["pages"] is None
+    assert response.json()["has_next"] is False
+    assert len(response.json()["items"]) == 1
+
+
+def test_get_books_with_estimated_count(client, create_sample_book):
+    response = client.get("/api/v1/books/?count=estimated")
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json()["total"], int)
+
+
+def test_get_books_with_invalid_count_mode(client):
+    response = client.get("/api/v1/books/?count=approximate")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_search_books_by_relevance(authorized_librarian):
+    books = [
+        ("Gardening basics", "A practical guide", "Home"),
+        ("Cooking at home", "Recipes from the garden", "Gardening"),
+        ("Ocean tides", "Waves and currents", "Science"),
+    ]
+    for idx, (title, description, series) in enumerate(books):
+        book_data = valid_book_data.copy()
+        book_data.update(title=title, description=description, series=series)
+        book_data["isbn"] = str(int(valid_book_data["isbn"]) + idx + 30)
+        response = authorized_librarian.post("/api/v1/books/", json=book_data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = authorized_librarian.get(
+        "/api/v1/books/?search=gardens&sort_by=relevance&sort_order=desc&size=1"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 2
+    assert [book["title"] for book in response.json()["items"]] == ["Gardening basics"]
+    # Relevance is computed per query, so only offset pagination applies
+    assert response.json()["next_cursor"] is None
+
+
+def test_sort_books_by_relevance_without_search(client):
+    response = client.get("/api/v1/books/?sort_by=relevance")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        "detail": "Sorting by 'relevance' requires a search filter"
+    }
+
+
+def test_search_books_with_relevance_cursor(client):
+    response = client.get("/api/v1/books/?search=garden&sort_by=relevance&cursor=x")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
 # Test for sorting authors by name in ascending order for a given book
 def test_sort_authors_by_name_ascending(authorized_librarian, create_sample_book):
     book_id = create_sample_book["id"]
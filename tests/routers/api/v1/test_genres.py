@@ -57,6 +57,13 @@ def test_get_nonexistent_genre(client):
     assert response.json() == {"detail": "Genre not found"}
 
 
+def test_get_genre_with_included_books(client, associate_genre_and_book):
+    genre_id = associate_genre_and_book["genre_id"]
+    response = client.get(f"/api/v1/genres/{genre_id}?include=books")
+    assert response.status_code == status.HTTP_200_OK
+    assert [book["title"] for book in response.json()["books"]] == ["Sample Book"]
+
+
 # Test for creating a new genre
 def test_create_genre(authorized_librarian):
     response = authorized_librarian.post("/api/v1/genres/", json=valid_genre_data)
@@ -103,6 +110,27 @@ def test_delete_genre(authorized_librarian, create_sample_genre):
     assert response.json() == {"detail": "Genre not found"}
 
 
+def test_bulk_create_update_delete_genres(authorized_librarian):
+    genres = [valid_genre_data, {"name": "Poetry", "description": "Verse"}]
+    response = authorized_librarian.post("/api/v1/genres/bulk", json={"items": genres})
+    assert response.status_code == status.HTTP_200_OK
+    ids = [result["id"] for result in response.json()["results"]]
+
+    response = authorized_librarian.patch(
+        "/api/v1/genres/bulk",
+        json={"items": [{"id": ids[1], "name": "Lyric poetry"}]},
+    )
+    assert response.json()["succeeded"] == 1
+    response = authorized_librarian.get(f"/api/v1/genres/{ids[1]}")
+    assert response.json()["name"] == "Lyric poetry"
+
+    response = authorized_librarian.request(
+        "DELETE", "/api/v1/genres/bulk", json={"ids": [ids[0], ids[0]]}
+    )
+    assert response.json()["succeeded"] == 1
+    assert response.json()["results"][1]["detail"] == "Duplicate id in request"
+
+
 # Test for attempting to delete a non-existent genre
 def test_delete_nonexistent_genre(authorized_librarian):
     response = authorized_librarian.delete("/api/v1/genres/999999")
@@ -1,5 +1,8 @@
 import pytest
 from fastapi import status
+from app.models.user import User
+from app.routers.api.v1 import sessions as sessions_router
+from app.services.passwords import pwd_context
 
 
 valid_user_data = {
@@ -30,7 +33,11 @@ def test_sign_up_user(client):
 
 
 # Test for sign-up with existing email
-def test_sign_up_user_existing_email(client, create_sample_user):
+def test_sign_up_user_existing_email(client, create_sample_user, monkeypatch):
+    async def hash_password(password):
+        raise AssertionError("a taken email must not be hashed")
+
+    monkeypatch.setattr(sessions_router, "hash_password", hash_password)
     response = client.post("/api/v1/sessions/sign_up", json=valid_user_data)
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json() == {"detail": "Email already in use"}
@@ -47,6 +54,45 @@ def test_sign_in_user(client, create_sample_user):
     assert "access_token" in response.json()
 
 
+# Test for sign-in rehashing a password stored with another cost
+def test_sign_in_user_upgrades_hash(client, session, create_sample_user):
+    user = session.query(User).filter_by(email=valid_user_data["email"]).one()
+    user.hashed_password = pwd_context.copy(bcrypt__rounds=4).hash(
+        valid_user_data["password"]
+    )
+    session.commit()
+    sign_in_data = {
+        "email": valid_user_data["email"],
+        "password": valid_user_data["password"],
+    }
+    response = client.post("/api/v1/sessions/sign_in", json=sign_in_data)
+    assert response.status_code == status.HTTP_200_OK
+    session.refresh(user)
+    assert not pwd_context.needs_update(user.hashed_password)
+    assert pwd_context.verify(valid_user_data["password"], user.hashed_password)
+
+
+# Test for a password change revoking earlier tokens
+def test_password_change_revokes_tokens(client, create_sample_user):
+    sign_in_data = {
+        "email": valid_user_data["email"],
+        "password": valid_user_data["password"],
+    }
+    token = client.post("/api/v1/sessions/sign_in", json=sign_in_data).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    response = client.get("/api/v1/sessions/current_user", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    response = client.patch(
+        "/api/v1/sessions/current_user",
+        json={"password": "NewValidPass123"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get("/api/v1/sessions/current_user", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {"detail": "Token has been revoked"}
+
+
 # Test for sign-in with incorrect password
 def test_sign_in_user_invalid_password(client, create_sample_user):
     invalid_data = {"email": valid_user_data["email"], "password": "WrongPassword123"}
@@ -54,6 +54,10 @@ def test_invalid_authentication_responses():
                             "summary": "Invalid token",
                             "value": {"detail": "Invalid token"},
                         },
+                        "token_revoked": {
+                            "summary": "Token revoked",
+                            "value": {"detail": "Token has been revoked"},
+                        },
                         "non_existent_user": {
                             "summary": "Token pointing to non-existent user",
                             "value": {"detail": "Token pointing to non-existent user"},
@@ -0,0 +1,28 @@
+def test_pool_metrics(client):
+    response = client.get("/metrics/pool")
+
+    assert response.status_code == 200
+    sync = response.json()["sync"]
+    assert {
+        "size",
+        "max_overflow",
+        "checked_out",
+        "overflow",
+        "checkouts",
+        "wait_seconds_total",
+        "wait_seconds_max",
+        "timeouts",
+    } <= sync.keys()
+
+
+def test_prometheus_metrics(client):
+    client.get("/api/v1/genres/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'db_queries_total{route="/api/v1/genres/"}' in response.text
+    assert 'db_pool_checked_out{pool="sync"}' in response.text
+    assert "jwt_cache_hits_total 0" in response.text
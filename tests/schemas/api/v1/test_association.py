@@ -0,0 +1,28 @@
+import pytest
+from pydantic import ValidationError
+from app.schemas.api.v1.association import (
+    AssociationSchema,
+    ReplaceAssociationsSchema,
+)
+
+
+def test_association_schema():
+    association = AssociationSchema(book_id=1, author_id=2)
+    assert association.genre_id is None
+
+    association = AssociationSchema(book_id=1, genre_id=3)
+    assert association.author_id is None
+
+    # Exactly one target is required
+    with pytest.raises(ValidationError):
+        AssociationSchema(book_id=1)
+    with pytest.raises(ValidationError):
+        AssociationSchema(book_id=1, author_id=2, genre_id=3)
+
+
+def test_replace_associations_schema():
+    assert ReplaceAssociationsSchema(ids=[]).ids == []
+    assert ReplaceAssociationsSchema(ids=[1, 2]).ids == [1, 2]
+
+    with pytest.raises(ValidationError):
+        ReplaceAssociationsSchema(ids=["one"])
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+from app.models.book import Book
+from app.schemas.api.v1.include import BookWithRelationsSchema, include_dependency
+
+
+def test_include_dependency():
+    dependency = include_dependency("authors", "genres")
+    assert dependency(include=None) == set()
+    assert dependency(include="authors, genres,") == {"authors", "genres"}
+
+    with pytest.raises(HTTPException) as exc:
+        dependency(include="books")
+    assert exc.value.status_code == 422
+
+
+def test_book_with_relations_skips_unloaded_relations(session):
+    book = Book(
+        title="Book",
+        description="",
+        year_of_publication=2020,
+        isbn="1234567890123",
+        series="",
+        file_link="",
+        edition="",
+    )
+    session.add(book)
+    session.commit()
+    session.refresh(book)
+
+    schema = BookWithRelationsSchema.model_validate(book, from_attributes=True)
+    assert schema.model_fields_set.isdisjoint({"authors", "genres"})
+    # Validation must not trigger a lazy load
+    assert "authors" not in book.__dict__
@@ -62,3 +62,14 @@ def test_paginated_response_empty_items():
     assert response.page == page
     assert response.size == size
     assert response.pages == pages
+
+
+def test_pagination_params_cursor():
+    assert PaginationParams().cursor is None
+    assert PaginationParams(cursor="abc").cursor == "abc"
+
+
+def test_paginated_response_cursors_default_to_none():
+    response = PaginatedResponse[str](items=[], total=0, page=1, size=10, pages=0)
+    assert response.next_cursor is None
+    assert response.prev_cursor is None
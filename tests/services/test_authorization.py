@@ -0,0 +1,89 @@
+import jwt
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from app.config import settings
+from app.models.user import User
+from app.services.authorization import (
+    Role,
+    create_jwt_token,
+    decode_token_claims,
+    get_current_user,
+    get_current_user_with_minimum_role,
+    get_token_claims,
+)
+from app.services.token_versions import remember_token_version
+
+
+@pytest.fixture
+def librarian(session):
+    user = User(email="librarian@example.com", access_level=Role.LIBRARIAN)
+    session.add(user)
+    session.commit()
+    return user
+
+
+def credentials(user: User):
+    token = create_jwt_token(user).access_token
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_create_jwt_token_embeds_claims(librarian):
+    claims = decode_token_claims(credentials(librarian).credentials)
+    assert claims.user_id == librarian.id
+    assert claims.access_level == Role.LIBRARIAN
+    assert claims.token_version == 0
+
+
+def test_decode_token_claims_without_claims():
+    token = jwt.encode({"sub": "1"}, settings.JWT_SECRET_KEY, algorithm="HS256")
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token_claims(token)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Invalid token"
+
+
+def test_minimum_role_authorizes_from_cached_claims(session, engine, librarian):
+    auth = credentials(librarian)
+    get_token_claims(auth, session)
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        claims = get_current_user_with_minimum_role(Role.LIBRARIAN)(
+            get_token_claims(auth, session)
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert claims.user_id == librarian.id
+    assert statements == []
+
+
+def test_minimum_role_insufficient_rights(session, librarian):
+    claims = get_token_claims(credentials(librarian), session)
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user_with_minimum_role(Role.ADMIN)(claims)
+    assert exc_info.value.status_code == 403
+
+
+def test_bumped_token_version_revokes_token(session, librarian):
+    auth = credentials(librarian)
+    remember_token_version(librarian.id, 1)
+    with pytest.raises(HTTPException) as exc_info:
+        get_token_claims(auth, session)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Token has been revoked"
+
+
+def test_deleted_user_token(session, librarian):
+    auth = credentials(librarian)
+    remember_token_version(librarian.id, None)
+    with pytest.raises(HTTPException) as exc_info:
+        get_token_claims(auth, session)
+    assert exc_info.value.detail == "Token pointing to non-existent user"
+
+
+def test_get_current_user_loads_user(session, librarian):
+    claims = get_token_claims(credentials(librarian), session)
+    assert get_current_user(claims, session).id == librarian.id
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import select, insert, text
+from app.models.book import Book
+from app.models.author import Author
+from app.models.book_author import BookAuthor
+from app.config import settings
+from app.services.counting import count_rows, count_exact, count_estimated
+
+
+@pytest.fixture()
+def seed_books(session):
+    session.add_all(
+        [
+            Book(title=f"Book {index}", year_of_publication=2000, isbn=f"ISBN{index}")
+            for index in range(5)
+        ]
+    )
+    session.commit()
+
+
+def insert_without_session_events(session, title, isbn):
+    session.connection().exec_driver_sql(
+        "INSERT INTO books (title, isbn) VALUES (%(title)s, %(isbn)s)",
+        {"title": title, "isbn": isbn},
+    )
+    session.commit()
+
+
+def test_count_rows_none(session, seed_books):
+    assert count_rows(session, select(Book), "none") is None
+
+
+def test_count_exact(session, seed_books):
+    assert count_exact(session, select(Book)) == 5
+    assert count_exact(session, select(Book).where(Book.title == "Book 1")) == 1
+
+
+def test_count_exact_is_cached(session, seed_books):
+    stmt = select(Book)
+    assert count_exact(session, stmt) == 5
+    insert_without_session_events(session, "Hidden", "ISBN-HIDDEN")
+    assert count_exact(session, stmt) == 5
+
+
+def test_count_exact_cache_is_keyed_by_filters(session, seed_books):
+    assert count_exact(session, select(Book).where(Book.title == "Book 1")) == 1
+    assert count_exact(session, select(Book).where(Book.title == "Book 2")) == 1
+    assert count_exact(session, select(Book).where(Book.title == "Missing")) == 0
+
+
+def test_count_exact_cache_is_invalidated_by_writes(session, seed_books):
+    stmt = select(Book)
+    assert count_exact(session, stmt) == 5
+    session.add(Book(title="New", year_of_publication=2000, isbn="ISBN-NEW"))
+    session.commit()
+    assert count_exact(session, stmt) == 6
+
+
+def test_count_exact_cache_is_invalidated_by_association_writes(session):
+    book = Book(title="Book", isbn="ISBN1")
+    author = Author(name="Author")
+    session.add_all([book, author])
+    session.commit()
+    stmt = (
+        select(Book)
+        .join(BookAuthor, Book.id == BookAuthor.book_id)
+        .where(BookAuthor.author_id == author.id)
+    )
+    assert count_exact(session, stmt) == 0
+    session.execute(insert(BookAuthor).values(book_id=book.id, author_id=author.id))
+    session.commit()
+    assert count_exact(session, stmt) == 1
+
+
+def test_count_exact_cache_is_not_invalidated_by_rollback(session, seed_books):
+    stmt = select(Book)
+    assert count_exact(session, stmt) == 5
+    session.add(Book(title="New", year_of_publication=2000, isbn="ISBN-NEW"))
+    session.flush()
+    session.rollback()
+    insert_without_session_events(session, "Hidden", "ISBN-HIDDEN")
+    assert count_exact(session, stmt) == 5
+
+
+def test_count_exact_without_cache(session, seed_books, monkeypatch):
+    monkeypatch.setattr(settings, "COUNT_CACHE_TTL", 0)
+    assert count_exact(session, select(Book)) == 5
+    insert_without_session_events(session, "Hidden", "ISBN-HIDDEN")
+    assert count_exact(session, select(Book)) == 6
+
+
+def test_count_estimated_uses_table_statistics(session, seed_books):
+    session.execute(text("ANALYZE books"))
+    assert count_estimated(session, select(Book)) == 5
+
+
+def test_count_estimated_with_filters(session, seed_books):
+    session.execute(text("ANALYZE books"))
+    stmt = select(Book).where(Book.title.in_(["Book 1", "Book 2"]))
+    assert count_estimated(session, stmt) >= 1
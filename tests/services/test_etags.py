@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from starlette.requests import Request
+from app.services.etags import etag_matches, http_date, is_not_modified, make_etag
+
+
+def request_with(**headers):
+    raw = [
+        (name.replace("_", "-").encode(), value.encode())
+        for name, value in headers.items()
+    ]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_make_etag_is_weak_and_stable():
+    assert make_etag(1, "a") == make_etag(1, "a")
+    assert make_etag(1, "a") != make_etag(2, "a")
+    assert make_etag(1).startswith('W/"')
+
+
+def test_etag_matches():
+    etag = make_etag(1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_http_date():
+    value = datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc)
+    assert http_date(value) == "Thu, 02 Jan 2025 03:04:05 GMT"
+
+
+def test_is_not_modified_prefers_if_none_match():
+    last_modified = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    request = request_with(
+        if_none_match='"other"', if_modified_since=http_date(last_modified)
+    )
+    assert not is_not_modified(request, make_etag(1), last_modified)
+
+
+def test_is_not_modified_since():
+    last_modified = datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc)
+    request = request_with(if_modified_since=http_date(last_modified))
+    assert is_not_modified(request, make_etag(1), last_modified)
+    assert not is_not_modified(request, make_etag(1), datetime.now(timezone.utc))
+    assert not is_not_modified(
+        request_with(if_modified_since="junk"), "", last_modified
+    )
@@ -0,0 +1,66 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from app.services import export
+from app.services.export import export_response
+
+
+class FakeSession:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def read_chunks(response):
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    return asyncio.run(collect())
+
+
+def read_body(response):
+    return "".join(read_chunks(response))
+
+
+def test_export_ndjson():
+    rows = [(1, "Dune", datetime(2025, 1, 2, 3, 4, 5)), (2, None, None)]
+    db = FakeSession()
+    response = export_response(db, rows, ["id", "title", "created_at"], "ndjson", "x")
+    lines = read_body(response).splitlines()
+    assert json.loads(lines[0]) == {
+        "id": 1,
+        "title": "Dune",
+        "created_at": "2025-01-02T03:04:05",
+    }
+    assert json.loads(lines[1]) == {"id": 2, "title": None, "created_at": None}
+    assert response.media_type == "application/x-ndjson"
+    assert db.closed
+
+
+def test_export_csv_in_chunks(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_ROWS", 2)
+    rows = [(n, f"title, {n}") for n in range(5)]
+    response = export_response(FakeSession(), rows, ["id", "title"], "csv", "books")
+    chunks = read_chunks(response)
+    assert len(chunks) == 3
+    assert list(csv.reader(io.StringIO("".join(chunks))))[1] == ["0", "title, 0"]
+    assert response.headers["content-disposition"] == (
+        'attachment; filename="books.csv"'
+    )
+
+
+def test_export_closes_session_on_error():
+    def failing_rows():
+        yield (1,)
+        raise RuntimeError("connection lost")
+
+    db = FakeSession()
+    response = export_response(db, failing_rows(), ["id"], "ndjson", "x")
+    try:
+        read_body(response)
+    except RuntimeError:
+        pass
+    assert db.closed
@@ -0,0 +1,72 @@
+import time
+import jwt
+import pytest
+from fastapi import HTTPException
+from app.config import settings
+from app.services.authorization import decode_jwt_token
+from app.services.jwt_cache import clear_jwt_cache, get_jwt_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_jwt_cache()
+    yield
+    clear_jwt_cache()
+
+
+def make_token(exp: float, **claims):
+    payload = {"sub": "1", "exp": int(exp), **claims}
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
+
+
+def test_decoded_token_is_cached():
+    token = make_token(time.time() + 60)
+    assert decode_jwt_token(token)["sub"] == "1"
+    assert decode_jwt_token(token)["sub"] == "1"
+    assert get_jwt_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_skips_signature_check(monkeypatch):
+    token = make_token(time.time() + 60)
+    decode_jwt_token(token)
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: pytest.fail())
+    assert decode_jwt_token(token)["sub"] == "1"
+
+
+def test_expired_cached_token(monkeypatch):
+    token = make_token(time.time() + 60)
+    decode_jwt_token(token)
+    monkeypatch.setattr(time, "time", lambda: 10**10)
+
+    def expired(*args, **kwargs):
+        raise jwt.ExpiredSignatureError()
+
+    monkeypatch.setattr(jwt, "decode", expired)
+    with pytest.raises(HTTPException) as exc_info:
+        decode_jwt_token(token)
+    assert exc_info.value.detail == "Token has expired"
+    assert get_jwt_cache_stats()["size"] == 0
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(HTTPException):
+        decode_jwt_token("not-a-token")
+    assert get_jwt_cache_stats()["size"] == 0
+
+
+def test_cache_size_limit(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_CACHE_SIZE", 2)
+    tokens = [make_token(time.time() + 60, n=n) for n in range(3)]
+    for token in tokens:
+        decode_jwt_token(token)
+    assert get_jwt_cache_stats()["size"] == 2
+    decode_jwt_token(tokens[0])
+    assert get_jwt_cache_stats()["hits"] == 0
+
+
+def test_cache_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "JWT_CACHE_SIZE", 0)
+    token = make_token(time.time() + 60)
+    decode_jwt_token(token)
+    decode_jwt_token(token)
+    assert get_jwt_cache_stats() == {"hits": 0, "misses": 0, "size": 0}
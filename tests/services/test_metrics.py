@@ -0,0 +1,75 @@
+from sqlalchemy import text
+from app.services.metrics import (
+    DB_QUERIES,
+    REQUEST_DURATION,
+    Counter,
+    Gauge,
+    Histogram,
+    render_metrics,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_counter_and_gauge_render_labels():
+    counter = Counter("queries_total", "Queries.", ("route",))
+    counter.inc(("/b",), 2)
+    counter.inc(('say "hi"',))
+    gauge = Gauge("in_progress", "In progress.")
+    gauge.inc()
+    gauge.dec()
+
+    assert counter.render()[2:] == [
+        'queries_total{route="/b"} 2',
+        'queries_total{route="say \\"hi\\""} 1',
+    ]
+    assert gauge.render() == [
+        "# HELP in_progress In progress.",
+        "# TYPE in_progress gauge",
+        "in_progress 0",
+    ]
+
+
+def test_requests_are_labelled_by_route_template(client):
+    client.get("/api/v1/books/1/authors")
+    client.get("/api/v1/unknown")
+
+    output = render_metrics()
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/books/{book_id}/authors",status="404"} 1'
+    ) in output
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="unmatched",status="404"} 1'
+    ) in output
+
+
+def test_queries_are_counted_per_route(client):
+    client.get("/api/v1/genres/")
+    client.get("/api/v1/genres/")
+
+    assert DB_QUERIES._values[("/api/v1/genres/",)] >= 2
+    assert ("GET", "/api/v1/genres/", "200") in REQUEST_DURATION._values
+
+
+def test_queries_outside_requests_are_not_counted(session):
+    session.execute(text("SELECT 1"))
+
+    assert DB_QUERIES._values == {}
@@ -1,8 +1,15 @@
+import base64
 import pytest
-from sqlalchemy import select, desc
+from contextlib import contextmanager
+from sqlalchemy import event
+from fastapi import HTTPException
+from sqlalchemy import select, desc, text
 from app.models.book import Book
+from app.schemas.api.v1.book import BookSortingSchema
 from app.schemas.pagination import PaginationParams
 from app.services.pagination import paginate
+from app.config import settings
+from app.crud.api.v1.shared.sort_fields import book_sort_fields
 
 
 @pytest.fixture()
@@ -32,7 +39,7 @@ def seed_books(session):
 
 
 def test_paginate(session, seed_books):
-    stmt = select(Book).order_by(desc(Book.created_at))
+    stmt = select(Book).order_by(desc(Book.created_at), Book.id)
 
     # Test pagination with page=1 and size=2
     pagination_params = PaginationParams(page=1, size=2)
@@ -66,3 +73,237 @@ def test_paginate(session, seed_books):
     assert response.total == 3
     assert response.pages == 2
     assert len(response.items) == 0
+
+
+@pytest.fixture()
+def seed_many_books(session):
+    books = [
+        Book(
+            title=f"Book {index % 3}",
+            series=None if index % 4 == 0 else f"Series {index % 2}",
+            year_of_publication=2000 + index,
+            isbn=f"ISBN{index:03}",
+        )
+        for index in range(10)
+    ]
+    session.add_all(books)
+    session.commit()
+
+
+def walk_cursors(session, sorting_params, size, direction="next_cursor"):
+    stmt = select(Book)
+    response = paginate(
+        session,
+        stmt,
+        PaginationParams(page=1, size=size),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    pages = [response]
+    while getattr(response, direction):
+        response = paginate(
+            session,
+            stmt,
+            PaginationParams(size=size, cursor=getattr(response, direction)),
+            sorting_params=sorting_params,
+            sort_fields=book_sort_fields,
+        )
+        pages.append(response)
+    return pages
+
+
+@pytest.mark.parametrize(
+    "sort_by, sort_order",
+    [
+        (None, None),
+        ("title", "asc"),
+        ("title", "desc"),
+        ("series", "asc"),
+        ("series", "desc"),
+        ("created_at", "desc"),
+    ],
+)
+def test_cursor_pagination_matches_offset_order(
+    session, seed_many_books, sort_by, sort_order
+):
+    sorting_params = BookSortingSchema(sort_by=sort_by, sort_order=sort_order)
+    expected = paginate(
+        session,
+        select(Book),
+        PaginationParams(page=1, size=10),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    expected_ids = [book.id for book in expected.items]
+
+    pages = walk_cursors(session, sorting_params, size=3)
+    assert [len(page.items) for page in pages] == [3, 3, 3, 1]
+    assert [book.id for page in pages for book in page.items] == expected_ids
+
+    # Walking back from the last page visits the same pages in reverse
+    last_page = pages[-1]
+    previous_ids = []
+    response = last_page
+    while response.prev_cursor:
+        response = paginate(
+            session,
+            select(Book),
+            PaginationParams(size=3, cursor=response.prev_cursor),
+            sorting_params=sorting_params,
+            sort_fields=book_sort_fields,
+        )
+        previous_ids = [book.id for book in response.items] + previous_ids
+    assert previous_ids + [book.id for book in last_page.items] == expected_ids
+
+
+def test_offset_pagination_returns_cursors(session, seed_many_books):
+    sorting_params = BookSortingSchema(sort_by="title", sort_order="asc")
+    first = paginate(
+        session,
+        select(Book),
+        PaginationParams(page=1, size=4),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    assert first.prev_cursor is None
+    assert first.next_cursor is not None
+
+    second = paginate(
+        session,
+        select(Book),
+        PaginationParams(size=4, cursor=first.next_cursor),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    by_offset = paginate(
+        session,
+        select(Book),
+        PaginationParams(page=2, size=4),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    assert [book.id for book in second.items] == [book.id for book in by_offset.items]
+    assert by_offset.prev_cursor is not None
+
+    last = paginate(
+        session,
+        select(Book),
+        PaginationParams(page=3, size=4),
+        sorting_params=sorting_params,
+        sort_fields=book_sort_fields,
+    )
+    assert len(last.items) == 2
+    assert last.next_cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", base64.urlsafe_b64encode(b'{"sort": [null, false]}').decode()],
+)
+def test_invalid_cursor(session, seed_many_books, cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        paginate(
+            session,
+            select(Book),
+            PaginationParams(size=3, cursor=cursor),
+            sorting_params=BookSortingSchema(sort_by=None, sort_order=None),
+            sort_fields=book_sort_fields,
+        )
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+def test_cursor_from_different_sort_is_rejected(session, seed_many_books):
+    first = paginate(
+        session,
+        select(Book),
+        PaginationParams(page=1, size=3),
+        sorting_params=BookSortingSchema(sort_by="title", sort_order="asc"),
+        sort_fields=book_sort_fields,
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        paginate(
+            session,
+            select(Book),
+            PaginationParams(size=3, cursor=first.next_cursor),
+            sorting_params=BookSortingSchema(sort_by="series", sort_order="asc"),
+            sort_fields=book_sort_fields,
+        )
+    assert exc_info.value.status_code == 422
+
+
+def test_paginate_without_count(session, seed_books):
+    stmt = select(Book)
+    response = paginate(session, stmt, PaginationParams(page=1, size=2, count="none"))
+    assert response.total is None
+    assert response.pages is None
+    assert response.has_next is True
+    assert len(response.items) == 2
+
+    response = paginate(session, stmt, PaginationParams(page=2, size=2, count="none"))
+    assert response.has_next is False
+    assert len(response.items) == 1
+
+
+def test_paginate_with_estimated_count(session, seed_books):
+    session.execute(text("ANALYZE books"))
+    response = paginate(
+        session, select(Book), PaginationParams(page=1, size=2, count="estimated")
+    )
+    assert response.total == 3
+    assert response.pages == 2
+    assert response.has_next is True
+
+
+@contextmanager
+def count_statements(session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("page, titles", [(1, ["Book 1", "Book 2"]), (3, [])])
+def test_paginate_with_window_count(session, seed_books, monkeypatch, page, titles):
+    monkeypatch.setattr(settings, "PAGINATION_COUNT_STRATEGY", "window")
+    sorting_params = BookSortingSchema(sort_by="title", sort_order="asc")
+    with count_statements(session) as statements:
+        response = paginate(
+            session,
+            select(Book),
+            PaginationParams(page=page, size=2),
+            sorting_params=sorting_params,
+            sort_fields=book_sort_fields,
+        )
+    assert [book.title for book in response.items] == titles
+    assert response.total == 3
+    assert response.pages == 2
+    # Past the last page the total needs a separate count query
+    assert len(statements) == (1 if titles else 2)
+
+
+def test_paginate_with_window_count_uses_cached_total(session, seed_books, monkeypatch):
+    monkeypatch.setattr(settings, "PAGINATION_COUNT_STRATEGY", "window")
+    paginate(session, select(Book), PaginationParams(page=1, size=2))
+    with count_statements(session) as statements:
+        response = paginate(session, select(Book), PaginationParams(page=2, size=2))
+    assert response.total == 3
+    assert len(response.items) == 1
+    assert len(statements) == 1
+    assert "OVER" not in statements[0]
+
+
+def test_paginate_version_comes_from_the_page(session, seed_books):
+    with count_statements(session) as statements:
+        response = paginate(
+            session, select(Book), PaginationParams(page=1, size=2, count="none")
+        )
+    assert response.version == [(book.id, book.updated_at) for book in response.items]
+    assert len(statements) == 1
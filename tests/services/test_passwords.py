@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.config import settings
+from app.services import passwords
+from app.services.passwords import hash_password, verify_and_update_password
+
+
+def test_hash_and_verify_password():
+    hashed = asyncio.run(hash_password("ValidPass123"))
+    assert hashed.startswith("$2b$")
+    assert asyncio.run(verify_and_update_password("ValidPass123", hashed)) == (
+        True,
+        None,
+    )
+    assert asyncio.run(verify_and_update_password("InvalidPass123", hashed)) == (
+        False,
+        None,
+    )
+
+
+def test_verify_and_update_password_rehashes_other_cost():
+    hashed = passwords.pwd_context.copy(bcrypt__rounds=4).hash("ValidPass123")
+    verified, new_hash = asyncio.run(verify_and_update_password("ValidPass123", hashed))
+    assert verified
+    assert new_hash.startswith(f"$2b${settings.PASSWORD_HASH_ROUNDS:02d}$")
+    assert passwords.pwd_context.verify("ValidPass123", new_hash)
+
+
+def test_hashing_runs_off_the_event_loop():
+    thread_names = []
+
+    def record_thread():
+        thread_names.append(threading.current_thread().name)
+
+    asyncio.run(passwords._run(record_thread))
+    assert thread_names[0].startswith("password-hash")
+
+
+def test_saturated_pool_returns_503(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_SIZE", 1)
+    release = threading.Event()
+
+    async def runner():
+        blocked = [
+            asyncio.ensure_future(passwords._run(release.wait)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                await passwords._run(release.wait)
+        finally:
+            release.set()
+            await asyncio.gather(*blocked)
+        return exc_info
+
+    exc_info = asyncio.run(runner())
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert passwords._pending == 0
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.config import engine_options, settings
+from app.services.pool_metrics import (
+    TimedQueuePool,
+    clear_pool_metrics,
+    get_pool_stats,
+)
+
+
+@pytest.fixture()
+def timed_engine():
+    clear_pool_metrics()
+    engine = create_engine(
+        settings.TEST_DATABASE_URL,
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+    clear_pool_metrics()
+
+
+def test_pool_stats_count_checkouts_and_overflow(timed_engine):
+    first = timed_engine.connect()
+    second = timed_engine.connect()
+
+    stats = get_pool_stats(timed_engine.pool)
+
+    assert stats["size"] == 1
+    assert stats["max_overflow"] == 1
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 0
+    first.close()
+    second.close()
+    assert get_pool_stats(timed_engine.pool)["checked_in"] == 1
+
+
+def test_pool_stats_count_timeouts(timed_engine):
+    connections = [timed_engine.connect(), timed_engine.connect()]
+
+    with pytest.raises(PoolTimeoutError):
+        timed_engine.connect()
+
+    stats = get_pool_stats(timed_engine.pool)
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.1
+    for connection in connections:
+        connection.close()
+
+
+def test_engine_options_apply_timeouts_on_connect(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 1500)
+    monkeypatch.setattr(settings, "DB_LOCK_TIMEOUT", 250)
+    engine = create_engine(settings.TEST_DATABASE_URL, **engine_options())
+    try:
+        with engine.connect() as connection:
+            assert connection.scalar(text("SHOW statement_timeout")) == "1500ms"
+            assert connection.scalar(text("SHOW lock_timeout")) == "250ms"
+    finally:
+        engine.dispose()
+
+
+def test_engine_options_for_async_engine(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 1500)
+    options = engine_options(is_async=True)
+
+    assert options["connect_args"]["server_settings"]["statement_timeout"] == "1500"
+    assert options["poolclass"].metrics_name == "async"
@@ -0,0 +1,156 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from app.config import settings
+from app.crud.api.v1.books import BooksCrud
+from app.models import Author, Book, Genre
+from app.schemas.api.v1.book import BookSortingSchema
+from app.schemas.pagination import PaginationParams
+from app.services.query_inspector import (
+    QueryInspectorMiddleware,
+    RepeatedQueryError,
+    inspect_queries,
+    normalize,
+)
+
+ROWS = 15
+
+
+@pytest.fixture
+def linked_catalog(session):
+    authors = [
+        Author(
+            name=f"Author {index}",
+            surname="Surname",
+            year_of_birth=1950,
+            biography="Biography",
+        )
+        for index in range(ROWS)
+    ]
+    genres = [
+        Genre(name=f"Genre {index}", description="Description") for index in range(ROWS)
+    ]
+    session.add_all(
+        Book(
+            title=f"Book {index}",
+            isbn=f"{index:013d}",
+            year_of_publication=2000,
+            description="Description",
+            series="Series",
+            file_link="https://example.com/book.pdf",
+            edition="First",
+            authors=[authors[index], authors[index - 1]],
+            genres=[genres[index], genres[index - 1]],
+        )
+        for index in range(ROWS)
+    )
+    session.commit()
+    return authors
+
+
+def test_normalize_replaces_literals_and_parameters():
+    assert (
+        normalize(
+            "SELECT * FROM books\n WHERE id = %(id_1)s AND title = 'x''y' LIMIT 5"
+        )
+        == "SELECT * FROM books WHERE id = ? AND title = ? LIMIT ?"
+    )
+    assert normalize("SELECT 1 WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == normalize(
+        "SELECT 1 WHERE id IN (%(id_1_1)s)"
+    )
+
+
+def test_inspect_queries_counts_repeated_statements(session, linked_catalog):
+    books = session.execute(select(Book)).scalars().all()
+    session.expire_all()
+
+    with inspect_queries() as log:
+        for book in books:
+            book.authors
+
+    assert max(log.repeated(settings.REPEATED_QUERY_LIMIT).values()) >= ROWS
+
+
+def test_book_list_with_relations_has_no_repeated_statements(session, linked_catalog):
+    with inspect_queries() as log:
+        BooksCrud(session).get_books(
+            filters={},
+            sorting_params=BookSortingSchema(),
+            pagination=PaginationParams(page=1, size=ROWS),
+            include={"authors", "genres"},
+        )
+
+    assert log.repeated(1) == {}
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"/api/v1/books/?include=authors,genres&size={ROWS}",
+        f"/api/v1/authors/?include=books&size={ROWS}",
+        f"/api/v1/genres/?include=books&size={ROWS}",
+    ],
+)
+def test_nested_lists_pass_the_repeated_query_check(client, linked_catalog, url):
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == ROWS
+
+
+def test_author_books_pass_the_repeated_query_check(client, linked_catalog):
+    response = client.get(f"/api/v1/authors/{linked_catalog[0].id}/books")
+
+    assert response.status_code == 200
+
+
+def make_app(session, runs: int) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(QueryInspectorMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_items(item_id: int):
+        for _ in range(runs):
+            session.execute(text("SELECT 1 WHERE 1 = :id"), {"id": item_id})
+        return {}
+
+    return TestClient(app)
+
+
+def test_repeated_statements_fail_the_request(session, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_INSPECTION", True)
+    monkeypatch.setattr(settings, "REPEATED_QUERY_RAISE", True)
+
+    assert make_app(session, 10).get("/items/1").status_code == 200
+    with pytest.raises(RepeatedQueryError, match=r"GET /items/\{item_id\} ran 11"):
+        make_app(session, 11).get("/items/1")
+
+
+def test_repeated_statements_are_logged(session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "QUERY_INSPECTION", True)
+
+    with caplog.at_level(logging.WARNING, "app.services.query_inspector"):
+        assert make_app(session, 11).get("/items/1").status_code == 200
+
+    assert "Possible N+1 on GET /items/{item_id}: 11 runs" in caplog.text
+
+
+def test_slow_statements_are_logged_with_parameters(session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "QUERY_INSPECTION", True)
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, "app.services.query_inspector"):
+        make_app(session, 1).get("/items/7")
+
+    assert "Slow query" in caplog.text
+    assert "on /items/{item_id}" in caplog.text
+    assert "'id': 7" in caplog.text
+
+
+def test_inspection_disabled(session, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_INSPECTION", False)
+    monkeypatch.setattr(settings, "REPEATED_QUERY_RAISE", True)
+
+    assert make_app(session, 20).get("/items/1").status_code == 200
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import status
+from app.config import settings
+from app.services.replicas import PRIMARY_COOKIE
+from app.services import response_cache, table_generations
+from app.models.genre import Genre
+from app.services.response_cache import (
+    CATALOG_TABLES,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    configure_response_cache,
+)
+
+
+def test_repeated_list_request_is_cached(client):
+    first = client.get("/api/v1/genres/?size=5&page=1")
+    second = client.get("/api/v1/genres/?page=1&size=5")
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_write_invalidates_cached_lists(client, authorized_librarian):
+    client.get("/api/v1/books/")
+    response = authorized_librarian.post("/api/v1/genres/", json={"name": "Poetry"})
+    assert response.status_code == status.HTTP_201_CREATED
+    response = client.get("/api/v1/books/")
+    assert response.headers["X-Cache"] == "MISS"
+    response = client.get("/api/v1/genres/")
+    assert response.json()["items"][0]["name"] == "Poetry"
+
+
+def test_error_responses_are_not_cached(client):
+    client.get("/api/v1/genres/999")
+    response = client.get("/api/v1/genres/999")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "X-Cache" not in response.headers
+
+
+def test_cache_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_TTL", 0)
+    client.get("/api/v1/genres/")
+    assert "X-Cache" not in client.get("/api/v1/genres/").headers
+
+
+def test_client_pinned_to_primary_skips_cache(client):
+    client.get("/api/v1/genres/")
+    client.cookies.set(PRIMARY_COOKIE, f"{time.time() + 5:.3f}")
+    assert "X-Cache" not in client.get("/api/v1/genres/").headers
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    backend.get("a")
+    backend.set("c", b"3", 60)
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1", 60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert backend.get("a") is None
+
+
+@pytest.fixture
+def redis_backend(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url", lambda url: fakeredis.FakeRedis(server=server)
+    )
+    monkeypatch.setattr(table_generations, "_bump_listeners", [])
+    return RedisCacheBackend("redis://localhost:6379/0")
+
+
+def test_redis_backend_stores_entries_with_ttl(redis_backend):
+    redis_backend.set("a", b"1", 60)
+    assert redis_backend.get("a") == b"1"
+    assert redis_backend.get("b") is None
+    assert redis_backend.client.ttl(f"{redis_backend.prefix}a") == 60
+    redis_backend.clear()
+    assert redis_backend.get("a") is None
+
+
+def test_redis_backend_shares_generation_bumps(redis_backend):
+    assert redis_backend.get_generations(["books", "authors"]) == (
+        ("authors", 0),
+        ("books", 0),
+    )
+    table_generations.bump_generations(["books"])
+    assert redis_backend.get_generations(["books", "authors"]) == (
+        ("authors", 0),
+        ("books", 1),
+    )
+
+
+def test_redis_backend_bumps_off_the_event_loop(redis_backend, monkeypatch):
+    threads = []
+    publish = redis_backend._publish
+
+    def record_thread(table_names):
+        threads.append(threading.get_ident())
+        publish(table_names)
+
+    monkeypatch.setattr(redis_backend, "_publish", record_thread)
+
+    async def bump_on_loop():
+        redis_backend.bump_generations(["books"])
+        await redis_backend.wait_for_bumps()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(bump_on_loop())
+    assert threads and threads[0] != loop_thread
+    assert redis_backend.get_generations(["books"]) == (("books", 1),)
+
+
+def test_redis_backend_serves_cached_lists(client, redis_backend, monkeypatch):
+    monkeypatch.setattr(response_cache, "_backend", redis_backend)
+    assert client.get("/api/v1/genres/").headers["X-Cache"] == "MISS"
+    assert client.get("/api/v1/genres/").headers["X-Cache"] == "HIT"
+
+
+def test_write_on_fresh_process_invalidates_shared_pages(
+    redis_backend, session, monkeypatch
+):
+    # redis_backend stands for another worker holding a cached page
+    generations = redis_backend.get_generations(CATALOG_TABLES)
+    redis_backend.set(f"/api/v1/genres/?#{generations}", b"page", 60)
+    monkeypatch.setattr(table_generations, "_bump_listeners", [])
+    monkeypatch.setattr(response_cache, "_backend", None)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+
+    # A fresh process writes before it serves any cached GET
+    configure_response_cache()
+    session.add(Genre(name="Poetry"))
+    session.commit()
+
+    assert redis_backend.get_generations(CATALOG_TABLES) != generations
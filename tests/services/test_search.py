@@ -3,16 +3,23 @@ from sqlalchemy import Table, MetaData, Column, Integer, String, select
 from sqlalchemy.dialects import postgresql
 from fastapi import HTTPException
 
-from app.services.search import parse_filter, apply_filters
+from app.services.search import (
+    parse_filter,
+    apply_filters,
+    add_relevance_sort_field,
+)
+
 
 @pytest.fixture
 def user_table():
     metadata = MetaData()
     table = Table(
-        'users', metadata,
-        Column('id', Integer, primary_key=True),
-        Column('age', Integer),
-        Column('name', String),
+        "users",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("age", Integer),
+        Column("name", String),
+        Column("search_vector", postgresql.TSVECTOR),
     )
     return table
 
@@ -20,8 +27,7 @@ def user_table():
 def compile_query(stmt):
     return str(
         stmt.compile(
-            dialect=postgresql.dialect(),
-            compile_kwargs={"literal_binds": True}
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
         )
     )
 
@@ -51,7 +57,7 @@ class TestApplyFilters:
         allowed = {"age": user_table.c.age, "name": user_table.c.name}
         result = apply_filters(stmt, filters, allowed)
         sql = compile_query(result)
-        assert "users.age = '30'" in sql
+        assert "users.age = 30" in sql
 
     def test_ne_filter(self, user_table):
         stmt = select(user_table)
@@ -59,7 +65,7 @@ class TestApplyFilters:
         allowed = {"age": user_table.c.age}
         result = apply_filters(stmt, filters, allowed)
         sql = compile_query(result)
-        assert "users.age != '20'" in sql
+        assert "users.age != 20" in sql
 
     def test_lt_filter(self, user_table):
         stmt = select(user_table)
@@ -67,28 +73,28 @@ class TestApplyFilters:
         allowed = {"age": user_table.c.age}
         result = apply_filters(stmt, filters, allowed)
         sql = compile_query(result)
-        assert "users.age < '50'" in sql
+        assert "users.age < 50" in sql
 
     def test_lte_filter(self, user_table):
         stmt = select(user_table)
         filters = {"age": "lte:25"}
         allowed = {"age": user_table.c.age}
         sql = compile_query(apply_filters(stmt, filters, allowed))
-        assert "users.age <= '25'" in sql
+        assert "users.age <= 25" in sql
 
     def test_gt_filter(self, user_table):
         stmt = select(user_table)
         filters = {"age": "gt:18"}
         allowed = {"age": user_table.c.age}
         sql = compile_query(apply_filters(stmt, filters, allowed))
-        assert "users.age > '18'" in sql
+        assert "users.age > 18" in sql
 
     def test_gte_filter(self, user_table):
         stmt = select(user_table)
         filters = {"age": "gte:21"}
         allowed = {"age": user_table.c.age}
         sql = compile_query(apply_filters(stmt, filters, allowed))
-        assert "users.age >= '21'" in sql
+        assert "users.age >= 21" in sql
 
     def test_like_filter(self, user_table):
         stmt = select(user_table)
@@ -109,7 +115,23 @@ class TestApplyFilters:
         filters = {"age": "in:20,30,40"}
         allowed = {"age": user_table.c.age}
         sql = compile_query(apply_filters(stmt, filters, allowed))
-        assert "users.age IN ('20', '30', '40')" in sql
+        assert "users.age IN (20, 30, 40)" in sql
+
+    def test_invalid_value(self, user_table):
+        stmt = select(user_table)
+        filters = {"age": "gte:old"}
+        allowed = {"age": user_table.c.age}
+        with pytest.raises(HTTPException) as exc:
+            apply_filters(stmt, filters, allowed)
+        assert exc.value.status_code == 422
+        assert exc.value.detail == "Invalid value for 'age': 'old'"
+
+    def test_in_filter_keeps_strings_for_text_columns(self, user_table):
+        stmt = select(user_table)
+        filters = {"name": "in:1,2"}
+        allowed = {"name": user_table.c.name}
+        sql = compile_query(apply_filters(stmt, filters, allowed))
+        assert "users.name IN ('1', '2')" in sql
 
     def test_invalid_field(self, user_table):
         stmt = select(user_table)
@@ -126,5 +148,60 @@ class TestApplyFilters:
         allowed = {"age": user_table.c.age, "name": user_table.c.name}
         result = apply_filters(stmt, filters, allowed)
         sql = compile_query(result)
-        assert "users.age >= '18'" in sql
+        assert "users.age >= 18" in sql
         assert "users.name LIKE 'J%%'" in sql
+
+    def test_search_filter(self, user_table):
+        stmt = select(user_table)
+        filters = {"search": "john doe"}
+        allowed = {"search": user_table.c.search_vector}
+        result = apply_filters(stmt, filters, allowed)
+        sql = compile_query(result)
+        assert (
+            "users.search_vector @@ websearch_to_tsquery('english'::regconfig, 'john doe')"
+            in sql
+        )
+
+    def test_search_operator_on_tsvector(self, user_table):
+        stmt = select(user_table)
+        filters = {"search": "search:john"}
+        allowed = {"search": user_table.c.search_vector}
+        sql = compile_query(apply_filters(stmt, filters, allowed))
+        assert "websearch_to_tsquery('english'::regconfig, 'john')" in sql
+
+    def test_comparison_operator_on_tsvector(self, user_table):
+        stmt = select(user_table)
+        filters = {"search": "ilike:%john%"}
+        allowed = {"search": user_table.c.search_vector}
+        with pytest.raises(HTTPException) as exc:
+            apply_filters(stmt, filters, allowed)
+        assert exc.value.status_code == 422
+        assert "Unsupported filter operator for 'search'" in str(exc.value.detail)
+
+    def test_search_operator_on_plain_column(self, user_table):
+        stmt = select(user_table)
+        filters = {"name": "search:john"}
+        allowed = {"name": user_table.c.name}
+        with pytest.raises(HTTPException) as exc:
+            apply_filters(stmt, filters, allowed)
+        assert exc.value.status_code == 422
+        assert "Unsupported filter operator for 'name'" in str(exc.value.detail)
+
+
+class TestAddRelevanceSortField:
+    def test_without_search_filter(self, user_table):
+        sort_fields = {"name": user_table.c.name}
+        allowed = {"search": user_table.c.search_vector}
+        assert add_relevance_sort_field(sort_fields, {}, allowed) is sort_fields
+
+    def test_with_search_filter(self, user_table):
+        sort_fields = {"name": user_table.c.name}
+        allowed = {"search": user_table.c.search_vector}
+        result = add_relevance_sort_field(sort_fields, {"search": "john"}, allowed)
+        assert set(result) == {"name", "relevance"}
+        sql = compile_query(select(result["relevance"]))
+        assert (
+            "ts_rank(users.search_vector, websearch_to_tsquery('english'::regconfig, 'john'))"
+            in sql
+        )
+        assert "relevance" not in sort_fields
@@ -1,4 +1,5 @@
 import pytest
+from fastapi import HTTPException
 from sqlalchemy import select, asc, desc
 from app.models.book import Book
 from app.services.sorting import apply_sorting
@@ -55,3 +56,45 @@ def test_apply_sorting_desc(session, seed_books):
     results = session.execute(stmt_sorted).scalars().all()
     titles = [book.title for book in results]
     assert titles == ["Book 3", "Book 2", "Book 1"]
+
+
+def test_apply_sorting_breaks_ties_by_id(session):
+    session.add_all(
+        [
+            Book(title="Same", year_of_publication=2021, isbn=f"ISBN00{index}")
+            for index in range(3)
+        ]
+    )
+    session.commit()
+    stmt = select(Book)
+    sort_fields = {"title": Book.title}
+    sorting_params = BookSortingSchema(sort_by="title", sort_order="desc")
+    results = session.execute(apply_sorting(stmt, sorting_params, sort_fields))
+    ids = [book.id for book in results.scalars().all()]
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_apply_sorting_without_sort_by_orders_by_id(session, seed_books):
+    stmt = select(Book)
+    sorting_params = BookSortingSchema(sort_by=None, sort_order=None)
+    results = session.execute(apply_sorting(stmt, sorting_params, {}))
+    ids = [book.id for book in results.scalars().all()]
+    assert ids == sorted(ids)
+
+
+def test_apply_sorting_reverse(session, seed_books):
+    stmt = select(Book)
+    sort_fields = {"title": Book.title}
+    sorting_params = BookSortingSchema(sort_by="title", sort_order="asc")
+    stmt_sorted = apply_sorting(stmt, sorting_params, sort_fields, reverse=True)
+    results = session.execute(stmt_sorted).scalars().all()
+    titles = [book.title for book in results]
+    assert titles == ["Book 3", "Book 2", "Book 1"]
+
+
+def test_apply_sorting_by_relevance_without_search(session):
+    sorting_params = BookSortingSchema(sort_by="relevance", sort_order="desc")
+    with pytest.raises(HTTPException) as exc:
+        apply_sorting(select(Book), sorting_params, {"title": Book.title})
+    assert exc.value.status_code == 422
+    assert exc.value.detail == "Sorting by 'relevance' requires a search filter"
@@ -0,0 +1,59 @@
+from sqlalchemy import delete
+from app.models.book import Book
+from app.models.author import Author
+from app.models.book_author import BookAuthor
+from app.services.table_generations import get_generations, bump_generations
+
+
+def generation(table_name):
+    return dict(get_generations([table_name]))[table_name]
+
+
+def test_bump_generations():
+    before = get_generations(["books", "authors"])
+    bump_generations(["books"])
+    after = dict(get_generations(["books", "authors"]))
+    assert after["books"] == dict(before)["books"] + 1
+    assert after["authors"] == dict(before)["authors"]
+
+
+def test_commit_bumps_written_tables(session):
+    books, authors = generation("books"), generation("authors")
+    session.add(Book(title="Book", isbn="ISBN1"))
+    session.commit()
+    assert generation("books") == books + 1
+    assert generation("authors") == authors
+
+
+def test_secondary_table_is_bumped(session):
+    book = Book(title="Book", isbn="ISBN1")
+    author = Author(name="Author")
+    session.add_all([book, author])
+    session.commit()
+    book_author = generation("book_author")
+    book.authors.append(author)
+    session.commit()
+    assert generation("book_author") == book_author + 1
+
+
+def test_bulk_statement_bumps_table(session):
+    book_author = generation("book_author")
+    session.execute(delete(BookAuthor))
+    session.commit()
+    assert generation("book_author") == book_author + 1
+
+
+def test_bulk_delete_bumps_cascading_tables(session):
+    book_author, book_genre = generation("book_author"), generation("book_genre")
+    session.execute(delete(Book))
+    session.commit()
+    assert generation("book_author") == book_author + 1
+    assert generation("book_genre") == book_genre + 1
+
+
+def test_rollback_does_not_bump(session):
+    books = generation("books")
+    session.add(Book(title="Book", isbn="ISBN1"))
+    session.flush()
+    session.rollback()
+    assert generation("books") == books
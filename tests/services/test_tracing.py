@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.services.tracing import configure_tracing, disable_tracing, span, traced
+
+pytest.importorskip("opentelemetry.sdk")
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter)
+    yield exporter
+    disable_tracing()
+
+
+def spans_by_name(exporter) -> dict:
+    return {finished.name: finished for finished in exporter.get_finished_spans()}
+
+
+def test_tracing_is_off_by_default():
+    assert settings.TRACING_EXPORTER == "none"
+    assert configure_tracing() is False
+    with span("noop") as current:
+        assert current is None
+
+
+def test_traced_wraps_sync_and_async_functions(exporter):
+    @traced()
+    def sync_step():
+        return 1
+
+    @traced("custom")
+    async def async_step():
+        return 2
+
+    assert sync_step() == 1
+    assert asyncio.run(async_step()) == 2
+    assert {
+        "test_traced_wraps_sync_and_async_functions.<locals>.sync_step",
+        "custom",
+    } <= set(spans_by_name(exporter))
+
+
+def test_nested_route_spans_from_router_to_database(client, exporter):
+    response = client.get("/api/v1/books/1/genres?title=ilike:%25a%25")
+    assert response.status_code == 404
+
+    spans = spans_by_name(exporter)
+    root = spans["GET /api/v1/books/{book_id}/genres"]
+    assert root.attributes["http.route"] == "/api/v1/books/{book_id}/genres"
+    assert root.attributes["http.status_code"] == 404
+    crud = spans["BooksCrud.get_genres_of_book"]
+    assert crud.parent.span_id == root.context.span_id
+    assert spans["SELECT"].context.trace_id == root.context.trace_id
+
+
+def test_list_spans_cover_dependencies_pagination_and_serialization(
+    authorized_librarian, exporter
+):
+    authorized_librarian.post("/api/v1/genres/", json={"name": "Poetry"})
+    exporter.clear()
+
+    response = authorized_librarian.get("/api/v1/genres/?name=Poetry")
+    assert response.status_code == 200
+
+    spans = spans_by_name(exporter)
+    root = spans["GET /api/v1/genres/"]
+    for name in (
+        "genre_search_dependency",
+        "GenresCrud.get_genres",
+        "paginate.items",
+        "paginate.count",
+        "serialize_response",
+    ):
+        assert spans[name].context.trace_id == root.context.trace_id
+    assert spans["paginate.items"].parent.span_id == (
+        spans["GenresCrud.get_genres"].context.span_id
+    )
+    assert spans["paginate.count"].attributes["count_mode"] == "exact"
+    # Serialization starts once the endpoint has returned its page
+    assert spans["serialize_response"].start_time >= (
+        spans["GenresCrud.get_genres"].end_time
+    )